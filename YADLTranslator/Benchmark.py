@@ -0,0 +1,767 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import tracemalloc
+from Parser import Parser
+from Parser import LexerEngine
+from Parser import numpy
+from Token import TokenType
+from TokenBuffer import TokenBuffer
+from TokenStream import TokenStream
+from IncrementalLexer import IncrementalLexer
+from TokenCache import TokenCache
+from SyntaxAnalyzer import SyntaxAnalyzer
+from CodeGenerator import CodeGenerator
+from SymbolIndex import SymbolIndex
+from Diagnostics import AnalysisError
+
+
+class ConcatenatingCodeGenerator(CodeGenerator):
+    """Code generator that adds text of instructions of method to one growing
+    string, as it was before instruction buffers. It is used to compare them"""
+    def StartListing(self):
+        self.currentListing = str()
+
+
+    def AddCode(self, *instructions):
+        for instruction in instructions:
+            self.currentListing += instruction.Render()
+
+
+    def EndListing(self):
+        self.listingsForClasses[self.currentClassName][self.currentMethodName] = self.currentListing
+        self.currentListing = None
+
+
+    def FinishListing(self, listing) -> str:
+        # code of main is text already, methods of classes are generated by CodeGenerator
+        if type(listing) is str:
+            return listing
+        return super().FinishListing(listing)
+
+
+class Benchmark(object):
+    """Class that contains performance benchmarks for YADL translator.
+    Usage: python Benchmark.py [benchmark names]"""
+
+    @staticmethod
+    def GenerateSource(statementsCount:int) -> str:
+        # returns valid YADL program whose main method contains statementsCount statements
+        lines = ['class Counter {',
+                 '    int value;',
+                 '    int step;',
+                 '    Add(int delta) {',
+                 '        this.value = delta;',
+                 '    }',
+                 '    Show() {',
+                 "        prints('counter');",
+                 '        print(this.value);',
+                 '    }',
+                 '}',
+                 'main() {',
+                 '    Counter c = Counter.CreateInstance();']
+        for i in range(statementsCount):
+            var = 'v' + str(i - i % 5)
+            kind = i % 5
+            if kind == 0:
+                lines.append('    int ' + var + ' = ' + str(i) + ';')
+            elif kind == 1:
+                lines.append('    c.Add(' + var + ');')
+            elif kind == 2:
+                lines.append('    if (' + var + ' >= -5) { print(' + var + '); }')
+            elif kind == 3:
+                lines.append("    prints('message number " + str(i % 10) + "');")
+            else:
+                lines.append('    while (' + var + ' < 3) { ' + var + ' = c.value; }')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+
+    @staticmethod
+    def WriteSource(statementsCount:int) -> str:
+        # writes generated program to temporary file and returns its path
+        srcFile = tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False)
+        srcFile.write(Benchmark.GenerateSource(statementsCount))
+        srcFile.close()
+        return srcFile.name
+
+
+    @staticmethod
+    def MeasurePeakMemory(func) -> int:
+        # returns peak size in bytes of memory allocated while func() runs
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+
+    @staticmethod
+    def Measure(func, repeat:int = 3) -> float:
+        # returns best wall time of func() in seconds
+        best = None
+        for i in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            if best == None or elapsed < best:
+                best = elapsed
+        return best
+
+
+    @staticmethod
+    def Lexer():
+        # tokens per second of every lexer engine
+        print('Lexer engines (tokens/second)')
+        for statementsCount in (1000, 10000, 100000):
+            srcText = Benchmark.GenerateSource(statementsCount)
+            tokensCount = len(Parser.ParseText(srcText, LexerEngine.STATE_MACHINE))
+            baseTime = None
+            for engine in LexerEngine:
+                if engine == LexerEngine.NUMPY and numpy == None:
+                    continue
+                elapsed = Benchmark.Measure(lambda: Parser.ParseText(srcText, engine))
+                if baseTime == None:
+                    baseTime = elapsed
+                print('  {0:>8} KB  {1:<14} {2:>12,.0f} tokens/s  x{3:.2f}'.format(
+                    len(srcText) // 1024, engine.name, tokensCount / elapsed, baseTime / elapsed))
+
+
+    @staticmethod
+    def Stream():
+        # peak memory of reading all tokens through TokenBuffer as SyntaxAnalyzer does
+        def ReadAll(tokens):
+            tokenBuffer = TokenBuffer(tokens)
+            while not tokenBuffer.IsEnd():
+                tokenBuffer.Next()
+                tokenBuffer.Peek(4)
+        print('Token stream peak memory (KB)')
+        for statementsCount in (1000, 10000, 100000):
+            filePath = Benchmark.WriteSource(statementsCount)
+            fileSize = os.path.getsize(filePath)
+            listPeak = Benchmark.MeasurePeakMemory(lambda: ReadAll(Parser.Parse(filePath, LexerEngine.REGEX)))
+            streamPeak = Benchmark.MeasurePeakMemory(lambda: ReadAll(Parser.ParseStream(filePath)))
+            os.remove(filePath)
+            print('  {0:>8} KB file  list: {1:>10,} KB  stream: {2:>6,} KB'.format(
+                fileSize // 1024, listPeak // 1024, streamPeak // 1024))
+
+
+    @staticmethod
+    def Memory():
+        # bytes per token that stay allocated after lexing
+        class DictToken(object):
+            # Token as it was before __slots__
+            def __init__(self, type, val:str, line:int, pos:int):
+                self.type = type
+                self.value = val
+                self.line = line
+                self.pos = pos
+        def MeasureRetained(func) -> int:
+            tracemalloc.start()
+            result = func()
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del result
+            return size
+        print('Memory per token (bytes)')
+        for statementsCount in (10000, 100000):
+            srcText = Benchmark.GenerateSource(statementsCount)
+            tokens = Parser.ParseText(srcText, LexerEngine.REGEX)
+            tokensCount = len(tokens)
+            dictSize = MeasureRetained(lambda: [DictToken(t.type, t.value[:1] + t.value[1:], t.line, t.pos) 
+                                                for t in tokens])
+            slotsSize = MeasureRetained(lambda: Parser.ParseText(srcText, LexerEngine.REGEX))
+            streamSize = MeasureRetained(lambda: TokenStream.FromTokens(srcText, Parser.ScanChunks((srcText,))))
+            del tokens
+            print('  {0:>8} tokens  Token with __dict__: {1:.1f}  Token with __slots__: {2:.1f}  '\
+                  'TokenStream: {3:.1f} (+{4:.1f} of source text)'.format(tokensCount, dictSize / tokensCount, 
+                  slotsSize / tokensCount, streamSize / tokensCount, len(srcText) / tokensCount))
+
+
+    @staticmethod
+    def Mapped():
+        # lexing time and peak of allocated memory for every file input mode
+        print('File input modes (seconds / peak allocated KB)')
+        for statementsCount in (10000, 100000):
+            filePath = Benchmark.WriteSource(statementsCount)
+            modes = [('text, Token list', lambda: Parser.Parse(filePath, LexerEngine.REGEX)),
+                     ('text, TokenStream', lambda: Parser.ParseToTokenStream(filePath)),
+                     ('mmap, TokenStream', lambda: Parser.ParseMapped(filePath))]
+            for modeName, func in modes:
+                elapsed = Benchmark.Measure(func)
+                peak = Benchmark.MeasurePeakMemory(func)
+                print('  {0:>8} KB file  {1:<18} {2:>7.3f} s  {3:>10,} KB'.format(
+                    os.path.getsize(filePath) // 1024, modeName, elapsed, peak // 1024))
+            os.remove(filePath)
+
+
+    @staticmethod
+    def Incremental():
+        # latency of one-char edit in the middle of file: incremental re-lexing and full lexing
+        print('Edit latency (ms)')
+        for statementsCount in (1000, 10000, 100000):
+            srcText = Benchmark.GenerateSource(statementsCount)
+            lexer = IncrementalLexer(srcText)
+            offset = srcText.index('= ', len(srcText) // 2) + 2
+            edits = 100
+            def EditMany():
+                # inserts digit to number literal and removes it back
+                for i in range(edits // 2):
+                    lexer.Edit(offset, 0, '7')
+                    lexer.Edit(offset, 1, '')
+            incrementalTime = Benchmark.Measure(EditMany) / edits
+            fullTime = Benchmark.Measure(lambda: Parser.ParseText(srcText, LexerEngine.REGEX))
+            print('  {0:>8} KB  incremental: {1:>8.3f}  full: {2:>9.3f}'.format(
+                len(srcText) // 1024, incrementalTime * 1000, fullTime * 1000))
+
+
+    @staticmethod
+    def Parallel():
+        # lexing time of big file by number of worker processes
+        print('Parallel lexing (seconds, speedup against sequential regex engine)')
+        srcText = Benchmark.GenerateSource(200000)
+        baseTime = Benchmark.Measure(lambda: Parser.ParseText(srcText, LexerEngine.REGEX), 1)
+        print('  {0:>8} KB  sequential  {1:>7.3f} s'.format(len(srcText) // 1024, baseTime))
+        workersCount = 1
+        while workersCount <= max(2 * (os.cpu_count() or 1), 4):
+            elapsed = Benchmark.Measure(lambda: Parser.ParseTextParallel(srcText, workersCount), 1)
+            print('  {0:>8} KB  {1:>2} workers  {2:>7.3f} s  x{3:.2f}'.format(
+                len(srcText) // 1024, workersCount, elapsed, baseTime / elapsed))
+            workersCount *= 2
+
+
+    @staticmethod
+    def Cache():
+        # time of lexing and of loading the same tokens from token cache
+        print('Token cache (seconds)')
+        cacheDir = tempfile.mkdtemp()
+        tokenCache = TokenCache(cacheDir)
+        for statementsCount in (1000, 10000, 100000):
+            filePath = Benchmark.WriteSource(statementsCount)
+            key = TokenCache.GetKey(filePath)
+            tokens = Parser.Parse(filePath)
+            tokenCache.Store(key, tokens)
+            lexTime = Benchmark.Measure(lambda: Parser.Parse(filePath))
+            regexTime = Benchmark.Measure(lambda: Parser.Parse(filePath, LexerEngine.REGEX))
+            loadTime = Benchmark.Measure(lambda: tokenCache.Load(TokenCache.GetKey(filePath)))
+            print('  {0:>8} KB file  state machine: {1:>7.3f}  regex: {2:>7.3f}  cache: {3:>7.3f}  '\
+                  '(entry {4:,} KB)'.format(os.path.getsize(filePath) // 1024, lexTime, regexTime, loadTime,
+                  os.path.getsize(tokenCache.GetEntryPath(key)) // 1024))
+            os.remove(filePath)
+        shutil.rmtree(cacheDir)
+
+
+    @staticmethod
+    def GenerateLocals(localsCount:int) -> str:
+        # returns program whose main method declares localsCount variables in
+        # nested scopes, every variable is read from the previous one
+        lines = ['class Point {', '    int x;', '    int y;', '    Show() {', '        print(this.x);', '    }', '}',
+                 'main() {', '    int v0 = 0;']
+        for i in range(1, localsCount):
+            if i % 100 == 0:
+                lines.append('    while (v0 < 1) {')
+            if i % 10 == 0:
+                lines.append('    Point p' + str(i) + ' = Point.CreateInstance();')
+                lines.append('    p' + str(i) + '.x = v' + str(i-1) + ';')
+                lines.append('    int v' + str(i) + ' = p' + str(i) + '.x;')
+            else:
+                lines.append('    int v' + str(i) + ' = v' + str(i-1) + ';')
+        lines.append('    print(v' + str(localsCount-1) + ');')
+        lines.append('    }' * ((localsCount - 1) // 100))
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+
+    @staticmethod
+    def Locals():
+        # syntax analysis time of method with many local variables
+        print('Methods with many locals (seconds)')
+        for localsCount in (1000, 3000, 10000):
+            tokens = Parser.ParseText(Benchmark.GenerateLocals(localsCount), LexerEngine.REGEX)
+            def Analyze():
+                syntaxAnalyzer = SyntaxAnalyzer(tokens)
+                syntaxAnalyzer.Analyze()
+            elapsed = Benchmark.Measure(Analyze, 1)
+            print('  {0:>8} locals  {1:>7.3f} s  {2:>8.1f} us/local'.format(localsCount, elapsed, 
+                                                                         elapsed / localsCount * 1e6))
+
+
+    @staticmethod
+    def GenerateWideClass(membersCount:int) -> str:
+        # returns program with class of membersCount variables and membersCount
+        # methods, every method reads and writes variables
+        lines = ['class Wide {']
+        for i in range(membersCount):
+            lines.append('    int f' + str(i) + ';')
+        for i in range(membersCount):
+            lines.append('    M' + str(i) + '(int a) {')
+            lines.append('        this.f' + str(i) + ' = a;')
+            lines.append('        print(this.f' + str(membersCount - 1 - i) + ');')
+            lines.append('    }')
+        lines.append('}')
+        lines.append('main() {')
+        lines.append('    Wide w = Wide.CreateInstance();')
+        for i in range(membersCount):
+            lines.append('    w.f' + str(i) + ' = ' + str(i) + ';')
+            lines.append('    w.M' + str(membersCount - 1 - i) + '(w.f' + str(i) + ');')
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+
+    @staticmethod
+    def WideClasses():
+        # syntax analysis time of class with many variables and methods
+        print('Classes with many members (seconds)')
+        for membersCount in (100, 300, 1000):
+            tokens = Parser.ParseText(Benchmark.GenerateWideClass(membersCount), LexerEngine.REGEX)
+            def Analyze():
+                syntaxAnalyzer = SyntaxAnalyzer(tokens)
+                syntaxAnalyzer.Analyze()
+            elapsed = Benchmark.Measure(Analyze, 1)
+            print('  {0:>8} members  {1:>7.3f} s  {2:>8.1f} us/member'.format(membersCount, elapsed, 
+                                                                           elapsed / membersCount * 1e6))
+
+
+    @staticmethod
+    def SelectRuleWithPredicates(syntaxAnalyzer):
+        # statement rule selection as it was before statements table: Predict
+        # methods are called one by one and every one peeks up to 4 tokens
+        tokenBuffer = syntaxAnalyzer.tokenBuffer
+        def PeekNextTokensTypes(*types):
+            for distance in range(1, len(types)+1):
+                token = tokenBuffer.Peek(distance)
+                if token == None or token.type != types[distance-1]:
+                    return False
+            return True
+        token = tokenBuffer.Peek()
+        if token != None and (token.value == 'int' or token.value == 'str') \
+                or PeekNextTokensTypes(TokenType.IDENTIFIER, TokenType.IDENTIFIER):
+            return syntaxAnalyzer.VarInit
+        if PeekNextTokensTypes(TokenType.IDENTIFIER, TokenType.ASSIGN) \
+                or PeekNextTokensTypes(TokenType.IDENTIFIER, TokenType.ACCESS, TokenType.IDENTIFIER, TokenType.ASSIGN) \
+                or tokenBuffer.Peek(4) != None and tokenBuffer.Peek(1).value == 'this' \
+                and tokenBuffer.Peek(2).type == TokenType.ACCESS and tokenBuffer.Peek(3).type == TokenType.IDENTIFIER \
+                and tokenBuffer.Peek(4).type == TokenType.ASSIGN:
+            return syntaxAnalyzer.Assigning
+        if PeekNextTokensTypes(TokenType.IDENTIFIER, TokenType.ACCESS, TokenType.IDENTIFIER, TokenType.O_ROUND_BRACKET) \
+                or PeekNextTokensTypes(TokenType.IDENTIFIER, TokenType.O_ROUND_BRACKET):
+            return syntaxAnalyzer.MethodCall
+        for keyword, rule in (('if', syntaxAnalyzer.IfStatement), ('while', syntaxAnalyzer.WhileStatement),
+                              ('print', syntaxAnalyzer.PrintStatement), 
+                              ('prints', syntaxAnalyzer.PrintStringStatement)):
+            if token.type == TokenType.KEYWORD and token.value == keyword:
+                return rule
+        return None
+
+
+    @staticmethod
+    def Dispatch():
+        # time of selection of statement rule by statement kind
+        print('Statement rule selection (ns/statement)')
+        statements = ['int a = 5;', 'Point p = q;', 'a = 3;', 'p.x = 3;', 'this.x = 1;', 'p.Show();', 'Show();',
+                      'if (a < 3) {', 'while (a < 3) {', 'print(a);', "prints('a');"]
+        selectionsCount = 100000
+        for statement in statements:
+            syntaxAnalyzer = SyntaxAnalyzer(Parser.ParseText(statement))
+            # selection only peeks tokens, so it can be repeated for the same statement
+            def SelectMany(select):
+                for i in range(selectionsCount):
+                    select(syntaxAnalyzer)
+            predicatesTime = Benchmark.Measure(lambda: SelectMany(Benchmark.SelectRuleWithPredicates))
+            tableTime = Benchmark.Measure(lambda: SelectMany(SyntaxAnalyzer.SelectStatementRule))
+            print('  {0:<16} predicates: {1:>6.0f}  table: {2:>6.0f}  x{3:.2f}'.format(statement, 
+                  predicatesTime / selectionsCount * 1e9, tableTime / selectionsCount * 1e9, predicatesTime / tableTime))
+
+
+    @staticmethod
+    def GenerateNested(depth:int, blocksCount:int) -> str:
+        # returns program whose main method has blocksCount if and while blocks
+        # with one assigning in every block; blocks are nested to depth, so
+        # programs of any depth have the same statements
+        lines = ['main() {', '    int a = 0;']
+        for i in range(blocksCount // depth):
+            for j in range(depth):
+                lines.append('    if (a < ' + str(j) + ') {' if j % 2 == 0 else '    while (a < ' + str(j) + ') {')
+                lines.append('    a = ' + str(j) + ';')
+            lines.append('    }' * depth)
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+
+    @staticmethod
+    def Nesting():
+        # syntax analysis time of the same blocks with different depth of nesting
+        print('Nested blocks (seconds)')
+        blocksCount = 4000
+        for depth in (1, 10, 100, 1000, 4000):
+            tokens = Parser.ParseText(Benchmark.GenerateNested(depth, blocksCount), LexerEngine.REGEX)
+            def Analyze():
+                syntaxAnalyzer = SyntaxAnalyzer(tokens)
+                syntaxAnalyzer.Analyze()
+            elapsed = Benchmark.Measure(Analyze, 1)
+            print('  {0:>8} depth  {1:>7.3f} s  {2:>8.1f} us/block'.format(depth, elapsed, 
+                                                                        elapsed / blocksCount * 1e6))
+
+
+    @staticmethod
+    def Diagnostics():
+        # syntax analysis time of program with error in every errorsStep-th
+        # statement; all errors are reported by one analysis
+        print('Programs with errors (seconds)')
+        statementsCount = 5000
+        for errorsStep in (0, 100, 10, 1):
+            lines = ['main() {', '    int a = 0;']
+            for i in range(statementsCount):
+                if errorsStep > 0 and i % errorsStep == 0:
+                    lines.append('    a = b' + str(i) + ';')
+                else:
+                    lines.append('    a = ' + str(i) + ';')
+            lines.append('}')
+            tokens = Parser.ParseText('\n'.join(lines) + '\n', LexerEngine.REGEX)
+            errorsCount = 0
+            def Analyze():
+                nonlocal errorsCount
+                syntaxAnalyzer = SyntaxAnalyzer(tokens)
+                try:
+                    syntaxAnalyzer.Analyze()
+                except AnalysisError as ex:
+                    errorsCount = len(ex.diagnostics.errors)
+            elapsed = Benchmark.Measure(Analyze, 1)
+            print('  {0:>8} errors  {1:>7.3f} s  {2:>8.1f} us/statement'.format(errorsCount, elapsed, 
+                                                                             elapsed / statementsCount * 1e6))
+
+
+    @staticmethod
+    def Phases():
+        # time of every analysis phase: parsing to syntax tree, semantic checks
+        # and code generation, and time of building of code
+        print('Analysis phases (seconds)')
+        for statementsCount in (1000, 3000, 10000):
+            tokens = Parser.ParseText(Benchmark.GenerateSource(statementsCount), LexerEngine.REGEX)
+            syntaxAnalyzer = SyntaxAnalyzer(tokens)
+            syntaxAnalyzer.Analyze()
+            buildTime = Benchmark.Measure(syntaxAnalyzer.BuildCode, 1)
+            timings = syntaxAnalyzer.phaseTimings
+            print('  {0:>8} statements  parse {1:>7.3f} s  semantic {2:>7.3f} s  codegen {3:>7.3f} s  '
+                  'build {4:>7.3f} s'.format(statementsCount, timings['parse'], timings['semantic'],
+                                             timings['codegen'], buildTime))
+
+
+
+    @staticmethod
+    def GenerateClasses(classesCount:int) -> str:
+        # returns program with classesCount classes; every class calls method
+        # of the previous class
+        lines = list()
+        for i in range(classesCount):
+            lines += ['class C' + str(i) + ' {',
+                      '    int value;',
+                      '    int count;',
+                      '    Set(int delta) {',
+                      '        this.value = delta;',
+                      '        while (this.count < delta) { this.count = delta; }',
+                      '    }',
+                      '    Show() {',
+                      "        prints('class " + str(i) + "');",
+                      '        if (this.value >= 0) { print(this.value); }']
+            if i > 0:
+                lines += ['        C' + str(i-1) + ' prev = C' + str(i-1) + '.CreateInstance();',
+                          '        prev.Set(this.count);',
+                          '        prev.Show();']
+            lines += ['    }', '}']
+        lines += ['main() {',
+                  '    C' + str(classesCount-1) + ' c = C' + str(classesCount-1) + '.CreateInstance();',
+                  '    c.Show();',
+                  '}']
+        return '\n'.join(lines) + '\n'
+
+
+    @staticmethod
+    def Codegen():
+        # code generation time of program with many classes by number of worker processes
+        print('Code generation of classes (seconds, speedup against generation without workers)')
+        for classesCount in (1000, 5000):
+            tokens = Parser.ParseText(Benchmark.GenerateClasses(classesCount), LexerEngine.REGEX)
+            syntaxAnalyzer = SyntaxAnalyzer(tokens)
+            syntaxAnalyzer.Analyze()
+            program = syntaxAnalyzer.program
+            definedClasses = syntaxAnalyzer.semanticAnalyzer.definedClasses
+            def Generate(workersCount:int):
+                CodeGenerator(program, definedClasses, workersCount).Generate()
+            baseTime = Benchmark.Measure(lambda: Generate(0), 1)
+            print('  {0:>8} classes  no workers  {1:>7.3f} s'.format(classesCount, baseTime))
+            workersCount = 2
+            while workersCount <= max(2 * (os.cpu_count() or 1), 4):
+                elapsed = Benchmark.Measure(lambda: Generate(workersCount), 1)
+                print('  {0:>8} classes  {1:>2} workers  {2:>7.3f} s  x{3:.2f}'.format(
+                    classesCount, workersCount, elapsed, baseTime / elapsed))
+                workersCount *= 2
+
+    @staticmethod
+    def Check():
+        # time of checking source file without code generation against full translation
+        print('Check-only analysis (seconds, speedup against translation)')
+        for statementsCount in (1000, 3000, 10000):
+            tokens = Parser.ParseText(Benchmark.GenerateSource(statementsCount), LexerEngine.REGEX)
+            def Translate():
+                syntaxAnalyzer = SyntaxAnalyzer(tokens)
+                syntaxAnalyzer.Analyze()
+                syntaxAnalyzer.BuildCode()
+            def Check():
+                SyntaxAnalyzer(tokens, checkOnly=True).Analyze()
+            translateTime = Benchmark.Measure(Translate, 1)
+            checkTime = Benchmark.Measure(Check)
+            print('  {0:>8} statements  translate {1:>7.3f} s  check {2:>7.3f} s  x{3:.2f}'.format(
+                statementsCount, translateTime, checkTime, translateTime / checkTime))
+
+    @staticmethod
+    def Index():
+        # cost of building of symbol index in checks, time of position query (check
+        # of source file is the time of query without index) and size of encoded index
+        print('Symbol index (seconds)')
+        for statementsCount in (1000, 10000, 50000):
+            tokens = Parser.ParseText(Benchmark.GenerateSource(statementsCount), LexerEngine.REGEX)
+            checkTime = Benchmark.Measure(lambda: SyntaxAnalyzer(tokens, checkOnly=True).Analyze())
+            syntaxAnalyzer = SyntaxAnalyzer(tokens, checkOnly=True, buildSymbolIndex=True)
+            indexTime = Benchmark.Measure(syntaxAnalyzer.Analyze, 1)
+            symbolIndex = syntaxAnalyzer.symbolIndex
+            positions = [(token.line, token.pos) for token in tokens if token.type == TokenType.IDENTIFIER]
+            def QueryAll():
+                for line, pos in positions:
+                    symbolIndex.Find(line, pos)
+            queryTime = Benchmark.Measure(QueryAll) / len(positions)
+            data = symbolIndex.Encode()
+            decodeTime = Benchmark.Measure(lambda: SymbolIndex.Decode(data))
+            print('  {0:>8} statements  check {1:>7.3f} s  check with index {2:>7.3f} s  query {3:>10.7f} s  '
+                  'encoded {4:>9} bytes  decode {5:>7.3f} s'.format(
+                      statementsCount, checkTime, indexTime, queryTime, len(data), decodeTime))
+
+    @staticmethod
+    def Buffers():
+        # code generation and building of code with long main method: instruction
+        # buffers against concatenation of strings. Concatenation copies code of
+        # method for every instruction, for 100000 statements it takes minutes, so
+        # it is measured for smaller methods only
+        print('Instruction buffers (seconds, speedup against concatenation)')
+        for statementsCount in (10000, 30000, 100000):
+            tokens = Parser.ParseText(Benchmark.GenerateSource(statementsCount), LexerEngine.REGEX)
+            syntaxAnalyzer = SyntaxAnalyzer(tokens, checkOnly=True)
+            syntaxAnalyzer.Analyze()
+            def Generate(generatorType):
+                codeGenerator = generatorType(syntaxAnalyzer.program, syntaxAnalyzer.semanticAnalyzer.definedClasses,
+                                              optimizationLevel=0)
+                codeGenerator.Generate()
+                codeGenerator.BuildCode()
+            buffersTime = Benchmark.Measure(lambda: Generate(CodeGenerator))
+            if statementsCount > 30000:
+                print('  {0:>8} statements  buffers {1:>7.3f} s'.format(statementsCount, buffersTime))
+                continue
+            concatenationTime = Benchmark.Measure(lambda: Generate(ConcatenatingCodeGenerator), 1)
+            print('  {0:>8} statements  buffers {1:>7.3f} s  concatenation {2:>7.3f} s  x{3:.2f}'.format(
+                statementsCount, buffersTime, concatenationTime, concatenationTime / buffersTime))
+
+    @staticmethod
+    def Streaming():
+        # peak memory and time of code generation and writing of code to file:
+        # building of code in memory against streaming of it to file
+        print('Streaming of code (peak memory in MB, seconds)')
+        for classesCount in (1000, 5000):
+            tokens = Parser.ParseText(Benchmark.GenerateClasses(classesCount), LexerEngine.REGEX)
+            syntaxAnalyzer = SyntaxAnalyzer(tokens, checkOnly=True)
+            syntaxAnalyzer.Analyze()
+            program = syntaxAnalyzer.program
+            definedClasses = syntaxAnalyzer.semanticAnalyzer.definedClasses
+            def Build():
+                codeGenerator = CodeGenerator(program, definedClasses)
+                codeGenerator.Generate()
+                with open(os.devnull, 'w') as outFile:
+                    outFile.write(codeGenerator.BuildCode())
+            def Stream():
+                with open(os.devnull, 'w') as outFile:
+                    CodeGenerator(program, definedClasses).WriteCode(outFile)
+            results = list()
+            for func in (Build, Stream):
+                results.append(Benchmark.MeasurePeakMemory(func) / (1 << 20))
+                results.append(Benchmark.Measure(func))
+            print('  {0:>8} classes  build {1:>7.2f} MB {2:>7.3f} s  stream {3:>7.2f} MB {4:>7.3f} s'.format(
+                classesCount, *results))
+
+    @staticmethod
+    def Strings():
+        # size of data section with string pool against declaration of every
+        # string use and time of translation of program that prints the same strings
+        print('String pool (chars, seconds)')
+        for statementsCount in (1000, 10000, 100000):
+            tokens = Parser.ParseText(Benchmark.GenerateSource(statementsCount), LexerEngine.REGEX)
+            def Translate():
+                syntaxAnalyzer = SyntaxAnalyzer(tokens)
+                syntaxAnalyzer.Analyze()
+                syntaxAnalyzer.BuildCode()
+                return syntaxAnalyzer.program.stringPool
+            stringPool = Translate()
+            translateTime = Benchmark.Measure(Translate)
+            pooledSize = stringPool.usesSize - stringPool.GetSavedSize()
+            print('  {0:>8} statements  {1:>6} uses  {2:>3} strings  data {3:>9} -> {4:>6} chars  '
+                  'translate {5:>7.3f} s'.format(statementsCount, stringPool.usesCount, len(stringPool.labelsByString),
+                                                 stringPool.usesSize, pooledSize, translateTime))
+
+    @staticmethod
+    def DeadMethods():
+        # size of code and time of code generation of program that uses small
+        # part of classes: with and without removal of dead methods
+        print('Dead methods (chars, seconds)')
+        for classesCount in (1000, 5000):
+            source = Benchmark.GenerateClasses(classesCount)
+            # main uses the first 10 classes only
+            source = source[:source.index('main()')] + 'main() {\n    C9 c = C9.CreateInstance();\n    c.Show();\n}\n'
+            tokens = Parser.ParseText(source, LexerEngine.REGEX)
+            syntaxAnalyzer = SyntaxAnalyzer(tokens, checkOnly=True)
+            syntaxAnalyzer.Analyze()
+            results = list()
+            for removeDeadMethods in (False, True):
+                def Generate():
+                    codeGenerator = CodeGenerator(syntaxAnalyzer.program,
+                                                  syntaxAnalyzer.semanticAnalyzer.definedClasses, 0, removeDeadMethods)
+                    codeGenerator.Generate()
+                    return codeGenerator.BuildCode()
+                results.append(len(Generate()))
+                results.append(Benchmark.Measure(Generate))
+            codeGenerator = CodeGenerator(syntaxAnalyzer.program, syntaxAnalyzer.semanticAnalyzer.definedClasses)
+            codeGenerator.FindLiveMethods()
+            methodsCount, deadMethodsCount = codeGenerator.methodsCount, codeGenerator.deadMethodsCount
+            print('  {0:>8} classes  {1:>5} of {2:>5} methods dead  all {3:>9} chars {4:>7.3f} s  '
+                  'live {5:>9} chars {6:>7.3f} s'.format(classesCount, deadMethodsCount, methodsCount, *results))
+
+    @staticmethod
+    def GenerateSiblings(classesCount:int) -> str:
+        # returns program with classesCount classes with the same methods, main
+        # calls all of them
+        lines = list()
+        for i in range(classesCount):
+            lines += ['class S' + str(i) + ' {',
+                      '    int value;',
+                      '    Reset() {',
+                      '        this.value = 0;',
+                      '    }',
+                      '    Show() {',
+                      "        prints('value');",
+                      '        while (this.value < 10) { print(this.value); this.value = 10; }',
+                      '    }',
+                      '}']
+        lines.append('main() {')
+        for i in range(classesCount):
+            lines += ['    S' + str(i) + ' s' + str(i) + ' = S' + str(i) + '.CreateInstance();',
+                      '    s' + str(i) + '.Reset();',
+                      '    s' + str(i) + '.Show();']
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+
+    @staticmethod
+    def Folding():
+        # size and time of code generation of classes with the same methods:
+        # with and without identical code folding
+        print('Identical code folding (chars, seconds)')
+        for classesCount in (1000, 5000):
+            tokens = Parser.ParseText(Benchmark.GenerateSiblings(classesCount), LexerEngine.REGEX)
+            syntaxAnalyzer = SyntaxAnalyzer(tokens, checkOnly=True)
+            syntaxAnalyzer.Analyze()
+            results = list()
+            for foldIdenticalCode in (False, True):
+                def Generate():
+                    codeGenerator = CodeGenerator(syntaxAnalyzer.program, syntaxAnalyzer.semanticAnalyzer.definedClasses,
+                                                  0, True, foldIdenticalCode)
+                    codeGenerator.Generate()
+                    return codeGenerator.BuildCode()
+                results.append(len(Generate()))
+                results.append(Benchmark.Measure(Generate))
+            print('  {0:>8} classes  all {1:>9} chars {2:>7.3f} s  folded {3:>9} chars {4:>7.3f} s'.format(
+                classesCount, *results))
+
+    @staticmethod
+    def Peephole():
+        # count of instructions and time of code generation with and without
+        # peephole optimizer and counts of rewrites by its rules
+        print('Peephole optimizer (instructions, seconds)')
+        for statementsCount in (1000, 10000):
+            tokens = Parser.ParseText(Benchmark.GenerateSource(statementsCount), LexerEngine.REGEX)
+            syntaxAnalyzer = SyntaxAnalyzer(tokens, checkOnly=True)
+            syntaxAnalyzer.Analyze()
+            results = list()
+            for optimizePeephole in (False, True):
+                def Generate():
+                    codeGenerator = CodeGenerator(syntaxAnalyzer.program, syntaxAnalyzer.semanticAnalyzer.definedClasses,
+                                                  optimizePeephole=optimizePeephole)
+                    codeGenerator.Generate()
+                    return codeGenerator
+                codeGenerator = Generate()
+                results.append(codeGenerator.BuildCode().count('\n'))
+                results.append(Benchmark.Measure(Generate))
+            print('  {0:>8} statements  off {1:>8} lines {2:>7.3f} s  on {3:>8} lines {4:>7.3f} s'.format(
+                statementsCount, *results))
+            for name, count in codeGenerator.peepholeOptimizer.hitCounts.items():
+                print('      {0:<32} {1:>7}'.format(name, count))
+
+    @staticmethod
+    def Levels():
+        # time of code generation, size of code and time and change of count of
+        # instructions of every pass by optimization level
+        print('Optimization levels (seconds, instructions)')
+        for classesCount in (1000, 5000):
+            source = Benchmark.GenerateSiblings(classesCount // 2) + Benchmark.GenerateClasses(classesCount // 2)
+            # main of the second program is used, so half of siblings is dead
+            source = source[:source.index('main()')] + source[source.index('class C0 {'):]
+            tokens = Parser.ParseText(source, LexerEngine.REGEX)
+            syntaxAnalyzer = SyntaxAnalyzer(tokens, checkOnly=True)
+            syntaxAnalyzer.Analyze()
+            for optimizationLevel in (0, 1, 2):
+                def Generate():
+                    codeGenerator = CodeGenerator(syntaxAnalyzer.program, syntaxAnalyzer.semanticAnalyzer.definedClasses,
+                                                  optimizationLevel=optimizationLevel)
+                    codeGenerator.Generate()
+                    return codeGenerator
+                codeGenerator = Generate()
+                instructionsCount = codeGenerator.BuildCode().count('\n')
+                print('  {0:>8} classes  -O{1}  {2:>7.3f} s  {3:>8} lines'.format(
+                    classesCount, optimizationLevel, Benchmark.Measure(Generate), instructionsCount))
+                for name, stats in codeGenerator.passManager.stats.items():
+                    print('      pass {0:<12} {1:>7.3f} s  instructions {2:>+8}'.format(
+                        name, stats.seconds, stats.instructionsDelta))
+
+
+BENCHMARKS = {
+    'lexer': Benchmark.Lexer,
+    'stream': Benchmark.Stream,
+    'memory': Benchmark.Memory,
+    'mapped': Benchmark.Mapped,
+    'incremental': Benchmark.Incremental,
+    'parallel': Benchmark.Parallel,
+    'cache': Benchmark.Cache,
+    'locals': Benchmark.Locals,
+    'classes': Benchmark.WideClasses,
+    'dispatch': Benchmark.Dispatch,
+    'nesting': Benchmark.Nesting,
+    'diagnostics': Benchmark.Diagnostics,
+    'phases': Benchmark.Phases,
+    'codegen': Benchmark.Codegen,
+    'check': Benchmark.Check,
+    'index': Benchmark.Index,
+    'buffers': Benchmark.Buffers,
+    'streaming': Benchmark.Streaming,
+    'strings': Benchmark.Strings,
+    'dead': Benchmark.DeadMethods,
+    'folding': Benchmark.Folding,
+    'peephole': Benchmark.Peephole,
+    'levels': Benchmark.Levels
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS.keys())
+    for name in names:
+        if name not in BENCHMARKS:
+            print('Unknown benchmark ' + name + '! Available: ' + ', '.join(BENCHMARKS.keys()))
+            exit()
+        BENCHMARKS[name]()
@@ -0,0 +1,24 @@
+class CallGraph(object):
+    """Class that holds calls between methods of program. Method is pair of
+    class name and method name, main method is (None, 'main')"""
+    def __init__(self):
+        # method -> set of methods called from it
+        self.calls = dict()
+
+
+    def AddCall(self, caller:tuple, callee:tuple):
+        self.calls.setdefault(caller, set()).add(callee)
+
+
+    def GetReachableMethods(self, root:tuple) -> set:
+        # returns set of methods that can be called from root (root is in it).
+        # Uses stack instead of recursion, so length of chain of calls doesn't
+        # depend on Python stack
+        reachableMethods = {root}
+        methods = [root]
+        while methods:
+            for callee in self.calls.get(methods.pop(), ()):
+                if callee not in reachableMethods:
+                    reachableMethods.add(callee)
+                    methods.append(callee)
+        return reachableMethods
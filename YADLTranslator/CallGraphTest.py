@@ -0,0 +1,124 @@
+import io
+import unittest
+from Parser import Parser
+from SyntaxAnalyzer import SyntaxAnalyzer
+from CallGraph import CallGraph
+from SyntaxAnalyzerTest import Analyze
+
+MAIN = (None, 'main')
+
+# A.Hidden is called only from B.Run; A.Ping and A.Pong call themselves and
+# A.Pong calls A.Ping, but main doesn't call them
+SOURCE = '''class A {
+  int f;
+  Ping(int n) {
+    if (n > 0) { Ping(n); }
+  }
+  Pong(int n) {
+    Ping(n);
+    while (n > 0) { Pong(n); }
+  }
+  Hidden() {
+    prints('hidden');
+    print(this.f);
+  }
+}
+class B {
+  int g;
+  Run() {
+    A a = A.CreateInstance();
+    a.Hidden();
+  }
+  Unused() {
+    prints('unused');
+  }
+}
+main() {
+  B b = B.CreateInstance();
+  b.Run();
+}
+'''
+
+
+class Test_CallGraph(unittest.TestCase):
+    def test_transitive_calls(self):
+        callGraph = CallGraph()
+        callGraph.AddCall(MAIN, ('A', 'Run'))
+        callGraph.AddCall(('A', 'Run'), ('B', 'Run'))
+        callGraph.AddCall(('B', 'Run'), ('C', 'Show'))
+        callGraph.AddCall(('D', 'Run'), ('C', 'Hide'))
+        self.assertEqual(callGraph.GetReachableMethods(MAIN), {MAIN, ('A', 'Run'), ('B', 'Run'), ('C', 'Show')})
+        self.assertEqual(callGraph.GetReachableMethods(('C', 'Show')), {('C', 'Show')})
+
+
+    def test_unreachable_cycle(self):
+        callGraph = CallGraph()
+        callGraph.AddCall(MAIN, ('A', 'Run'))
+        callGraph.AddCall(('B', 'Ping'), ('C', 'Pong'))
+        callGraph.AddCall(('C', 'Pong'), ('D', 'Ping'))
+        callGraph.AddCall(('D', 'Ping'), ('B', 'Ping'))
+        self.assertEqual(callGraph.GetReachableMethods(MAIN), {MAIN, ('A', 'Run')})
+        self.assertEqual(callGraph.GetReachableMethods(('C', 'Pong')), {('B', 'Ping'), ('C', 'Pong'), ('D', 'Ping')})
+
+
+    def test_long_chain_of_calls(self):
+        callGraph = CallGraph()
+        callGraph.AddCall(MAIN, ('C0', 'Run'))
+        for i in range(1, 10000):
+            callGraph.AddCall(('C' + str(i - 1), 'Run'), ('C' + str(i), 'Run'))
+        self.assertEqual(len(callGraph.GetReachableMethods(MAIN)), 10001)
+
+
+    def test_calls_of_program(self):
+        program = Analyze(SOURCE, checkOnly=True).program
+        self.assertEqual(program.callGraph.calls[MAIN], {('B', 'Run')})
+        self.assertEqual(program.callGraph.calls[('B', 'Run')], {('A', 'Hidden')})
+        self.assertEqual(program.callGraph.calls[('A', 'Pong')], {('A', 'Ping'), ('A', 'Pong')})
+        # method of A is live only through method of B
+        self.assertEqual(program.callGraph.GetReachableMethods(MAIN), {MAIN, ('B', 'Run'), ('A', 'Hidden')})
+
+
+class Test_DeadMethods(unittest.TestCase):
+    def test_code_of_live_methods(self):
+        code = Analyze(SOURCE).BuildCode()
+        for label in ('_main:', '_B_Run:', '_A_Hidden:', 'db "hidden"'):
+            self.assertIn(label, code)
+        for label in ('_A_Ping:', '_A_Pong:', '_B_Unused:', 'db "unused"'):
+            self.assertNotIn(label, code)
+
+
+    def test_stats(self):
+        # without folding listings of dead methods have the same size as in code
+        # with dead methods (numbers of labels have one digit)
+        fullCode = Analyze(SOURCE, optimizationLevel=1, removeDeadMethods=False).BuildCode()
+        analyzer = Analyze(SOURCE, optimizationLevel=1, measureDeadMethods=True)
+        stats = (5, 3, len(fullCode), len(analyzer.BuildCode()))
+        self.assertEqual(analyzer.GetDeadMethodsStats(), stats)
+        # written code is measured too
+        outFile = io.StringIO()
+        analyzer = SyntaxAnalyzer(Parser.ParseText(SOURCE), optimizationLevel=1, measureDeadMethods=True)
+        analyzer.Analyze(outFile)
+        self.assertEqual(len(outFile.getvalue()), stats[3])
+        self.assertEqual(analyzer.GetDeadMethodsStats(), stats)
+
+
+    def test_stats_with_folding(self):
+        # dead method B.Copy is folded with live method A.Hidden
+        source = SOURCE.replace('  Unused() {', '''  Copy() {
+    prints('hidden');
+    print(this.g);
+  }
+  Unused() {''')
+        fullCode = Analyze(source, removeDeadMethods=False).BuildCode()
+        self.assertIn('_B_Copy equ _A_Hidden', fullCode)
+        analyzer = Analyze(source, measureDeadMethods=True)
+        self.assertEqual(analyzer.GetDeadMethodsStats(), (6, 4, len(fullCode), len(analyzer.BuildCode())))
+        # code without dead methods isn't measured
+        analyzer = Analyze(SOURCE, removeDeadMethods=False, measureDeadMethods=True)
+        size = len(analyzer.BuildCode())
+        self.assertEqual(analyzer.GetDeadMethodsStats(), (5, 0, size, size))
+        self.assertRaises(Exception, Analyze(SOURCE).GetDeadMethodsStats)
+
+
+if __name__ == '__main__':
+    unittest.main()
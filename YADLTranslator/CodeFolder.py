@@ -0,0 +1,46 @@
+import re
+import hashlib
+from Instruction import Label
+from Instruction import Alias
+from Instruction import RenderListing
+
+
+class CodeFolder(object):
+    """Optimization pass that folds identical code of methods. Code of method
+    (without its label) is hashed after labels of its blocks are numbered from
+    the start of method; method whose code is the same as code of method
+    emitted before becomes alias of its label, so its code isn't emitted"""
+
+    NAME = 'folding'
+    # the lowest optimization level that runs pass
+    LEVEL = 2
+    # labels of if and while blocks, they are unique in program
+    BLOCK_LABEL = re.compile(r'_(else_statement|while_condition|while_exit)_(\d+)')
+
+    def __init__(self):
+        # digest of code -> label of the first method with this code
+        self.labelsByDigest = dict()
+        self.foldedMethodsCount = 0
+        # size in chars of code that isn't emitted
+        self.savedSize = 0
+
+
+    def Run(self, listing:list) -> list:
+        # returns listing of method or its alias
+        if not listing or type(listing[0]) is not Label:
+            return listing
+        methodLabel = listing[0].name
+        code = RenderListing(listing[1:])
+        # the same labels get the same numbers in order of the first use
+        numbers = dict()
+        body = CodeFolder.BLOCK_LABEL.sub(lambda match: match.group(1) + '_'
+                                          + str(numbers.setdefault(match.group(0), len(numbers))), code)
+        digest = hashlib.sha256(body.encode('utf-8', 'surrogatepass')).digest()
+        canonicalLabel = self.labelsByDigest.get(digest)
+        if canonicalLabel == None:
+            self.labelsByDigest[digest] = methodLabel
+            return listing
+        alias = Alias(methodLabel, canonicalLabel)
+        self.foldedMethodsCount += 1
+        self.savedSize += len(listing[0].Render()) + len(code) - len(alias.Render())
+        return [alias]
@@ -0,0 +1,124 @@
+import os
+import re
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+from CodeFolder import CodeFolder
+from Instruction import Instruction
+from Instruction import Label
+from Instruction import Alias
+from Instruction import RenderListing
+from CodeGeneratorTest import MakeProgram
+from CodeGeneratorTest import WriteCode
+from SyntaxAnalyzerTest import Analyze
+from YADLTranslatorTest import TRANSLATOR_PATH
+
+ALIAS = re.compile(r'^(\w+) equ (\w+)$', re.MULTILINE)
+
+
+def MakeListing(methodLabel:str, firstIdNum:int, value:str = 'DWORD 0') -> list:
+    # returns listing of method with while block, numbers of its labels start from firstIdNum
+    conditionLabel = '_while_condition_' + str(firstIdNum)
+    exitLabel = '_while_exit_' + str(firstIdNum + 1)
+    return [Label(methodLabel),
+            Instruction('PUSH', ('EBP',), ' \n'),
+            Instruction('MOV', ('EBP', 'ESP'), ' \n'),
+            Label(conditionLabel, ''),
+            Instruction('MOV', ('EBX', value)),
+            Instruction('MOV', ('EAX', '[EBP + 12]'), ' \n'),
+            Instruction('CMP', ('EAX', 'EBX'), ' \n'),
+            Instruction('jnG', (exitLabel,)),
+            Instruction('JMP', (conditionLabel,)),
+            Label(exitLabel, ' \n'),
+            Instruction('MOV', ('ESP', 'EBP'), ' \n'),
+            Instruction('POP', ('EBP',), ' \n'),
+            Instruction('RET', (), ' \n')]
+
+
+class Test_CodeFolder(unittest.TestCase):
+    def test_methods_with_other_label_numbers_are_folded(self):
+        codeFolder = CodeFolder()
+        listing = MakeListing('_A_Run', 1)
+        self.assertIs(codeFolder.Run(listing), listing)
+        savedSize = 0
+        # the first method with this code is canonical
+        for methodLabel, firstIdNum in (('_B_Run', 7), ('_C_Run', 12)):
+            listing = MakeListing(methodLabel, firstIdNum)
+            folded = codeFolder.Run(listing)
+            self.assertEqual(len(folded), 1)
+            self.assertIs(type(folded[0]), Alias)
+            self.assertEqual(RenderListing(folded), methodLabel + ' equ _A_Run\n')
+            savedSize += len(RenderListing(listing)) - len(RenderListing(folded))
+        self.assertEqual(codeFolder.foldedMethodsCount, 2)
+        self.assertEqual(codeFolder.savedSize, savedSize)
+
+
+    def test_methods_with_other_operand_are_not_folded(self):
+        codeFolder = CodeFolder()
+        codeFolder.Run(MakeListing('_A_Run', 1))
+        listing = MakeListing('_B_Run', 3, 'DWORD 1')
+        self.assertIs(codeFolder.Run(listing), listing)
+        # label numbers are canonical only inside of method: other order of blocks is other code
+        listing = MakeListing('_C_Run', 5)
+        listing[4:4] = [Instruction('jnG', ('_while_exit_1',))]
+        self.assertIs(codeFolder.Run(listing), listing)
+        self.assertEqual(codeFolder.foldedMethodsCount, 0)
+        self.assertEqual(codeFolder.savedSize, 0)
+
+
+    def test_listing_without_method_label_is_not_folded(self):
+        codeFolder = CodeFolder()
+        listing = MakeListing('_A_Run', 1)[1:]
+        self.assertIs(codeFolder.Run(listing), listing)
+        self.assertIs(codeFolder.Run(listing), listing)
+        self.assertEqual(codeFolder.Run([]), [])
+        self.assertEqual(codeFolder.foldedMethodsCount, 0)
+
+
+    def test_aliases_resolve_in_code(self):
+        code = Analyze(MakeProgram(6)).BuildCode()
+        aliases = ALIAS.findall(code)
+        # Show of every class is the same as Show of the first class, Show of the last class is dead
+        self.assertEqual(aliases, [('_C' + str(i) + '_Show', '_C0_Show') for i in range(1, 5)])
+        for name, label in aliases:
+            self.assertEqual(code.count('\n' + label + ':'), 1)
+            self.assertLess(code.index('\n' + label + ':'), code.index('\n' + name + ' equ'))
+            self.assertNotIn('\n' + name + ':', code)
+            self.assertIn('CALL ' + name + '\n', code)
+
+
+    def test_folded_code_is_the_same_with_workers_and_streaming(self):
+        srcFile = MakeProgram(12)
+        analyzer = Analyze(srcFile)
+        code = analyzer.BuildCode()
+        self.assertEqual(analyzer.codeFolder.foldedMethodsCount, 10)
+        for workersCount in (0, 3):
+            with self.subTest(workersCount=workersCount):
+                workersAnalyzer = Analyze(srcFile, workersCount=workersCount)
+                self.assertEqual(workersAnalyzer.BuildCode(), code)
+                self.assertEqual(workersAnalyzer.codeFolder.savedSize, analyzer.codeFolder.savedSize)
+                self.assertEqual(WriteCode(srcFile, workersCount=workersCount), code)
+
+
+    def test_folded_code_of_command_line(self):
+        workDir = tempfile.mkdtemp()
+        try:
+            srcPath = os.path.join(workDir, 'src.txt')
+            open(srcPath, 'w').write(MakeProgram(8))
+            codes = list()
+            for options in ([], ['--jobs', '3'], ['--stream']):
+                result = subprocess.run([sys.executable, TRANSLATOR_PATH, srcPath, '-o', '-'] + options,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                codes.append(result.stdout)
+            self.assertEqual(len(ALIAS.findall(codes[0])), 6)
+            self.assertEqual(codes[1], codes[0])
+            self.assertEqual(codes[2], codes[0])
+        finally:
+            shutil.rmtree(workDir)
+
+
+if __name__ == '__main__':
+    unittest.main()
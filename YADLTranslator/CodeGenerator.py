@@ -0,0 +1,591 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from Token import TokenType
+from VariableTypes import LValueType
+from VariableTypes import RValueType
+from SyntaxTree import ValueNode
+from SyntaxTree import IntVarInitNode
+from SyntaxTree import StrVarInitNode
+from SyntaxTree import ObjectVarInitNode
+from SyntaxTree import AssigningNode
+from SyntaxTree import MethodCallNode
+from SyntaxTree import IfNode
+from SyntaxTree import WhileNode
+from SyntaxTree import PrintNode
+from SyntaxTree import PrintStringNode
+from SyntaxTree import MethodNode
+from SyntaxTree import ClassNode
+from SyntaxTree import ProgramNode
+from SyntaxTree import WalkStatements
+from CodeFolder import CodeFolder
+from Instruction import Instruction
+from Instruction import Label
+from Instruction import RenderListing
+from PeepholeOptimizer import PeepholeOptimizer
+from PassManager import PassManager
+
+
+class CodeGenerator(object):
+    """class that generates x86 asm code (NASM) from checked syntax tree
+    of YADL source file. Data for code (locations of variables, called
+    methods) is saved in nodes by SemanticAnalyzer, so code of every class
+    depends only on its node and can be generated in worker process"""
+
+    # Generate gives every worker about this count of chunks of classes for even load
+    CHUNKS_PER_WORKER = 4
+    # the lowest optimization level that removes dead methods
+    DEAD_METHODS_LEVEL = 1
+    # classes of syntax tree that is generated by forked workers
+    forkedClasses = None
+    # start of code section with functions for printing
+    RUNTIME_CODE = '\n'             \
+            + 'section .text \n'    \
+            + 'global _main\n\n'    \
+            + '_Print: \n'          \
+            + 'PUSH EBP \n'         \
+            + 'MOV EBP, ESP \n'     \
+            + 'MOV EAX, [EBP+8] \n' \
+            + 'PUSH EAX \n'         \
+            + 'PUSH NumFormat \n'   \
+            + 'CALL _printf \n'     \
+            + 'SUB ESP, 8 \n'       \
+            + 'MOV ESP, EBP \n'     \
+            + 'POP EBP \n'          \
+            + 'RET \n\n'            \
+            + '_PrintString: \n'    \
+            + 'PUSH EBP \n'         \
+            + 'MOV EBP, ESP \n'     \
+            + 'MOV EAX, [EBP+8] \n' \
+            + 'PUSH EAX \n'         \
+            + 'CALL _printf \n'     \
+            + 'SUB ESP, 4 \n'       \
+            + 'MOV ESP, EBP \n'     \
+            + 'POP EBP \n'          \
+            + 'RET \n\n'
+    # exit sequence of main
+    EXIT_CODE = 'XOR EAX, EAX \n'\
+            + 'RET \n\n'
+
+    def __init__(self, program:ProgramNode, definedClasses:dict, workersCount:int = 0, removeDeadMethods:bool = True,
+                 foldIdenticalCode:bool = True, optimizePeephole:bool = True, optimizationLevel:int = 2,
+                 verifyPasses:bool = False, measureDeadMethods:bool = False):
+        self.program = program
+        # dictionary that contains YADLClassData for every defined in src class
+        self.definedClasses = definedClasses
+        # vars that hold current values
+        self.currentClassName = str()
+        self.currentMethodName = str()
+        # dict that contains classes. Classe contains methods. Method contains list of
+        # its instructions, it is replaced with text of optimized code in order of source
+        self.listingsForClasses = dict()
+        # list of instructions and labels of generated method
+        self.currentListing = None
+        # variable for creating unique labels
+        self.originalIdNum = 0
+        # count of worker processes that generate code of classes, 0 or 1 - no workers
+        self.workersCount = workersCount
+        # code is generated only for methods that can be called from main
+        self.removeDeadMethods = removeDeadMethods and optimizationLevel >= CodeGenerator.DEAD_METHODS_LEVEL
+        # methods that can be called from main and classes with live methods,
+        # code is generated for them
+        self.liveMethods = None
+        self.classes = None
+        self.methodsCount = 0
+        self.deadMethodsCount = 0
+        # size in chars of rendered listings of methods
+        self.listingsSize = 0
+        # size in chars that code of dead methods and their strings would add to code,
+        # it is found after code if measureDeadMethods (see MeasureDeadMethods)
+        self.measureDeadMethods = measureDeadMethods
+        self.deadMethodsSize = 0
+        # passes of optimizationLevel run over listing of every method before it is rendered:
+        # instructions are rewritten by peephole rules, then method with the same
+        # code as method before becomes alias of it
+        self.passManager = PassManager(optimizationLevel, verifyPasses)
+        self.peepholeOptimizer = self.passManager.AddPass(PeepholeOptimizer()) if optimizePeephole else None
+        self.codeFolder = self.passManager.AddPass(CodeFolder()) if foldIdenticalCode else None
+        # type of statement node -> method that generates its code
+        self.statementGenerators = {
+            IntVarInitNode: self.IntVarInit,
+            StrVarInitNode: self.StrVarInit,
+            ObjectVarInitNode: self.ObjectVarInit,
+            AssigningNode: self.Assigning,
+            MethodCallNode: self.MethodCall,
+            IfNode: self.IfStatement,
+            WhileNode: self.WhileStatement,
+            PrintNode: self.PrintStatement,
+            PrintStringNode: self.PrintStringStatement
+        }
+        # type of statement node -> method that generates code of the end of its block
+        self.blockEndGenerators = {
+            IfNode: self.EndIfStatement,
+            WhileNode: self.EndWhileStatement
+        }
+        # list of strings declarations
+        self.dataSection = ['section .data \n',
+                            "NumFormat: db '%d', 0xA, 0 \n"]
+
+
+    def Generate(self):
+        self.FindLiveMethods()
+        self.dataSection.extend(self.program.stringPool.GetDeclarations(self.liveMethods))
+        for chunkCode in self.GenerateClassesCode(*self.SplitClasses()):
+            self.AddClassesCode(chunkCode)
+        self.MainDef(self.program.main)
+        mainCode = self.listingsForClasses[None]
+        mainCode['main'] = self.FinishListing(mainCode['main'])
+        if self.measureDeadMethods:
+            self.MeasureDeadMethods()
+
+
+    def FindLiveMethods(self):
+        # marks methods that can't be called from main as dead (if removeDeadMethods)
+        # and finds out classes with live methods. Class without live methods is dropped
+        liveMethods = None
+        if self.removeDeadMethods:
+            liveMethods = self.program.callGraph.GetReachableMethods((None, 'main'))
+        self.liveMethods = liveMethods
+        self.classes = list()
+        self.methodsCount = 0
+        self.deadMethodsCount = 0
+        for classNode in self.program.classes:
+            className = classNode.nameToken.value
+            hasLiveMethods = False
+            for method in classNode.methods:
+                method.isLive = liveMethods == None or (className, method.nameToken.value) in liveMethods
+                hasLiveMethods = hasLiveMethods or method.isLive
+                self.methodsCount += 1
+                if not method.isLive:
+                    self.deadMethodsCount += 1
+            if hasLiveMethods:
+                self.classes.append(classNode)
+
+
+    def SplitClasses(self) -> tuple:
+        # returns bounds of chunks of classes and the first original numbers of
+        # their labels. Labels are numbered in order of source. Count of labels
+        # of every class is known before its code, so chunk of classes numbers its
+        # labels from its own first number and code of chunks is generated in any
+        # process. Original number is set to the first number of main
+        classes = self.classes
+        chunksCount = 1
+        if self.workersCount > 1:
+            chunksCount = min(len(classes), self.workersCount * CodeGenerator.CHUNKS_PER_WORKER)
+        chunkSize = len(classes) // chunksCount + 1 if chunksCount > 0 else 0
+        starts = list(range(0, len(classes), chunkSize)) if chunkSize > 0 else []
+        ends = starts[1:] + [len(classes)]
+        firstIdNums = list()
+        for start, end in zip(starts, ends):
+            firstIdNums.append(self.originalIdNum)
+            for classNode in classes[start:end]:
+                self.originalIdNum += CodeGenerator.CountLabels(classNode)
+        return starts, ends, firstIdNums
+
+
+    def GenerateClassesCode(self, starts:list, ends:list, firstIdNums:list):
+        # yields code of chunks of classes in order of source (see GenerateChunk).
+        # Workers are forked where it is possible (Linux), otherwise (Windows,
+        # macOS) they are spawned; code doesn't depend on start method
+        classes = self.classes
+        if len(starts) > 1:
+            if 'fork' in multiprocessing.get_all_start_methods():
+                # forked workers have syntax tree in their memory, so only
+                # bounds of chunks are sent to them
+                CodeGenerator.forkedClasses = classes
+                chunks = [None] * len(starts)
+                context = multiprocessing.get_context('fork')
+            else:
+                # spawned workers start with empty memory, so classes of
+                # chunks are pickled and sent to them
+                chunks = [classes[start:end] for start, end in zip(starts, ends)]
+                context = multiprocessing.get_context('spawn')
+            try:
+                with ProcessPoolExecutor(self.workersCount, mp_context=context) as executor:
+                    yield from executor.map(CodeGenerator.GenerateChunk, starts, ends, firstIdNums, chunks)
+            finally:
+                CodeGenerator.forkedClasses = None
+        else:
+            for start, end, firstIdNum in zip(starts, ends, firstIdNums):
+                yield CodeGenerator.GenerateChunk(start, end, firstIdNum, classes[start:end])
+
+
+    def WriteCode(self, outFile):
+        # generates code and writes it to outFile (text stream) in order of BuildCode
+        # section after section. Code of every method (of chunk of classes with
+        # workers) is written as soon as it is generated and then dropped, so code
+        # of whole program isn't kept in memory
+        self.FindLiveMethods()
+        self.dataSection.extend(self.program.stringPool.GetDeclarations(self.liveMethods))
+        outFile.write('extern _printf \n\n')
+        outFile.writelines(self.dataSection)
+        outFile.write(CodeGenerator.RUNTIME_CODE)
+
+        if self.workersCount > 1:
+            bounds = self.SplitClasses()
+        else:
+            for classNode in self.classes:
+                self.originalIdNum += CodeGenerator.CountLabels(classNode)
+        self.MainDef(self.program.main)
+        self.WriteListing(outFile)
+        outFile.write(CodeGenerator.EXIT_CODE)
+
+        if self.workersCount > 1:
+            for chunkCode in self.GenerateClassesCode(*bounds):
+                for className, listings in chunkCode:
+                    for methodName, listing in listings.items():
+                        outFile.write(self.FinishListing(listing))
+        else:
+            self.originalIdNum = 0
+            for classNode in self.classes:
+                self.currentClassName = classNode.nameToken.value
+                self.listingsForClasses[self.currentClassName] = dict()
+                for method in classNode.methods:
+                    if method.isLive:
+                        self.MethodDef(method)
+                        self.WriteListing(outFile)
+                del self.listingsForClasses[self.currentClassName]
+        if self.measureDeadMethods:
+            self.MeasureDeadMethods()
+
+
+    def WriteListing(self, outFile):
+        # writes code of generated method and drops it
+        listing = self.listingsForClasses[self.currentClassName].pop(self.currentMethodName)
+        outFile.write(self.FinishListing(listing))
+
+
+    def FinishListing(self, listing:list) -> str:
+        # returns text of listing of method optimized by passes. Passes run in
+        # order of source in this process, so method is folded with the same
+        # method before it with workers too
+        code = RenderListing(self.passManager.Run(listing))
+        self.listingsSize += len(code)
+        return code
+
+
+    def MeasureDeadMethods(self):
+        # finds size of code and strings that dead methods would add to code.
+        # Their listings are optimized by own passes of other generator, so code
+        # and statistics of live methods don't change. Dead method is folded with
+        # live methods and dead methods before it, but its labels are numbered
+        # from 1 and it isn't folded in order of source, so size is estimate
+        generator = CodeGenerator(None, None, 0, False, self.codeFolder != None, self.peepholeOptimizer != None,
+                                  self.passManager.optimizationLevel)
+        if self.codeFolder != None:
+            generator.codeFolder.labelsByDigest = dict(self.codeFolder.labelsByDigest)
+        for classNode in self.program.classes:
+            generator.currentClassName = classNode.nameToken.value
+            generator.listingsForClasses[generator.currentClassName] = dict()
+            for method in classNode.methods:
+                if not method.isLive:
+                    generator.MethodDef(method)
+                    generator.FinishListing(generator.listingsForClasses[generator.currentClassName].pop(
+                        generator.currentMethodName))
+        stringPool = self.program.stringPool
+        deadStringsSize = sum(len(declaration) for declaration in stringPool.GetDeclarations()) \
+                          - sum(len(declaration) for declaration in stringPool.GetDeclarations(self.liveMethods))
+        self.deadMethodsSize = generator.listingsSize + deadStringsSize
+
+
+    def GetCodeSize(self) -> int:
+        # returns size in chars of code that is built or written
+        return len('extern _printf \n\n') + sum(len(declaration) for declaration in self.dataSection) \
+               + len(CodeGenerator.RUNTIME_CODE) + len(CodeGenerator.EXIT_CODE) + self.listingsSize
+
+
+    def AddClassesCode(self, classesCode:list):
+        # adds code of classes in order of source
+        for className, listings in classesCode:
+            self.listingsForClasses[className] = {methodName: self.FinishListing(listing)
+                                                  for methodName, listing in listings.items()}
+
+
+    @staticmethod
+    def GenerateChunk(start:int, end:int, originalIdNum:int, classes:list = None) -> list:
+        # runs in worker process of Generate. Returns name of class and dict of
+        # listings of its methods for every class of chunk.
+        # Forked worker takes classes from syntax tree of parent process
+        if classes == None:
+            classes = CodeGenerator.forkedClasses[start:end]
+        generator = CodeGenerator(None, None)
+        generator.originalIdNum = originalIdNum
+        classesCode = list()
+        for classNode in classes:
+            generator.currentClassName = classNode.nameToken.value
+            generator.listingsForClasses[generator.currentClassName] = dict()
+            for method in classNode.methods:
+                if method.isLive:
+                    generator.MethodDef(method)
+            classesCode.append((generator.currentClassName, generator.listingsForClasses[generator.currentClassName]))
+        return classesCode
+
+
+    @staticmethod
+    def CountLabels(classNode:ClassNode) -> int:
+        # returns count of original numbers that code of live methods of class takes
+        labelsCount = 0
+        for method in classNode.methods:
+            if not method.isLive:
+                continue
+            for statement, isBlockEnd in WalkStatements(method.statements):
+                if isBlockEnd:
+                    continue
+                if type(statement) is IfNode:
+                    labelsCount += 1
+                elif type(statement) is WhileNode:
+                    labelsCount += 2
+        return labelsCount
+
+
+    def GetOriginalIdNum(self) -> int:
+        # return original number for asm labels
+        self.originalIdNum += 1
+        return self.originalIdNum
+
+
+    def AddCode(self, *instructions):
+        self.currentListing.extend(instructions)
+
+
+    def StartListing(self):
+        # creates code of current method
+        self.currentListing = list()
+
+
+    def EndListing(self):
+        # adds listing of current method to code of its class
+        self.listingsForClasses[self.currentClassName][self.currentMethodName] = self.currentListing
+        self.currentListing = None
+
+
+    def MethodDef(self, method:MethodNode):
+        self.currentMethodName = method.nameToken.value
+        # create new stack frame
+        self.StartListing()
+        self.AddCode(Label('_' + self.currentClassName + '_' + self.currentMethodName),
+                     Instruction('PUSH', ('EBP',), ' \n'),
+                     Instruction('MOV', ('EBP', 'ESP'), ' \n'))
+
+        self.Statements(method.statements)
+
+        # cleans up the stack
+        self.AddCode(Instruction('ADD', ('ESP', str(method.localsSize))))
+        # restore EBP
+        self.AddCode(Instruction('MOV', ('ESP', 'EBP'), ' \n'),
+                     Instruction('POP', ('EBP',), ' \n'),
+                     Instruction('RET', (), ' \n'))
+        self.EndListing()
+
+
+    def MainDef(self, main:MethodNode):
+        self.currentMethodName = 'main'
+        self.currentClassName = None
+        self.listingsForClasses[self.currentClassName] = dict()
+        self.StartListing()
+        self.AddCode(Label('_main', ' \n'),
+                     Instruction('MOV', ('EBP', 'ESP'), ' \n'))
+
+        self.Statements(main.statements)
+
+        # cleans up the stack
+        self.AddCode(Instruction('ADD', ('ESP', str(main.localsSize))))
+        self.EndListing()
+
+
+    def Statements(self, statements:list):
+        # labels of open blocks are kept in stack; code of the end of block is
+        # generated after statements of the block
+        labels = list()
+        for statement, isBlockEnd in WalkStatements(statements):
+            if isBlockEnd:
+                self.blockEndGenerators[type(statement)](statement, labels.pop())
+            else:
+                blockLabels = self.statementGenerators[type(statement)](statement)
+                if blockLabels != None:
+                    labels.append(blockLabels)
+
+
+    def IntVarInit(self, node:IntVarInitNode):
+        self.AddCode(Instruction('SUB', ('ESP', '4'), ' \n'),
+                     *self.PushVarAddressOrValueToEAX(node.value),
+                     Instruction('MOV', ('[ESP]', 'EAX'), ' \n'))
+
+
+    def StrVarInit(self, node:StrVarInitNode):
+        # string is declared in data section by StringPool
+        pass
+
+
+    def ObjectVarInit(self, node:ObjectVarInitNode):
+        if node.constructorEndToken != None:
+            # allocate space in stack and set 0
+            for i in range(0, node.fieldsCount):
+                self.AddCode(Instruction('SUB', ('ESP', '4'), ' \n'),
+                             Instruction('MOV', ('[ESP]', 'DWORD 0'), ' \n'))
+        else:
+            # EAX contains address of first variable of object
+            self.CopyObject(node.copyLocations)
+
+
+    def CopyObject(self, copyLocations:list):
+        for rightLocation, leftLocation in copyLocations:
+            self.AddCode(Instruction('MOV', ('EDX', '[EAX - ' + str(rightLocation) + ']'), ' \n'),
+                         Instruction('MOV', ('[EBP - ' + str(leftLocation) + ']', 'EDX'), ' \n'))
+
+
+    def Assigning(self, node:AssigningNode):
+        if node.copyLocations == None:
+            self.AddCode(*self.PushVarAddressToEBX(node.left),
+                         *self.PushVarAddressOrValueToEAX(node.value),
+                         Instruction('MOV', ('[EBX]', 'EAX'), ' \n'))
+        else:
+            # EAX contains address of first variable of object
+            self.CopyObject(node.copyLocations)
+
+
+    def MethodCall(self, node:MethodCallNode):
+        if node.method.paramName != None:
+            self.AddCode(*self.PushVarAddressOrValueToEAX(node.argument),
+                         Instruction('PUSH', ('EAX',), ' \n'))
+
+        if node.objectToken == None:
+            self.AddCode(Instruction('PUSH', ('DWORD [EBP + 8]',), ' \n'))
+        else:
+            self.AddCode(Instruction('MOV', ('EBX', 'EBP'), ' \n'),
+                         Instruction('SUB', ('EBX', str(node.objectLocation))),
+                         Instruction('PUSH', ('EBX',), ' \n'))
+
+        self.AddCode(Instruction('CALL', ('_' + node.className + '_' + node.method.name,)))
+
+        if node.method.paramName == None:
+            self.AddCode(Instruction('ADD', ('ESP', '4'), ' \n'))
+        else:
+            self.AddCode(Instruction('ADD', ('ESP', '8'), ' \n'))
+
+
+    def GetCompareInstruction(self, cmpType:TokenType) -> str:
+        cmpInstr = str()
+        if cmpType == TokenType.EQUAL:
+            cmpInstr = 'E'
+        elif cmpType == TokenType.GREATER:
+            cmpInstr = 'G'
+        elif cmpType == TokenType.GREATER_EQUAL:
+            cmpInstr = 'GE'
+        elif cmpType == TokenType.LESS:
+            cmpInstr = 'L'
+        elif cmpType == TokenType.LESS_EQUAL:
+            cmpInstr = 'LE'
+        return cmpInstr
+
+
+    def IfStatement(self, node:IfNode) -> tuple:
+        self.AddCode(*self.PushVarAddressOrValueToEAX(node.right),
+                     Instruction('MOV', ('EBX', 'EAX'), ' \n'),
+                     *self.PushVarAddressOrValueToEAX(node.left),
+                     Instruction('CMP', ('EAX', 'EBX'), ' \n'))
+
+        jmpLabel = '_else_statement_' + str(self.GetOriginalIdNum())
+        # jump to else statement (code after if statements)
+        self.AddCode(Instruction('jn' + self.GetCompareInstruction(node.compareToken.type), (jmpLabel,)))
+        return (jmpLabel,)
+
+
+    def EndIfStatement(self, node:IfNode, labels:tuple):
+        jmpLabel, = labels
+        self.AddCode(Instruction('ADD', ('ESP', str(node.scopeSymbolsCount))))
+        self.AddCode(Label(jmpLabel, ' \n'))
+
+
+    def WhileStatement(self, node:WhileNode) -> tuple:
+        whileConditionLabel = '_while_condition_' + str(self.GetOriginalIdNum())
+        self.AddCode(Label(whileConditionLabel, ''),
+                     *self.PushVarAddressOrValueToEAX(node.right),
+                     Instruction('MOV', ('EBX', 'EAX'), ' \n'),
+                     *self.PushVarAddressOrValueToEAX(node.left),
+                     Instruction('CMP', ('EAX', 'EBX'), ' \n'))
+
+        whileExitLabel = '_while_exit_' + str(self.GetOriginalIdNum())
+        # jump to else statement (code after if statements)
+        self.AddCode(Instruction('jn' + self.GetCompareInstruction(node.compareToken.type), (whileExitLabel,)))
+        return (whileConditionLabel, whileExitLabel)
+
+
+    def EndWhileStatement(self, node:WhileNode, labels:tuple):
+        whileConditionLabel, whileExitLabel = labels
+        self.AddCode(Instruction('ADD', ('ESP', str(node.scopeSymbolsCount))))
+        self.AddCode(Instruction('JMP', (whileConditionLabel,)),
+                     Label(whileExitLabel, ' \n'))
+
+
+    def PrintStatement(self, node:PrintNode):
+        self.AddCode(*self.PushVarAddressOrValueToEAX(node.value),
+                     Instruction('PUSH', ('EAX',), ' \n'),
+                     Instruction('CALL', ('_Print',), ' \n'),
+                     Instruction('ADD', ('ESP', '4'), ' \n'))
+
+
+    def PrintStringStatement(self, node:PrintStringNode):
+        self.AddCode(Instruction('PUSH', ('DWORD ' + node.label,)),
+                     Instruction('CALL', ('_PrintString',), ' \n'),
+                     Instruction('ADD', ('ESP', '4'), ' \n'))
+
+
+    def BuildCode(self) -> str:
+        # parts of code are joined once
+        code = ['extern _printf \n\n']
+        code.extend(self.dataSection)
+        # place function for printing numbers at code start
+        code.append(CodeGenerator.RUNTIME_CODE)
+
+        code.append(self.listingsForClasses[None]['main'])
+        code.append(CodeGenerator.EXIT_CODE)
+
+        for className in self.listingsForClasses.keys():
+            if className != None:
+                for methodName in self.listingsForClasses[className].keys():
+                    code.append(self.listingsForClasses[className][methodName])
+
+        return ''.join(code)
+
+
+    def PushVarAddressToEBX(self, lvalue:ValueNode) -> list:
+        if lvalue.valueType == LValueType.VARIABLE:
+            if lvalue.isParam:
+                return [Instruction('MOV', ('EBX', '[EBP + 12]'))]
+            else:
+                return [Instruction('MOV', ('EBX', 'EBP')),
+                        Instruction('SUB', ('EBX', str(lvalue.location)))]
+        elif lvalue.valueType == LValueType.OBJECT_WITH_INT_VARIABLE:
+            if lvalue.isParam:
+                return [Instruction('MOV', ('EBX', '[EBP + 12]')),
+                        Instruction('SUB', ('EBX', str(lvalue.offset)))]
+            else:
+                return [Instruction('MOV', ('EBX', 'EBP')),
+                        Instruction('SUB', ('EBX', str(lvalue.location + lvalue.offset)))]
+        else:
+            # LValueType.VARIABLE_OF_CURRENT_CLASS
+            return [Instruction('MOV', ('EBX', '[EBP + 8]'), ' \n'),
+                    Instruction('SUB', ('EBX', str(lvalue.offset)))]
+
+
+    def PushVarAddressOrValueToEAX(self, rvalue:ValueNode) -> list:
+        if rvalue.valueType == RValueType.VARIABLE:
+            if rvalue.isParam:
+                return [Instruction('MOV', ('EAX', '[EBP + 12]'), ' \n')]
+            elif rvalue.varType == 'int':
+                return [Instruction('MOV', ('EAX', '[EBP - ' + str(rvalue.location) + ']'))]
+            else:
+                return [Instruction('MOV', ('EAX', 'EBP')),
+                        Instruction('SUB', ('EAX', str(rvalue.location)))]
+        elif rvalue.valueType == RValueType.OBJECT_WITH_INT_VARIABLE:
+            if rvalue.isParam:
+                return [Instruction('MOV', ('EAX', '[EBP + 12]')),
+                        Instruction('MOV', ('EAX', '[EAX - ' + str(rvalue.offset) + ']'))]
+            else:
+                return [Instruction('MOV', ('EAX', '[EBP - ' + str(rvalue.location + rvalue.offset) + ']'))]
+        elif rvalue.valueType == RValueType.VARIABLE_OF_CURRENT_CLASS:
+            return [Instruction('MOV', ('EAX', '[EBP + 8]'), ' \n'),
+                    Instruction('MOV', ('EAX', '[EAX - ' + str(rvalue.offset) + ']'))]
+        else:
+            # RValueType.NUMBER
+            return [Instruction('MOV', ('EAX', 'DWORD ' + rvalue.nameToken.value))]
@@ -0,0 +1,117 @@
+import io
+import unittest
+from unittest import mock
+from Parser import Parser
+from SyntaxAnalyzer import SyntaxAnalyzer
+from CodeGenerator import CodeGenerator
+from Benchmark import ConcatenatingCodeGenerator
+from SyntaxAnalyzerTest import Analyze
+
+
+def MakeProgram(classesCount:int) -> str:
+    # returns source with classes that call methods of previous class; every
+    # class has blocks, strings, method with the same code in every class and
+    # method that isn't called
+    lines = list()
+    for i in range(classesCount):
+        lines += ['class C' + str(i) + ' {',
+                  '  int f;',
+                  '  int g;',
+                  '  Run(int n) {',
+                  '    if (n < ' + str(i) + ') { print(n); }',
+                  '    while (this.f < n) { this.f = n; prints(\'class ' + str(i % 3) + '\'); }']
+        if i > 0:
+            lines += ['    C' + str(i - 1) + ' o = C' + str(i - 1) + '.CreateInstance();',
+                      '    o.Run(n);',
+                      '    o.Show();']
+        lines += ['  }',
+                  '  Show() {',
+                  '    print(this.g);',
+                  '    prints(\'show\');',
+                  '  }',
+                  '  Unused() {',
+                  '    while (this.g > 0) { this.g = 0; }',
+                  '  }',
+                  '}']
+    lines += ['main() {',
+              '  int n = 3;',
+              '  C' + str(classesCount - 1) + ' o = C' + str(classesCount - 1) + '.CreateInstance();',
+              '  o.Run(n);',
+              '  if (n == 3) { prints(\'end\'); }',
+              '}']
+    return '\n'.join(lines) + '\n'
+
+
+def WriteCode(srcFile:str, **options) -> str:
+    # returns code that Analyze writes to text stream
+    outFile = io.StringIO()
+    SyntaxAnalyzer(Parser.ParseText(srcFile), **options).Analyze(outFile)
+    return outFile.getvalue()
+
+
+class Test_Workers(unittest.TestCase):
+    def test_code_is_identical_to_serial_code(self):
+        srcFile = MakeProgram(12)
+        for optimizationLevel in (0, 2):
+            code = Analyze(srcFile, optimizationLevel=optimizationLevel).BuildCode()
+            for workersCount in (2, 3):
+                with self.subTest(optimizationLevel=optimizationLevel, workersCount=workersCount):
+                    self.assertEqual(Analyze(srcFile, workersCount=workersCount,
+                                             optimizationLevel=optimizationLevel).BuildCode(), code)
+                    self.assertEqual(WriteCode(srcFile, workersCount=workersCount,
+                                               optimizationLevel=optimizationLevel), code)
+
+
+    def test_spawned_workers(self):
+        # platforms without fork send classes to workers
+        srcFile = MakeProgram(6)
+        code = Analyze(srcFile).BuildCode()
+        with mock.patch('multiprocessing.get_all_start_methods', return_value=['spawn']):
+            self.assertEqual(Analyze(srcFile, workersCount=2).BuildCode(), code)
+        self.assertIsNone(CodeGenerator.forkedClasses)
+
+
+class Test_Streaming(unittest.TestCase):
+    def test_written_code_is_identical_to_built_code(self):
+        srcFile = MakeProgram(5)
+        for options in ({'optimizationLevel': 0}, {'optimizationLevel': 1}, {'optimizationLevel': 2},
+                        {'removeDeadMethods': False}, {'foldIdenticalCode': False, 'optimizePeephole': False}):
+            with self.subTest(**options):
+                self.assertEqual(WriteCode(srcFile, **options), Analyze(srcFile, **options).BuildCode())
+
+
+    def test_code_is_not_kept(self):
+        analyzer = SyntaxAnalyzer(Parser.ParseText(MakeProgram(3)))
+        analyzer.Analyze(io.StringIO())
+        self.assertIsNone(analyzer.codeGenerator)
+        self.assertRaises(Exception, analyzer.BuildCode)
+
+
+class Test_Listings(unittest.TestCase):
+    def test_same_code_as_concatenated_text(self):
+        # listings of methods are joined once, text is the same as text that is
+        # concatenated instruction by instruction (in main, that has every statement)
+        analyzer = Analyze(MakeProgram(4).replace('main() {', '''main() {
+  int a = 1;
+  str s = 'text';
+  C0 p = C0.CreateInstance();
+  C0 q = p;
+  p.f = a;
+  a = p.g;
+  q = p;
+  p.Run(a);
+  if (a <= 2) { print(a); }
+  while (a >= 3) { a = 3; prints(s); }
+  if (p.f > a) { print(p.g); }'''), checkOnly=True)
+        codes = list()
+        for generatorType in (CodeGenerator, ConcatenatingCodeGenerator):
+            generator = generatorType(analyzer.program, analyzer.semanticAnalyzer.definedClasses,
+                                      optimizationLevel=0)
+            generator.Generate()
+            codes.append(generator.BuildCode())
+        self.assertEqual(codes[0], codes[1])
+        self.assertIn('_main: \nMOV EBP, ESP \n', codes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+class YADLError(Exception):
+    """Base class of errors found by SyntaxAnalyzer in YADL source file. Error
+    holds message and line and position of the token where it is found (None
+    when file has no tokens)"""
+    def __init__(self, message:str = '', line:int = None, pos:int = None):
+        super().__init__(message)
+        self.message = message
+        self.line = line
+        self.pos = pos
+
+
+    def __str__(self):
+        if self.line == None:
+            return self.message + 'Unexpected end of file!'
+        return self.message + 'Unexpected syntax token at line: ' + str(self.line) \
+            + ' and position: ' + str(self.pos)
+
+
+class YADLSyntaxError(YADLError):
+    """Token that doesn't fit grammar of YADL; message is usually empty"""
+
+
+class YADLSemanticError(YADLError):
+    """Grammatically correct code that uses undefined name, wrong type or
+    defines name twice"""
+
+
+class Diagnostics(object):
+    """Class that collects errors of one analysis in order they are found.
+    Error at the same token as the previous one is a consequence of it, so it
+    isn't added"""
+    def __init__(self):
+        self.errors = list()
+
+
+    def Add(self, error:YADLError):
+        if self.errors:
+            lastError = self.errors[-1]
+            if lastError.line == error.line and lastError.pos == error.pos:
+                return
+        self.errors.append(error)
+
+
+    def HasErrors(self) -> bool:
+        return len(self.errors) > 0
+
+
+    def __str__(self):
+        return '\n'.join(str(error) for error in self.errors)
+
+
+class AnalysisError(Exception):
+    """Exception raised by SyntaxAnalyzer.Analyze when source file has errors;
+    its text contains all of them, one per line"""
+    def __init__(self, diagnostics:Diagnostics):
+        super().__init__(str(diagnostics))
+        self.diagnostics = diagnostics
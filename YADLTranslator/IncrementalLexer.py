@@ -0,0 +1,154 @@
+from Token import Token
+from Token import TokenType
+from Parser import Parser
+
+
+class IncrementalLexer(object):
+    """Class that keeps source text with its tokens between edits (for editor
+    integration). After an edit only text around it is lexed again, up to the
+    first token that starts the same way as before the edit. Following tokens
+    are shifted: tokens on the line of that token get new positions, all of
+    them get new offsets and maybe lines. Offset and line shift of the tail
+    is pending until tokens are requested, so an edit takes about the same
+    time in small and big files"""
+
+    # size of text pieces that are given to Parser.ScanChunks after an edit
+    CHUNK_SIZE = 4096
+
+    def __init__(self, srcText:str, tokens:list = None):
+        # tokens should be Parser tokens of srcText (with offsets)
+        self.text = srcText
+        if tokens == None:
+            tokens = Parser.ParseWithRegex(srcText)
+        self.tokens = list(tokens)
+        # tokens from pendingIndex have line and offset from before the last edits,
+        # actual values are line + pendingLineShift and offset + pendingOffsetShift
+        self.pendingIndex = len(self.tokens)
+        self.pendingLineShift = 0
+        self.pendingOffsetShift = 0
+
+
+    @staticmethod
+    def Relex(srcText:str, tokens:list, offset:int, removedLength:int, insertedText:str):
+        # returns text and its tokens after one edit of srcText
+        lexer = IncrementalLexer(srcText, tokens)
+        lexer.Edit(offset, removedLength, insertedText)
+        return lexer.text, lexer.GetTokens()
+
+
+    def GetTokens(self) -> list:
+        # tokens of current text; equal to tokens of full lexing
+        self.ApplyPendingShift(len(self.tokens))
+        return self.tokens
+
+
+    def GetToken(self, index:int) -> Token:
+        token = self.tokens[index]
+        if index < self.pendingIndex:
+            return token
+        return Token(token.type, token.value, token.line + self.pendingLineShift, token.pos,
+                     token.offset + self.pendingOffsetShift)
+
+
+    def ApplyPendingShift(self, endIndex:int):
+        # applies pending shift to tokens before endIndex
+        if endIndex <= self.pendingIndex:
+            return
+        self.ShiftTokens(self.pendingIndex, endIndex, self.pendingLineShift, 0, self.pendingOffsetShift)
+        self.pendingIndex = endIndex
+        if self.pendingIndex == len(self.tokens):
+            self.pendingLineShift = 0
+            self.pendingOffsetShift = 0
+
+
+    def ShiftTokens(self, startIndex:int, endIndex:int, lineShift:int, posShift:int, offsetShift:int):
+        for i in range(startIndex, endIndex):
+            token = self.tokens[i]
+            self.tokens[i] = Token(token.type, token.value, token.line + lineShift, token.pos + posShift,
+                                   token.offset + offsetShift)
+
+
+    def FindFirstTokenEndingAt(self, offset:int) -> int:
+        # binary search of the first token that ends at offset or later
+        low = 0
+        high = len(self.tokens)
+        while low < high:
+            middle = (low + high) // 2
+            token = self.GetToken(middle)
+            if token.offset + len(token.value) < offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+
+    def Edit(self, offset:int, removedLength:int, insertedText:str):
+        # replaces removedLength chars from offset with insertedText. Returns
+        # index of the first changed token, count of removed and count of new tokens
+        newText = self.text[:offset] + insertedText + self.text[offset+removedLength:]
+        editEnd = offset + len(insertedText)
+        offsetShift = len(insertedText) - removedLength
+
+        # lexing starts from the token before the edit: it can't change, but
+        # only its state is known when the edit is in whitespace after it
+        firstIndex = self.FindFirstTokenEndingAt(offset)
+        self.ApplyPendingShift(firstIndex)
+        if firstIndex == 0:
+            startIndex = 0
+            srcOffset = 0
+            currLineNum = 1
+            currCharNum = 0
+        else:
+            startIndex = firstIndex - 1
+            startToken = self.tokens[startIndex]
+            srcOffset = startToken.offset
+            currLineNum = startToken.line
+            if startToken.type == TokenType.STRING_LITERAL:
+                currCharNum = startToken.pos
+            else:
+                # not the last token, so its position is counted after char before it
+                currCharNum = startToken.pos - 1
+
+        chunks = (newText[i:i+self.CHUNK_SIZE] for i in range(srcOffset, len(newText), self.CHUNK_SIZE))
+        newTokens = list()
+        syncIndex = None
+        oldIndex = firstIndex
+        for token in Parser.ScanChunks(chunks, srcOffset, currLineNum, currCharNum):
+            if token.offset >= editEnd:
+                # text after token is the same as after old token with such offset,
+                # so all following tokens are the same
+                oldOffset = token.offset - offsetShift
+                while oldIndex < len(self.tokens) and self.GetToken(oldIndex).offset < oldOffset:
+                    oldIndex += 1
+                if oldIndex < len(self.tokens) and self.GetToken(oldIndex).offset == oldOffset:
+                    syncIndex = oldIndex
+                    syncToken = token
+                    break
+            newTokens.append(token)
+
+        if syncIndex == None:
+            self.ApplyPendingShift(len(self.tokens))
+            removedCount = len(self.tokens) - startIndex
+            self.tokens[startIndex:] = newTokens
+            self.pendingIndex = len(self.tokens)
+        else:
+            oldSyncToken = self.GetToken(syncIndex)
+            lineShift = syncToken.line - oldSyncToken.line
+            posShift = syncToken.pos - oldSyncToken.pos
+            # new line resets position, so only tokens on the line of sync token get posShift
+            lineEndIndex = syncIndex
+            while lineEndIndex < len(self.tokens) and self.GetToken(lineEndIndex).line == oldSyncToken.line:
+                lineEndIndex += 1
+            self.ApplyPendingShift(lineEndIndex)
+            if self.pendingLineShift == 0 and self.pendingOffsetShift == 0:
+                # nothing is pending, so the tail can start right after the line
+                self.pendingIndex = lineEndIndex
+            self.ShiftTokens(syncIndex, lineEndIndex, lineShift, posShift, offsetShift)
+            self.ShiftTokens(lineEndIndex, self.pendingIndex, lineShift, 0, offsetShift)
+            self.pendingLineShift += lineShift
+            self.pendingOffsetShift += offsetShift
+            removedCount = syncIndex - startIndex
+            self.tokens[startIndex:syncIndex] = newTokens
+            self.pendingIndex += len(newTokens) - removedCount
+        self.text = newText
+        return startIndex, removedCount, len(newTokens)
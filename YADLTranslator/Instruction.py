@@ -0,0 +1,48 @@
+class Instruction(object):
+    """Instruction of x86 asm code: opcode and operands (strings, ex. 'EAX',
+    '[EBP - 8]', 'DWORD 5'). End is text after instruction in listing"""
+    __slots__ = ('opcode', 'operands', 'end')
+
+    def __init__(self, opcode:str, operands:tuple = (), end:str = '\n'):
+        self.opcode = opcode
+        self.operands = operands
+        self.end = end
+
+
+    def Render(self) -> str:
+        if not self.operands:
+            return self.opcode + self.end
+        return self.opcode + ' ' + ', '.join(self.operands) + self.end
+
+
+class Label(object):
+    """Label in asm code; instruction after label without new line follows it
+    in the same line"""
+    __slots__ = ('name', 'end')
+
+    def __init__(self, name:str, end:str = '\n'):
+        self.name = name
+        self.end = end
+
+
+    def Render(self) -> str:
+        return self.name + ':' + self.end
+
+
+class Alias(object):
+    """Definition of label of method as other label, method has the same code
+    as method with this label"""
+    __slots__ = ('name', 'label')
+
+    def __init__(self, name:str, label:str):
+        self.name = name
+        self.label = label
+
+
+    def Render(self) -> str:
+        return self.name + ' equ ' + self.label + '\n'
+
+
+def RenderListing(listing:list) -> str:
+    # returns text of list of instructions, labels and aliases
+    return ''.join([instruction.Render() for instruction in listing])
@@ -1,6 +1,25 @@
+import os
+import re
+import sys
+import mmap
+import codecs
+import locale
 from enum import Enum
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from Token import Token
 from Token import TokenType
+from TokenStream import TokenStream
+try:
+    import numpy
+except ImportError:
+    # numpy is needed only for LexerEngine.NUMPY
+    numpy = None
+
+
+# version of tokens that Parser returns; should be changed with any change of
+# token types, values or positions, so TokenCache doesn't return old tokens
+LEXER_VERSION = 1
 
 
 class ParseState(Enum):
@@ -11,22 +30,373 @@ class ParseState(Enum):
     STRING = 4
 
 
+class LexerEngine(Enum):
+    """Enum of lexer implementations that Parser can use"""
+    STATE_MACHINE = 1               # reference per-character state machine
+    REGEX = 2                       # one compiled master pattern
+    NUMPY = 3                       # vectorized char classification (needs numpy)
+
+
+# groups of the master pattern; indexes are used as match.lastindex values
+_NEW_LINE_GROUP = 1
+_TAB_GROUP = 2
+_ID_GROUP = 3
+_NUM_GROUP = 4
+_STRING_GROUP = 5
+_OPERATOR_GROUP = 6
+_OTHER_GROUP = 7
+
+# spaces and '\r' are not matched at all, so finditer() skips them. The state
+# machine only treats ASCII letters/digits here, other characters are handled
+# by Parser.ScanTokenSlow to keep str.isalpha() semantics
+_MASTER_PATTERN = re.compile(r"""
+    (\n+)                           # new lines
+  | (\t+)                           # tabs
+  | ([A-Za-z][A-Za-z0-9]*)          # identifier or keyword
+  | ([0-9-][0-9]*)                  # number
+  | ('[^']*')                       # string literal
+  | (==|>=|<=|[{}()=><;.])          # operator
+  | ([^ \r])                        # anything else
+""", re.VERBOSE | re.DOTALL)
+
+_OPERATOR_TYPES = {
+    '{': TokenType.O_FIGURE_BRACKET,
+    '}': TokenType.C_FIGURE_BRACKET,
+    '(': TokenType.O_ROUND_BRACKET,
+    ')': TokenType.C_ROUND_BRACKET,
+    '=': TokenType.ASSIGN,
+    '==': TokenType.EQUAL,
+    '>': TokenType.GREATER,
+    '>=': TokenType.GREATER_EQUAL,
+    '<': TokenType.LESS,
+    '<=': TokenType.LESS_EQUAL,
+    ';': TokenType.SEMICOLON,
+    '.': TokenType.ACCESS
+}
+
+KEYWORDS = frozenset(['class', 'int', 'main', 'CreateInstance', 'this', 'if', 'while', 'print', 'prints', 'str'])
+
+# the same pattern for memory-mapped files. Bytes are not decoded, so '\r' is
+# handled here as open() in text mode does: '\r\n' and single '\r' are new lines
+_BYTES_PATTERN = re.compile(rb"""
+    ((?:\r\n?|\n)+)                 # new lines
+  | (\t+)                           # tabs
+  | ([A-Za-z][A-Za-z0-9]*)          # identifier or keyword
+  | ([0-9-][0-9]*)                  # number
+  | ('[^']*')                       # string literal
+  | (==|>=|<=|[{}()=><;.])          # operator
+  | ([^ ])                          # anything else
+""", re.VERBOSE | re.DOTALL)
+
+_BYTES_OPERATOR_CODES = {key.encode(): value.value for key, value in _OPERATOR_TYPES.items()}
+
+_BYTES_KEYWORDS = frozenset(keyword.encode() for keyword in KEYWORDS)
+
+# char classes of LexerEngine.NUMPY; chars of string literals get _STRING_CLASS
+_OTHER_CLASS = 0
+_SPACE_CLASS = 1
+_NEW_LINE_CLASS = 2
+_TAB_CLASS = 3
+_ALPHA_CLASS = 4
+_DIGIT_CLASS = 5
+_MINUS_CLASS = 6
+_OPERATOR_CLASS = 7                 # one char operators
+_EQUAL_SIGN_CLASS = 8
+_COMPARE_CLASS = 9                  # '<' and '>'
+_QUOTE_CLASS = 10
+_NON_ASCII_CLASS = 11
+_STRING_CLASS = 12
+
+def _BuildCharClasses():
+    # table from char code (codes above 255 are clipped) to its class
+    table = [_OTHER_CLASS] * 128 + [_NON_ASCII_CLASS] * 128
+    for c in ' \r':
+        table[ord(c)] = _SPACE_CLASS
+    table[ord('\n')] = _NEW_LINE_CLASS
+    table[ord('\t')] = _TAB_CLASS
+    for code in range(128):
+        if chr(code).isalpha():
+            table[code] = _ALPHA_CLASS
+        elif chr(code).isdigit():
+            table[code] = _DIGIT_CLASS
+    table[ord('-')] = _MINUS_CLASS
+    for c in '{}();.':
+        table[ord(c)] = _OPERATOR_CLASS
+    table[ord('=')] = _EQUAL_SIGN_CLASS
+    table[ord('<')] = _COMPARE_CLASS
+    table[ord('>')] = _COMPARE_CLASS
+    table[ord("'")] = _QUOTE_CLASS
+    return numpy.array(table, dtype=numpy.uint8)
+
+_CHAR_CLASSES = _BuildCharClasses() if numpy != None else None
+
+
+class _NonASCIIText(Exception):
+    """Raised by Parser.ScanBytes when it meets non-ASCII char outside of string literal"""
+    pass
+
+
 class Parser(object):
     """Class that performs parsing of an input file that contains YADL
     language and returns recognized tokens if no errors were found"""
 
+    # ParseTextParallel splits text to more chunks than workers for even load
+    CHUNKS_PER_WORKER = 4
+
     @staticmethod
-    def Parse(filePath:str):
+    def Parse(filePath:str, engine:LexerEngine = LexerEngine.STATE_MACHINE):
         try: 
             srcFile = open(filePath).read();
         except Exception:
             raise IOError()
+        return Parser.ParseText(srcFile, engine)
+
+
+    @staticmethod
+    def ParseToTokenStream(filePath:str) -> TokenStream:
+        # same tokens as Parse returns, but in compact form for big files
+        try: 
+            srcFile = open(filePath).read()
+        except Exception:
+            raise IOError()
+        return TokenStream.FromTokens(srcFile, Parser.ScanChunks((srcFile,)))
+
+
+    @staticmethod
+    def ParseParallel(filePath:str, workersCount:int = None) -> TokenStream:
+        try: 
+            srcFile = open(filePath).read()
+        except Exception:
+            raise IOError()
+        return Parser.ParseTextParallel(srcFile, workersCount)
+
+
+    @staticmethod
+    def ParseTextParallel(srcFile:str, workersCount:int = None) -> TokenStream:
+        # lexes chunks of text in worker processes and joins their tokens to one
+        # TokenStream. Chunks start at new lines outside of string literals, so
+        # every chunk starts from the initial state and only its lines are shifted
+        if workersCount == None:
+            workersCount = os.cpu_count() or 1
+        starts = Parser.SplitLines(srcFile, workersCount * Parser.CHUNKS_PER_WORKER)
+        if workersCount == 1 or len(starts) == 1:
+            return TokenStream.FromTokens(srcFile, Parser.ScanChunks((srcFile,)))
+        chunks = [srcFile[start:end] for start, end in zip(starts, starts[1:] + [len(srcFile)])]
+        stream = TokenStream(srcFile)
+        # count of lines in previous chunks
+        linesCount = 0
+        with ProcessPoolExecutor(workersCount) as executor:
+            results = executor.map(Parser.LexChunk, chunks, starts)
+            for chunk, start in zip(chunks, starts):
+                try:
+                    types, offsets, lengths, lines, positions, chunkLinesCount = next(results)
+                except Exception:
+                    # error should have line number in the whole text, so chunk is lexed again
+                    for token in Parser.ScanChunks((chunk,), start, linesCount + 1):
+                        pass
+                    raise
+                stream.types.extend(types)
+                stream.offsets.extend(offsets)
+                stream.lengths.extend(lengths)
+                if linesCount == 0:
+                    stream.lines.extend(lines)
+                else:
+                    stream.lines.extend(array('i', [line + linesCount for line in lines]))
+                stream.positions.extend(positions)
+                linesCount += chunkLinesCount
+        return stream
+
+
+    @staticmethod
+    def SplitLines(srcFile:str, chunksCount:int) -> list:
+        # returns start indexes of about chunksCount chunks of text. Every chunk
+        # except the first one starts after new line that is not in string literal
+        # (number of quotes before it is even)
+        chunkSize = len(srcFile) // chunksCount + 1
+        starts = [0]
+        # quotesCount is count of quotes in srcFile[:i+1]
+        quotesCount = 0
+        i = -1
+        for k in range(1, chunksCount):
+            newLine = srcFile.find('\n', max(k * chunkSize, i + 1))
+            while newLine != -1:
+                quotesCount += srcFile.count("'", i + 1, newLine)
+                i = newLine
+                if quotesCount % 2 == 0:
+                    break
+                # new line is in string literal, so take the first one after its end
+                closingQuote = srcFile.find("'", i)
+                if closingQuote == -1:
+                    newLine = -1
+                else:
+                    newLine = srcFile.find('\n', closingQuote)
+            if newLine == -1 or newLine + 1 == len(srcFile):
+                break
+            starts.append(newLine + 1)
+        return starts
+
+
+    @staticmethod
+    def LexChunk(chunk:str, srcOffset:int):
+        # runs in worker process of ParseTextParallel. Lexes chunk that starts
+        # a line and returns arrays of TokenStream (lines are counted from 1
+        # in chunk) and count of new lines that are not in string literals
+        stream = TokenStream(chunk)
+        linesCount = chunk.count('\n')
+        for token in Parser.ScanChunks((chunk,), srcOffset):
+            stream.Append(token)
+            if token.type == TokenType.STRING_LITERAL:
+                linesCount -= token.value.count('\n')
+        return stream.types, stream.offsets, stream.lengths, stream.lines, stream.positions, linesCount
+
+
+    @staticmethod
+    def ParseMapped(filePath:str) -> TokenStream:
+        # lexes memory-mapped file without decoding it to str. Returned TokenStream
+        # keeps the map, its offsets are in bytes and values are decoded on request.
+        # YADL text outside of string literals is ASCII, for other files and
+        # encodings tokens are taken from decoded text as ParseToTokenStream does
+        encoding = locale.getpreferredencoding(False)
+        if not Parser.IsMappableEncoding(encoding):
+            return Parser.ParseToTokenStream(filePath)
+        try:
+            with open(filePath, 'rb') as srcFile:
+                srcMap = mmap.mmap(srcFile.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file can't be mapped
+            return Parser.ParseToTokenStream(filePath)
+        except Exception:
+            raise IOError()
+        try:
+            Parser.CheckEncoding(srcMap, encoding)
+            return Parser.ScanBytes(srcMap, encoding)
+        except _NonASCIIText:
+            srcMap.close()
+            return Parser.ParseToTokenStream(filePath)
+
+
+    @staticmethod
+    def IsMappableEncoding(encoding:str) -> bool:
+        # encoding should keep ASCII chars as is and use only bytes >= 0x80 for
+        # other chars: UTF-8 or any single byte code page
+        try:
+            if codecs.lookup(encoding).name == 'utf-8':
+                return True
+            asciiBytes = bytes(range(128))
+            return asciiBytes.decode(encoding, errors='replace') == asciiBytes.decode('ascii') \
+                and len(bytes(range(128, 256)).decode(encoding, errors='replace')) == 128
+        except LookupError:
+            return False
+
+
+    @staticmethod
+    def CheckEncoding(srcBytes, encoding:str, blockSize:int = 1 << 20):
+        # raises IOError as Parse does for file that can't be decoded; decodes
+        # by blocks, so whole decoded text is never in memory
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            for start in range(0, len(srcBytes), blockSize):
+                decoder.decode(srcBytes[start:start+blockSize])
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            raise IOError()
+
+
+    @staticmethod
+    def DecodeText(srcBytes:bytes, encoding:str) -> str:
+        # decodes bytes as open() in text mode does
+        text = srcBytes.decode(encoding)
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
+
+
+    @staticmethod
+    def ScanBytes(srcBytes, encoding:str) -> TokenStream:
+        # the same algorithm as ScanChunks has, but over bytes and tokens are
+        # written directly to TokenStream arrays. Char positions are counted as
+        # i - lineStart + extraChars, extraChars also compensates '\r\n' and
+        # multibyte chars in string literals
+        stream = TokenStream(srcBytes, encoding)
+        appendType = stream.types.append
+        appendOffset = stream.offsets.append
+        appendLength = stream.lengths.append
+        appendLine = stream.lines.append
+        appendPosition = stream.positions.append
+        n = len(srcBytes)
+        currLineNum = 1
+        lineStart = -1
+        extraChars = 0
+        for m in _BYTES_PATTERN.finditer(srcBytes):
+            group = m.lastindex
+            tokenStart, end = m.span()
+            if group == _ID_GROUP or group == _NUM_GROUP:
+                if end == n:
+                    # last token in file is taken without checks
+                    pos = tokenStart - lineStart + extraChars - 1
+                elif srcBytes[end] >= 0x80:
+                    raise _NonASCIIText()
+                else:
+                    pos = tokenStart - lineStart + extraChars
+                    extraChars += 1
+                    if group == _NUM_GROUP:
+                        Parser.CheckNumber(m.group(), currLineNum, end - lineStart + extraChars - 1)
+                if group == _NUM_GROUP:
+                    appendType(TokenType.NUMBER.value)
+                elif m.group() in _BYTES_KEYWORDS:
+                    appendType(TokenType.KEYWORD.value)
+                else:
+                    appendType(TokenType.IDENTIFIER.value)
+            elif group == _OPERATOR_GROUP:
+                appendType(_BYTES_OPERATOR_CODES[m.group()])
+                pos = tokenStart - lineStart + extraChars
+            elif group == _NEW_LINE_GROUP:
+                newLines = m.group()
+                lineStart = end - 1
+                currLineNum += newLines.count(b'\n') + newLines.count(b'\r') - newLines.count(b'\r\n')
+                extraChars = 0
+                continue
+            elif group == _TAB_GROUP:
+                extraChars += 2 * (end - tokenStart)
+                continue
+            elif group == _STRING_GROUP:
+                appendType(TokenType.STRING_LITERAL.value)
+                pos = tokenStart - lineStart + extraChars - 1
+                literal = m.group()
+                if not literal.isascii() or b'\r' in literal:
+                    extraChars -= len(literal) - len(Parser.DecodeText(literal, encoding))
+            elif srcBytes[tokenStart] == 0x27:
+                # string literal without closing quote is dropped
+                break
+            elif srcBytes[tokenStart] >= 0x80:
+                raise _NonASCIIText()
+            else:
+                raise Exception('Unsupported character at line: ' + str(currLineNum) +\
+                                ' and position: ' + str(tokenStart - lineStart + extraChars))
+            appendOffset(tokenStart)
+            appendLength(end - tokenStart)
+            appendLine(currLineNum)
+            appendPosition(pos)
+        return stream
+
+
+    @staticmethod
+    def ParseText(srcFile:str, engine:LexerEngine = LexerEngine.STATE_MACHINE):
+        if engine == LexerEngine.REGEX:
+            return Parser.ParseWithRegex(srcFile)
+        if engine == LexerEngine.NUMPY:
+            return Parser.ParseWithNumpy(srcFile)
+        return Parser.ParseWithStateMachine(srcFile)
+
+
+    @staticmethod
+    def ParseWithStateMachine(srcFile:str):
         state = ParseState.INITIAL
         currLineNum = 1
         currCharNum = 0
         tokenValue = ''
         tokens = list()
-        keywords = set(['class', 'int', 'main', 'CreateInstance', 'this', 'if', 'while', 'print', 'prints', 'str'])
+        keywords = KEYWORDS
         i = 0
         while (i < len(srcFile)):
             c = srcFile[i]
@@ -49,38 +419,38 @@ class Parser(object):
                 elif c == '\t':
                     currCharNum += 2
                 elif c == '{':
-                    tokens.append(Token(TokenType.O_FIGURE_BRACKET, '{', currLineNum, currCharNum))
+                    tokens.append(Token(TokenType.O_FIGURE_BRACKET, '{', currLineNum, currCharNum, i))
                 elif c == '}':
-                    tokens.append(Token(TokenType.C_FIGURE_BRACKET, '}', currLineNum, currCharNum))
+                    tokens.append(Token(TokenType.C_FIGURE_BRACKET, '}', currLineNum, currCharNum, i))
                 elif c == '(':
-                    tokens.append(Token(TokenType.O_ROUND_BRACKET, '(', currLineNum, currCharNum))
+                    tokens.append(Token(TokenType.O_ROUND_BRACKET, '(', currLineNum, currCharNum, i))
                 elif c == ')':
-                    tokens.append(Token(TokenType.C_ROUND_BRACKET, ')', currLineNum, currCharNum))
+                    tokens.append(Token(TokenType.C_ROUND_BRACKET, ')', currLineNum, currCharNum, i))
                 elif c == '=':
                     if i+1 < len(srcFile) and srcFile[i+1] == '=':
-                        tokens.append(Token(TokenType.EQUAL, '==', currLineNum, currCharNum))
+                        tokens.append(Token(TokenType.EQUAL, '==', currLineNum, currCharNum, i))
                         i += 1
                         currCharNum += 1
                     else:
-                        tokens.append(Token(TokenType.ASSIGN, '=', currLineNum, currCharNum))
+                        tokens.append(Token(TokenType.ASSIGN, '=', currLineNum, currCharNum, i))
                 elif c == '>':
                     if i+1 < len(srcFile) and srcFile[i+1] == '=':
-                        tokens.append(Token(TokenType.GREATER_EQUAL, '>=', currLineNum, currCharNum))
+                        tokens.append(Token(TokenType.GREATER_EQUAL, '>=', currLineNum, currCharNum, i))
                         i += 1
                         currCharNum += 1
                     else:
-                        tokens.append(Token(TokenType.GREATER, '>', currLineNum, currCharNum))
+                        tokens.append(Token(TokenType.GREATER, '>', currLineNum, currCharNum, i))
                 elif c == '<':
                     if i+1 < len(srcFile) and srcFile[i+1] == '=':
-                        tokens.append(Token(TokenType.LESS_EQUAL, '<=', currLineNum, currCharNum))
+                        tokens.append(Token(TokenType.LESS_EQUAL, '<=', currLineNum, currCharNum, i))
                         i += 1
                         currCharNum += 1
                     else:
-                        tokens.append(Token(TokenType.LESS, '<', currLineNum, currCharNum))
+                        tokens.append(Token(TokenType.LESS, '<', currLineNum, currCharNum, i))
                 elif c == ';':
-                    tokens.append(Token(TokenType.SEMICOLON, ';', currLineNum, currCharNum))
+                    tokens.append(Token(TokenType.SEMICOLON, ';', currLineNum, currCharNum, i))
                 elif c == '.':
-                    tokens.append(Token(TokenType.ACCESS, '.', currLineNum, currCharNum))
+                    tokens.append(Token(TokenType.ACCESS, '.', currLineNum, currCharNum, i))
                 else:
                     raise Exception('Unsupported character at line: ' + str(currLineNum) +\
                                     ' and position: ' + str(currCharNum))
@@ -88,11 +458,11 @@ class Parser(object):
                 if c.isalnum():
                     tokenValue += c
                 elif tokenValue in keywords:
-                    tokens.append(Token(TokenType.KEYWORD, tokenValue, currLineNum, currCharNum-len(tokenValue)))
+                    tokens.append(Token(TokenType.KEYWORD, tokenValue, currLineNum, currCharNum-len(tokenValue), i-len(tokenValue)))
                     state = ParseState.INITIAL
                     i -= 1    # handle this char in INITIAL block
                 else:
-                    tokens.append(Token(TokenType.IDENTIFIER, tokenValue, currLineNum, currCharNum-len(tokenValue)))
+                    tokens.append(Token(TokenType.IDENTIFIER, tokenValue, currLineNum, currCharNum-len(tokenValue), i-len(tokenValue)))
                     state = ParseState.INITIAL
                     i -= 1    # handle this char in INITIAL block
             elif state == ParseState.NUM:
@@ -108,13 +478,13 @@ class Parser(object):
                     if num < -2147483648 or num > 2147483647:
                         raise Exception('Number should be in such bounds: [-2147483648 - 2147483647] ! Error at line: ' \
                            + str(currLineNum) + ' and position: ' + str(currCharNum))
-                    tokens.append(Token(TokenType.NUMBER, tokenValue, currLineNum, currCharNum-len(tokenValue)))
+                    tokens.append(Token(TokenType.NUMBER, tokenValue, currLineNum, currCharNum-len(tokenValue), i-len(tokenValue)))
                     state = ParseState.INITIAL
                     i -= 1    # handle this char in INITIAL block
             elif state == ParseState.STRING:
                 if c == "'":
                     tokenValue += c
-                    tokens.append(Token(TokenType.STRING_LITERAL, tokenValue, currLineNum, currCharNum-len(tokenValue)))
+                    tokens.append(Token(TokenType.STRING_LITERAL, tokenValue, currLineNum, currCharNum-len(tokenValue), i-len(tokenValue)+1))
                     state = ParseState.INITIAL
                 else:
                     tokenValue += c
@@ -123,15 +493,324 @@ class Parser(object):
 
         if state != ParseState.INITIAL:
             if state == ParseState.ID and tokenValue in keywords:
-                tokens.append(Token(TokenType.KEYWORD, tokenValue, currLineNum, currCharNum-len(tokenValue)))
+                tokens.append(Token(TokenType.KEYWORD, tokenValue, currLineNum, currCharNum-len(tokenValue), i-len(tokenValue)))
             elif state == ParseState.ID:
-                tokens.append(Token(TokenType.IDENTIFIER, tokenValue, currLineNum, currCharNum-len(tokenValue)))
+                tokens.append(Token(TokenType.IDENTIFIER, tokenValue, currLineNum, currCharNum-len(tokenValue), i-len(tokenValue)))
             elif state == ParseState.NUM:
-                tokens.append(Token(TokenType.NUMBER, tokenValue, currLineNum, currCharNum-len(tokenValue)))
+                tokens.append(Token(TokenType.NUMBER, tokenValue, currLineNum, currCharNum-len(tokenValue), i-len(tokenValue)))
         
         return tokens
 
 
+    @staticmethod
+    def ParseWithRegex(srcFile:str):
+        return list(Parser.ScanChunks((srcFile,)))
+
+
+    @staticmethod
+    def ParseWithNumpy(srcFile:str):
+        # returns the same tokens and raises the same errors as ParseWithStateMachine.
+        # Every char is classified at once with numpy, token bounds are found by
+        # comparing classes of neighbour chars and positions are computed with
+        # binary search in arrays of new lines, tabs and ends of identifiers and
+        # numbers (see ScanChunks for the formula). Python code runs per token only.
+        # Text with non-ASCII chars outside of string literals is lexed by ParseWithRegex
+        if numpy == None:
+            raise Exception('NumPy lexer engine needs numpy package!')
+        n = len(srcFile)
+        if n == 0:
+            return list()
+        if srcFile.isascii():
+            codes = numpy.frombuffer(srcFile.encode('ascii'), dtype=numpy.uint8)
+        else:
+            # one code per char, so indexes in array are the same as in str
+            codes = numpy.minimum(numpy.frombuffer(srcFile.encode('utf-32-le'), dtype=numpy.uint32), 255)
+        classes = _CHAR_CLASSES[codes]
+        indexes = numpy.arange(n)
+
+        # quotes are paired in order; text after quote without pair is dropped
+        quotes = numpy.flatnonzero(classes == _QUOTE_CLASS)
+        stringStarts = quotes[0::2]
+        stringEnds = quotes[1::2] + 1
+        stringBounds = numpy.zeros(n + 1, dtype=numpy.int8)
+        stringBounds[stringStarts] += 1
+        stringBounds[stringEnds] -= 1
+        classes[numpy.cumsum(stringBounds[:n]) > 0] = _STRING_CLASS
+        stringStarts = stringStarts[:len(stringEnds)]
+        if (classes == _NON_ASCII_CLASS).any():
+            return Parser.ParseWithRegex(srcFile)
+
+        def Previous(mask):
+            # mask of chars whose previous char is in mask
+            result = numpy.zeros(n, dtype=bool)
+            result[1:] = mask[:-1]
+            return result
+
+        def Next(mask):
+            # mask of chars whose next char is in mask
+            result = numpy.zeros(n, dtype=bool)
+            result[:-1] = mask[1:]
+            return result
+
+        # in run of letters and digits digits before the first letter belong to
+        # a number and the rest is an identifier
+        isAlpha = classes == _ALPHA_CLASS
+        isDigit = classes == _DIGIT_CLASS
+        isAlnum = isAlpha | isDigit
+        runStarts = numpy.maximum.accumulate(numpy.where(isAlnum & ~Previous(isAlnum), indexes, 0))
+        alphaCount = numpy.cumsum(isAlpha)
+        isId = isAlnum & (alphaCount - alphaCount[runStarts] + isAlpha[runStarts] > 0)
+        idStarts = numpy.flatnonzero(isId & ~Previous(isId))
+        idEnds = numpy.flatnonzero(isId & ~Next(isId)) + 1
+        # number starts with minus or digit and continues with digits only
+        isMinus = classes == _MINUS_CLASS
+        isNum = isMinus | (isDigit & ~isId)
+        numStarts = numpy.flatnonzero(isMinus | (isNum & ~Previous(isNum)))
+        numEnds = numpy.flatnonzero(isNum & ~Next(isDigit & ~isId)) + 1
+
+        # '=' after '=', '<' or '>' is the second char of operator. In run of '='
+        # they are paired from its start or from '<'/'>' before it
+        isEqualSign = classes == _EQUAL_SIGN_CLASS
+        isCompare = classes == _COMPARE_CLASS
+        equalRunStarts = numpy.maximum.accumulate(numpy.where(isEqualSign & ~Previous(isEqualSign), indexes, 0))
+        isSecondChar = isEqualSign & ((indexes - equalRunStarts + Previous(isCompare)[equalRunStarts]) % 2 == 1)
+        isOperator = (classes == _OPERATOR_CLASS) | isCompare | (isEqualSign & ~isSecondChar)
+        operatorStarts = numpy.flatnonzero(isOperator)
+        operatorEnds = operatorStarts + 1 + Next(isSecondChar)[operatorStarts]
+
+        # identifiers and numbers end with a char that is handled twice
+        terminators = numpy.sort(numpy.concatenate((idEnds, numEnds)))
+        terminators = terminators[terminators < n]
+        newLines = numpy.flatnonzero(classes == _NEW_LINE_CLASS)
+        lineStarts = numpy.concatenate(([-1], newLines))
+        tabs = numpy.flatnonzero(classes == _TAB_CLASS)
+
+        def GetLinesAndPositions(i):
+            # line and position of state machine before handling chars at indexes i second time
+            lineIndexes = numpy.searchsorted(newLines, i)
+            lineStart = lineStarts[lineIndexes]
+            tabsCount = numpy.searchsorted(tabs, i) - numpy.searchsorted(tabs, lineStart)
+            terminatorsCount = numpy.searchsorted(terminators, i, 'right') \
+                               - numpy.searchsorted(terminators, lineStart, 'right')
+            return lineIndexes + 1, i - lineStart + 2 * tabsCount + terminatorsCount
+
+        # the first error in text: wrong number (checked at its end) or unsupported char
+        numLengths = numEnds - numStarts
+        wrongNumbers = numpy.flatnonzero((numEnds < n) & ((numLengths >= 10) | ((numLengths == 1) &
+                                         isMinus[numStarts])))
+        unsupported = numpy.flatnonzero(classes == _OTHER_CLASS)
+        for k in wrongNumbers.tolist():
+            numEnd = int(numEnds[k])
+            if len(unsupported) > 0 and unsupported[0] < numEnd:
+                break
+            line, pos = GetLinesAndPositions(numEnd)
+            Parser.CheckNumber(srcFile[numStarts[k]:numEnd], int(line), int(pos) - 1)
+        if len(unsupported) > 0:
+            line, pos = GetLinesAndPositions(unsupported[0])
+            raise Exception('Unsupported character at line: ' + str(line) + ' and position: ' + str(pos))
+
+        starts = numpy.concatenate((idStarts, numStarts, stringStarts, operatorStarts))
+        ends = numpy.concatenate((idEnds, numEnds, stringEnds, operatorEnds))
+        kinds = numpy.concatenate((numpy.full(len(idStarts), _ALPHA_CLASS, dtype=numpy.uint8),
+                                   numpy.full(len(numStarts), _DIGIT_CLASS, dtype=numpy.uint8),
+                                   numpy.full(len(stringStarts), _QUOTE_CLASS, dtype=numpy.uint8),
+                                   numpy.full(len(operatorStarts), _OPERATOR_CLASS, dtype=numpy.uint8)))
+        order = numpy.argsort(starts, kind='stable')
+        starts = starts[order]
+        ends = ends[order]
+        kinds = kinds[order]
+        lines, positions = GetLinesAndPositions(starts)
+        # string position is counted from char before quote, last token in file is taken without terminator
+        positions -= kinds == _QUOTE_CLASS
+        if len(positions) > 0 and ends[-1] == n and kinds[-1] != _OPERATOR_CLASS and kinds[-1] != _QUOTE_CLASS:
+            positions[-1] -= 1
+
+        tokens = list()
+        for tokenStart, tokenEnd, kind, line, pos in zip(starts.tolist(), ends.tolist(), kinds.tolist(),
+                                                         lines.tolist(), positions.tolist()):
+            value = srcFile[tokenStart:tokenEnd]
+            if kind == _ALPHA_CLASS:
+                value = sys.intern(value)
+                if value in KEYWORDS:
+                    tokens.append(Token(TokenType.KEYWORD, value, line, pos, tokenStart))
+                else:
+                    tokens.append(Token(TokenType.IDENTIFIER, value, line, pos, tokenStart))
+            elif kind == _DIGIT_CLASS:
+                tokens.append(Token(TokenType.NUMBER, value, line, pos, tokenStart))
+            elif kind == _QUOTE_CLASS:
+                tokens.append(Token(TokenType.STRING_LITERAL, value, line, pos, tokenStart))
+            else:
+                tokens.append(Token(_OPERATOR_TYPES[value], value, line, pos, tokenStart))
+        return tokens
+
+
+    @staticmethod
+    def ParseStream(filePath:str, chunkSize:int = 1 << 16):
+        # returns generator that reads file by chunks and yields tokens lazily,
+        # so whole file and all its tokens are never in memory at once
+        try: 
+            srcFile = open(filePath)
+        except Exception:
+            raise IOError()
+        return Parser.ScanChunks(Parser.ReadChunks(srcFile, chunkSize))
+
+
+    @staticmethod
+    def ReadChunks(srcFile, chunkSize:int):
+        with srcFile:
+            chunk = srcFile.read(chunkSize)
+            while chunk:
+                yield chunk
+                chunk = srcFile.read(chunkSize)
+
+
+    @staticmethod
+    def ScanChunks(chunks, srcOffset:int = 0, currLineNum:int = 1, currCharNum:int = 0):
+        # generator that yields the same tokens, positions and errors as
+        # ParseWithStateMachine, but consumes a whole token per regex match
+        # instead of one character per loop iteration. Position of char at
+        # index i is calculated as i - lineStart + extraChars, where lineStart
+        # is index of last new line and extraChars counts what state machine
+        # adds on current line: 2 more for every tab and 1 for every char that
+        # ends an identifier or a number, because such char is handled twice.
+        # Match that reaches the end of a chunk is scanned again together
+        # with the next chunk, because the token may continue there.
+        # Scanning can start in the middle of text (srcOffset is index of the
+        # first chunk in it) with given state between tokens
+        chunks = iter(chunks)
+        buffer = ''
+        # index of buffer[0] in the whole text
+        bufferOffset = srcOffset
+        lineStart = -1 - currCharNum
+        extraChars = 0
+        start = 0
+        isLastChunk = False
+        while not isLastChunk:
+            chunk = next(chunks, None)
+            if chunk == None:
+                isLastChunk = True
+                chunk = ''
+            buffer = buffer[start:] + chunk
+            bufferOffset += start
+            lineStart -= start
+            start = 0
+            n = len(buffer)
+            while start < n:
+                needMoreText = False
+                for m in _MASTER_PATTERN.finditer(buffer, start):
+                    group = m.lastindex
+                    end = m.end()
+                    if end == n and not isLastChunk:
+                        needMoreText = True
+                        break
+                    if group == _ID_GROUP or group == _NUM_GROUP:
+                        tokenStart = m.start()
+                        if end == n:
+                            # last token in file is taken without checks
+                            pos = tokenStart - lineStart + extraChars - 1
+                        elif buffer[end] >= '\x80':
+                            # token may continue with non-ASCII letters or digits
+                            break
+                        else:
+                            pos = tokenStart - lineStart + extraChars
+                            extraChars += 1
+                            if group == _NUM_GROUP:
+                                Parser.CheckNumber(m.group(), currLineNum, end - lineStart + extraChars - 1)
+                        if group == _NUM_GROUP:
+                            yield Token(TokenType.NUMBER, m.group(), currLineNum, pos, bufferOffset + tokenStart)
+                        else:
+                            # names repeat a lot, so all tokens share one str object per name
+                            value = sys.intern(m.group())
+                            if value in KEYWORDS:
+                                yield Token(TokenType.KEYWORD, value, currLineNum, pos, bufferOffset + tokenStart)
+                            else:
+                                yield Token(TokenType.IDENTIFIER, value, currLineNum, pos, bufferOffset + tokenStart)
+                    elif group == _OPERATOR_GROUP:
+                        value = m.group()
+                        tokenStart = m.start()
+                        yield Token(_OPERATOR_TYPES[value], value, currLineNum, tokenStart - lineStart + extraChars,
+                                    bufferOffset + tokenStart)
+                    elif group == _NEW_LINE_GROUP:
+                        lineStart = end - 1
+                        currLineNum += end - m.start()
+                        extraChars = 0
+                    elif group == _TAB_GROUP:
+                        extraChars += 2 * (end - m.start())
+                    elif group == _STRING_GROUP:
+                        tokenStart = m.start()
+                        yield Token(TokenType.STRING_LITERAL, m.group(), currLineNum, 
+                                    tokenStart - lineStart + extraChars - 1, bufferOffset + tokenStart)
+                    elif buffer[m.start()] == "'":
+                        if isLastChunk:
+                            # string literal without closing quote is dropped
+                            return
+                        needMoreText = True
+                        break
+                    else:
+                        break
+                else:
+                    start = n
+                    break
+                start = m.start()
+                if needMoreText:
+                    break
+                # scan the token that stopped the loop char by char and restart finditer after it
+                token, end, currCharNum = Parser.ScanTokenSlow(buffer, start, currLineNum, 
+                                                               start - lineStart + extraChars - 1, bufferOffset)
+                if end == n and not isLastChunk:
+                    break
+                yield token
+                extraChars = currCharNum - end + lineStart + 1
+                start = end
+
+
+    @staticmethod
+    def ScanTokenSlow(srcFile:str, i:int, currLineNum:int, currCharNum:int, srcOffset:int = 0):
+        # scans one identifier or number that starts at i char by char with
+        # str methods, as ParseWithStateMachine does. Used by the faster engines
+        # for tokens that touch non-ASCII characters. srcOffset is index of
+        # srcFile[0] in the whole text. Returns token, index after the token
+        # and new currCharNum
+        c = srcFile[i]
+        if c.isalpha():
+            isPartOfToken = str.isalnum
+        elif c.isnumeric() or c == '-':
+            isPartOfToken = str.isnumeric
+        else:
+            raise Exception('Unsupported character at line: ' + str(currLineNum) +\
+                            ' and position: ' + str(currCharNum + 1))
+        n = len(srcFile)
+        end = i + 1
+        while end < n and isPartOfToken(srcFile[end]):
+            end += 1
+        tokenValue = srcFile[i:end]
+        if end == n:
+            pos = currCharNum
+        else:
+            pos = currCharNum + 1
+            currCharNum += end - i + 1
+            if isPartOfToken == str.isnumeric:
+                Parser.CheckNumber(tokenValue, currLineNum, currCharNum)
+        if isPartOfToken == str.isnumeric:
+            return Token(TokenType.NUMBER, tokenValue, currLineNum, pos, srcOffset + i), end, currCharNum
+        elif tokenValue in KEYWORDS:
+            return Token(TokenType.KEYWORD, tokenValue, currLineNum, pos, srcOffset + i), end, currCharNum
+        return Token(TokenType.IDENTIFIER, sys.intern(tokenValue), currLineNum, pos, srcOffset + i), end, currCharNum
+
+
+    @staticmethod
+    def CheckNumber(tokenValue:str, currLineNum:int, currCharNum:int):
+        # raises the same errors as ParseWithStateMachine for wrong NUMBER tokens
+        try:
+            num = int(tokenValue)
+        except ValueError:
+            raise Exception('Wrong integer value at line: ' + str(currLineNum) +\
+                            ' and position: ' + str(currCharNum))
+        if num < -2147483648 or num > 2147483647:
+            raise Exception('Number should be in such bounds: [-2147483648 - 2147483647] ! Error at line: ' \
+                + str(currLineNum) + ' and position: ' + str(currCharNum))
+
+
 if __name__ == '__main__':
     try:
         tokens = Parser.Parse(r"E:\KNU\Object oriented program construction\Translator\yadl_test1.txt")
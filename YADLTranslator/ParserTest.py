@@ -1,7 +1,16 @@
+import os
+import shutil
+import tempfile
 import unittest
 from Parser import Parser
+from Parser import LexerEngine
+from Parser import numpy
 from Token import TokenType
 from Token import Token
+from TokenBuffer import TokenBuffer
+from TokenStream import TokenStream
+from IncrementalLexer import IncrementalLexer
+from TokenCache import TokenCache
 
 class Test_Parser(unittest.TestCase):
     def test_Id_recognition(self):
@@ -61,5 +70,221 @@ class Test_Parser(unittest.TestCase):
         self.assertEqual(tokens[19].type, TokenType.C_FIGURE_BRACKET)
 
 
+class Test_RegexEngine(unittest.TestCase):
+    engine = LexerEngine.REGEX
+    sources = ['class { int a =-55; met(coco c) {c.call()}}',
+               "main() {\n\tint a = 5;\n\tif (a >= 3) { prints('a\tb\nc'); }\r\n\ta == 4 <= 5 < 6 > 7;}",
+               'abc', '12', '5-3-x', 'id;', "'not closed string",
+               'caf\u00e9 x2\u00b2 \u0663\u0664 a\u00df9']
+
+    def assertSameAsStateMachine(self, srcText):
+        try:
+            expected = [(t.type, t.value, t.line, t.pos) for t in Parser.ParseText(srcText)]
+        except Exception as ex:
+            with self.assertRaises(Exception) as context:
+                Parser.ParseText(srcText, self.engine)
+            self.assertEqual(str(context.exception), str(ex))
+            return
+        tokens = Parser.ParseText(srcText, self.engine)
+        self.assertEqual([(t.type, t.value, t.line, t.pos) for t in tokens], expected)
+
+    def test_same_tokens(self):
+        for srcText in self.sources:
+            self.assertSameAsStateMachine(srcText)
+
+    def test_same_errors(self):
+        for srcText in ['a = 2147483648;', 'a = -2147483649 ;', 'x - ;', '\t\ta # b', 'x2\u00b2 ', 'a = 1\u2013']:
+            self.assertSameAsStateMachine(srcText)
+
+    def test_file_engine_selection(self):
+        fileName = 'tempTest.txt'
+        open(fileName, 'w+').write('class this      CreateInstance int if \n main while')
+        tokens = Parser.Parse(fileName, self.engine)
+        self.assertEqual(len(tokens), 7)
+        for t in tokens:
+            self.assertEqual(t.type, TokenType.KEYWORD)
+
+
+@unittest.skipIf(numpy == None, 'numpy is not installed')
+class Test_NumpyEngine(Test_RegexEngine):
+    engine = LexerEngine.NUMPY
+
+    def test_operators(self):
+        for srcText in ['a==b', '===', '<==>=', '=<=', "x>='>='=", 'a\t=\t\t=b']:
+            self.assertSameAsStateMachine(srcText)
+
+
+class Test_Stream(unittest.TestCase):
+    def test_same_tokens_for_any_chunk_size(self):
+        fileName = 'tempTest.txt'
+        srcText = "main() {\n\tstr s = 'long\tstring';\n\tint abc = -12345;\n\tif (abc <= 7) { prints(s); }\n}"
+        open(fileName, 'w+').write(srcText)
+        expected = [(t.type, t.value, t.line, t.pos) for t in Parser.Parse(fileName)]
+        for chunkSize in (1, 2, 3, 5, 64):
+            tokens = [(t.type, t.value, t.line, t.pos) for t in Parser.ParseStream(fileName, chunkSize)]
+            self.assertEqual(tokens, expected)
+
+    def test_error_in_stream(self):
+        fileName = 'tempTest.txt'
+        open(fileName, 'w+').write('a b c 99999999999 d')
+        tokens = Parser.ParseStream(fileName, 4)
+        self.assertEqual(next(tokens).value, 'a')
+        self.assertRaises(Exception, list, tokens)
+
+    def test_token_buffer_lookahead(self):
+        tokenBuffer = TokenBuffer(Parser.ParseText('a b c d e f'))
+        self.assertEqual(tokenBuffer.Peek(4).value, 'd')
+        self.assertEqual(tokenBuffer.Next().value, 'a')
+        self.assertEqual(tokenBuffer.Peek(4).value, 'e')
+        self.assertRaises(IndexError, tokenBuffer.Peek, 5)
+        while tokenBuffer.Peek().type != TokenType.EOF:
+            tokenBuffer.Next()
+        lastToken = tokenBuffer.GetCurrent()
+        self.assertEqual(lastToken.value, 'f')
+        self.assertEqual(tokenBuffer.Peek(3).type, TokenType.EOF)
+        eofToken = tokenBuffer.Next()
+        self.assertEqual((eofToken.type, eofToken.line, eofToken.pos), (TokenType.EOF, lastToken.line, lastToken.pos))
+        self.assertIs(tokenBuffer.Next(), eofToken)
+        self.assertTrue(tokenBuffer.IsEnd())
+
+
+class Test_Parallel(unittest.TestCase):
+    srcText = "main() {\n\tint a = 5;\n\tprints('a\nb\nc');\n\tif (a >= 3) { print(a); }\n" * 5 + '}'
+
+    def test_split_outside_of_strings(self):
+        starts = Parser.SplitLines(self.srcText, 20)
+        self.assertGreater(len(starts), 1)
+        for start in starts[1:]:
+            self.assertEqual(self.srcText[start-1], '\n')
+            self.assertEqual(self.srcText.count("'", 0, start) % 2, 0)
+
+    def test_same_tokens(self):
+        expected = [(t.type, t.value, t.line, t.pos, t.offset) for t in Parser.ParseText(self.srcText)]
+        stream = Parser.ParseTextParallel(self.srcText, 2)
+        self.assertEqual([(t.type, t.value, t.line, t.pos, t.offset) for t in stream], expected)
+
+    def test_error_line(self):
+        with self.assertRaises(Exception) as context:
+            Parser.ParseTextParallel(self.srcText + '\n# x', 2)
+        self.assertEqual(str(context.exception), 'Unsupported character at line: 22 and position: 1')
+
+
+class Test_TokenStream(unittest.TestCase):
+    def test_same_tokens_as_list(self):
+        fileName = 'tempTest.txt'
+        open(fileName, 'w+').write("class A {\n\tint a;\n\tm(int p) { prints('x y'); a = 12; }\n}\nmain() { A x = A.CreateInstance(); }")
+        expected = [(t.type, t.value, t.line, t.pos, t.offset) for t in Parser.Parse(fileName)]
+        stream = Parser.ParseToTokenStream(fileName)
+        self.assertEqual(len(stream), len(expected))
+        self.assertEqual([(t.type, t.value, t.line, t.pos, t.offset) for t in stream], expected)
+        self.assertEqual(stream.GetType(5), TokenType.SEMICOLON)
+        self.assertEqual(stream[-1].value, '}')
+
+    def test_values_are_interned(self):
+        stream = TokenStream.FromTokens('abc abc', Parser.ParseText('abc abc'))
+        self.assertIs(stream.GetValue(0), stream.GetValue(1))
+
+
+class Test_Mapped(unittest.TestCase):
+    def test_same_tokens_as_text(self):
+        fileName = 'tempTest.txt'
+        srcText = "main() {\r\n\tstr s = 'caf\u00e9\r\nlatte';\r\n\tprints(s); int a = 12;\r}"
+        open(fileName, 'w+', encoding='utf-8', newline='').write(srcText)
+        expected = [(t.type, t.value, t.line, t.pos) for t in Parser.Parse(fileName)]
+        stream = Parser.ParseMapped(fileName)
+        self.assertEqual([(t.type, t.value, t.line, t.pos) for t in stream], expected)
+
+    def test_non_ascii_name(self):
+        fileName = 'tempTest.txt'
+        open(fileName, 'w+').write('int caf\u00e9 = 1;')
+        self.assertEqual(Parser.ParseMapped(fileName)[1].value, 'caf\u00e9')
+
+    def test_error(self):
+        fileName = 'tempTest.txt'
+        open(fileName, 'w+').write('int a = 2147483648;')
+        with self.assertRaises(Exception) as context:
+            Parser.ParseMapped(fileName)
+        self.assertEqual(str(context.exception), 'Number should be in such bounds: [-2147483648 - 2147483647] ! '\
+                         'Error at line: 1 and position: 21')
+
+
+class Test_IncrementalLexer(unittest.TestCase):
+    srcText = "main() {\n\tint a = 12;\n\tstr s = 'text';\n\tif (a >= 3) { print(a); }\n}"
+
+    def assertSameAsFullLexing(self, lexer):
+        expected = [(t.type, t.value, t.line, t.pos, t.offset) for t in Parser.ParseText(lexer.text)]
+        self.assertEqual([(t.type, t.value, t.line, t.pos, t.offset) for t in lexer.GetTokens()], expected)
+
+    def test_edits(self):
+        lexer = IncrementalLexer(self.srcText)
+        # edit inside token, joining of tokens, new lines and edit that opens string
+        edits = [(14, 0, '34'), (9, 5, 'int  x'), (0, 0, '\n\n'), (38, 1, "'"), (38, 1, '"'), 
+                 (len(lexer.text) - 1, 1, '')]
+        for offset, removedLength, insertedText in edits:
+            lexer.Edit(offset, removedLength, insertedText)
+            self.assertSameAsFullLexing(lexer)
+
+    def test_many_edits_before_getting_tokens(self):
+        lexer = IncrementalLexer(self.srcText)
+        for offset in (50, 30, 10, 40):
+            lexer.Edit(offset, 0, ' \n')
+        self.assertSameAsFullLexing(lexer)
+
+    def test_error_keeps_state(self):
+        lexer = IncrementalLexer(self.srcText)
+        with self.assertRaises(Exception):
+            lexer.Edit(14, 0, '#')
+        self.assertEqual(lexer.text, self.srcText)
+        self.assertSameAsFullLexing(lexer)
+
+
+class Test_TokenCache(unittest.TestCase):
+    def setUp(self):
+        self.cacheDir = tempfile.mkdtemp()
+        self.fileName = 'tempTest.txt'
+        open(self.fileName, 'w+').write("main() {\n\tstr s = 'caf\u00e9';\n\tint a = -5;\n\tprints(s);\n}")
+
+    def tearDown(self):
+        shutil.rmtree(self.cacheDir)
+
+    def test_load_stored_tokens(self):
+        tokenCache = TokenCache(self.cacheDir)
+        key = TokenCache.GetKey(self.fileName)
+        self.assertIsNone(tokenCache.Load(key))
+        tokens = Parser.Parse(self.fileName)
+        self.assertTrue(tokenCache.Store(key, tokens))
+        cached = tokenCache.Load(key)
+        self.assertEqual([(t.type, t.value, t.line, t.pos, t.offset) for t in cached],
+                         [(t.type, t.value, t.line, t.pos, t.offset) for t in tokens])
+
+    def test_changed_file_has_other_key(self):
+        key = TokenCache.GetKey(self.fileName)
+        open(self.fileName, 'a').write(' ')
+        self.assertNotEqual(TokenCache.GetKey(self.fileName), key)
+
+    def test_corrupted_entry(self):
+        tokenCache = TokenCache(self.cacheDir)
+        key = TokenCache.GetKey(self.fileName)
+        tokenCache.Store(key, Parser.Parse(self.fileName))
+        entryPath = tokenCache.GetEntryPath(key)
+        data = bytearray(open(entryPath, 'rb').read())
+        data[-1] ^= 0xFF
+        open(entryPath, 'wb').write(data)
+        self.assertIsNone(tokenCache.Load(key))
+        self.assertFalse(os.path.exists(entryPath))
+
+    def test_least_recently_used_is_evicted(self):
+        tokens = Parser.Parse(self.fileName)
+        entrySize = len(TokenCache.Encode(tokens, bytes(32)))
+        tokenCache = TokenCache(self.cacheDir, 3 * entrySize)
+        keys = [bytes([i]) * 32 for i in range(3)]
+        for i, key in enumerate(keys):
+            tokenCache.Store(key, tokens)
+            os.utime(tokenCache.GetEntryPath(key), (i, i))
+        self.assertIsNotNone(tokenCache.Load(keys[0]))
+        tokenCache.Store(bytes([3]) * 32, tokens)
+        self.assertEqual([os.path.exists(tokenCache.GetEntryPath(key)) for key in keys], [True, False, True])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
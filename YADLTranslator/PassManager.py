@@ -0,0 +1,91 @@
+import time
+from Instruction import Instruction
+from Instruction import Label
+from Instruction import Alias
+
+
+class PassStats(object):
+    """Statistics of optimization pass over all methods"""
+    __slots__ = ('seconds', 'instructionsDelta')
+
+    def __init__(self):
+        # wall time of all runs of pass
+        self.seconds = 0.0
+        # change of count of instructions made by pass, negative if pass removes them
+        self.instructionsDelta = 0
+
+
+def CountInstructions(listing:list) -> int:
+    return sum(1 for instruction in listing if type(instruction) is Instruction)
+
+
+class PassManager(object):
+    """Class that runs ordered optimization passes over listings (lists of
+    instructions, labels and aliases) of methods. Pass has NAME, LEVEL (the
+    lowest optimization level that runs it) and Run(listing) that returns
+    optimized listing. Level 0 emits code as it is generated. If verify is set,
+    listing is checked after every pass, so broken pass is found by its name"""
+    def __init__(self, optimizationLevel:int = 2, verify:bool = False):
+        self.optimizationLevel = optimizationLevel
+        self.verify = verify
+        self.passes = list()
+        # name of pass -> PassStats in order of passes
+        self.stats = dict()
+
+
+    def AddPass(self, optimizationPass):
+        # adds pass after passes added before if level of pass is enabled.
+        # Returns pass or None if it isn't run
+        if optimizationPass.LEVEL > self.optimizationLevel:
+            return None
+        self.passes.append(optimizationPass)
+        self.stats[optimizationPass.NAME] = PassStats()
+        return optimizationPass
+
+
+    def Run(self, listing:list) -> list:
+        # returns listing of method optimized by all passes
+        if self.verify:
+            self.Verify(listing, 'generation')
+        for optimizationPass in self.passes:
+            stats = self.stats[optimizationPass.NAME]
+            instructionsCount = CountInstructions(listing)
+            startTime = time.perf_counter()
+            listing = optimizationPass.Run(listing)
+            stats.seconds += time.perf_counter() - startTime
+            stats.instructionsDelta += CountInstructions(listing) - instructionsCount
+            if self.verify:
+                self.Verify(listing, optimizationPass.NAME)
+        return listing
+
+
+    def Verify(self, listing:list, passName:str):
+        # checks invariants of listing of method: it is alias or it starts with
+        # label of method, labels are unique and every jump goes to label of method
+        if len(listing) == 1 and type(listing[0]) is Alias:
+            return
+        if not listing or type(listing[0]) is not Label:
+            raise Exception('Listing after ' + passName + ' doesn\'t start with label of method!')
+        methodLabel = listing[0].name
+        labels = set()
+        targets = list()
+        for instruction in listing:
+            if type(instruction) is Label:
+                if instruction.name in labels:
+                    raise Exception('Label ' + instruction.name + ' is defined twice in ' + methodLabel
+                                    + ' after ' + passName + '!')
+                labels.add(instruction.name)
+            elif type(instruction) is Instruction:
+                if type(instruction.operands) is not tuple \
+                        or any(type(operand) is not str for operand in instruction.operands):
+                    raise Exception('Instruction ' + str(instruction.opcode) + ' in ' + methodLabel + ' after '
+                                    + passName + ' has invalid operands!')
+                if instruction.opcode == 'JMP' or instruction.opcode.startswith('jn'):
+                    targets.append(instruction.operands[0])
+            else:
+                raise Exception('Listing of ' + methodLabel + ' after ' + passName + ' contains '
+                                + type(instruction).__name__ + '!')
+        for target in targets:
+            if target not in labels:
+                raise Exception('Jump to undefined label ' + target + ' in ' + methodLabel + ' after '
+                                + passName + '!')
@@ -0,0 +1,157 @@
+import unittest
+from unittest import mock
+from Instruction import Instruction
+from Instruction import Label
+from Instruction import Alias
+from PassManager import PassManager
+from PassManager import CountInstructions
+from PeepholeOptimizer import PeepholeOptimizer
+from CodeFolder import CodeFolder
+from CodeGenerator import CodeGenerator
+from CodeGeneratorTest import MakeProgram
+from SyntaxAnalyzerTest import Analyze
+
+
+def MakeListing(jumpTarget:str = '_while_exit_2') -> list:
+    return [Label('_A_Run'),
+            Instruction('PUSH', ('EBP',)),
+            Instruction('MOV', ('EBP', 'ESP')),
+            Label('_while_condition_1', ''),
+            Instruction('MOV', ('EBX', 'DWORD 0')),
+            Instruction('CMP', ('EAX', 'EBX')),
+            Instruction('jnG', (jumpTarget,)),
+            Instruction('JMP', ('_while_condition_1',)),
+            Label('_while_exit_2'),
+            Instruction('ADD', ('ESP', '0')),
+            Instruction('MOV', ('ESP', 'EBP')),
+            Instruction('POP', ('EBP',)),
+            Instruction('RET')]
+
+
+class DuplicateLabelPass(object):
+    """Broken pass that defines label of block twice"""
+    NAME = 'duplicate label'
+    LEVEL = 2
+
+    def Run(self, listing:list) -> list:
+        return listing + [Label('_while_exit_2')]
+
+
+class DanglingJumpPass(object):
+    """Broken pass that removes labels of blocks"""
+    NAME = 'dangling jump'
+    LEVEL = 1
+
+    def Run(self, listing:list) -> list:
+        return listing[:1] + [instruction for instruction in listing[1:] if type(instruction) is not Label]
+
+
+class Test_PassManager(unittest.TestCase):
+    def test_passes_of_level(self):
+        for optimizationLevel, names in ((0, []), (1, ['peephole']), (2, ['peephole', 'folding'])):
+            with self.subTest(optimizationLevel=optimizationLevel):
+                passManager = PassManager(optimizationLevel)
+                peepholeOptimizer = passManager.AddPass(PeepholeOptimizer())
+                codeFolder = passManager.AddPass(CodeFolder())
+                self.assertEqual([optimizationPass.NAME for optimizationPass in passManager.passes], names)
+                self.assertEqual(list(passManager.stats), names)
+                self.assertEqual(peepholeOptimizer != None, PeepholeOptimizer.LEVEL <= optimizationLevel)
+                self.assertEqual(codeFolder != None, CodeFolder.LEVEL <= optimizationLevel)
+                listing = MakeListing()
+                self.assertEqual(passManager.Run(listing) is listing, optimizationLevel == 0)
+
+
+    def test_levels_of_code_generator(self):
+        srcFile = MakeProgram(4)
+        for optimizationLevel in (0, 1, 2):
+            with self.subTest(optimizationLevel=optimizationLevel):
+                analyzer = Analyze(srcFile, checkOnly=True)
+                codeGenerator = CodeGenerator(analyzer.program, analyzer.semanticAnalyzer.definedClasses,
+                                              optimizationLevel=optimizationLevel)
+                self.assertEqual(codeGenerator.removeDeadMethods,
+                                 optimizationLevel >= CodeGenerator.DEAD_METHODS_LEVEL)
+                self.assertEqual(codeGenerator.peepholeOptimizer != None, optimizationLevel >= PeepholeOptimizer.LEVEL)
+                self.assertEqual(codeGenerator.codeFolder != None, optimizationLevel >= CodeFolder.LEVEL)
+                code = Analyze(srcFile, optimizationLevel=optimizationLevel).BuildCode()
+                self.assertEqual('_C0_Unused:' in code, optimizationLevel < CodeGenerator.DEAD_METHODS_LEVEL)
+                self.assertEqual(' equ ' in code, optimizationLevel >= CodeFolder.LEVEL)
+                self.assertEqual('ADD ESP, 0' in code, optimizationLevel < PeepholeOptimizer.LEVEL)
+
+
+    def test_instructions_delta(self):
+        passManager = PassManager()
+        passManager.AddPass(PeepholeOptimizer())
+        passManager.AddPass(CodeFolder())
+        # ADD ESP, 0 is removed, the second method is alias of the first one
+        for methodLabel in ('_A_Run', '_B_Run'):
+            listing = MakeListing()
+            listing[0] = Label(methodLabel)
+            result = passManager.Run(listing)
+        self.assertEqual(len(result), 1)
+        self.assertIs(type(result[0]), Alias)
+        self.assertEqual(passManager.stats['peephole'].instructionsDelta, -2)
+        self.assertEqual(passManager.stats['folding'].instructionsDelta, 1 - CountInstructions(MakeListing()))
+        for stats in passManager.stats.values():
+            self.assertGreaterEqual(stats.seconds, 0)
+
+
+    def test_instructions_delta_of_code(self):
+        analyzer = Analyze(MakeProgram(5), verifyPasses=True)
+        stats = analyzer.passManager.stats
+        self.assertEqual(list(stats), ['peephole', 'folding'])
+        # every rule removes one instruction, but stack allocation is only moved
+        hitCounts = analyzer.peepholeOptimizer.hitCounts
+        self.assertEqual(stats['peephole'].instructionsDelta,
+                         hitCounts['stack allocation after load'] - sum(hitCounts.values()))
+        self.assertLess(stats['folding'].instructionsDelta, 0)
+
+
+    def test_verify_rejects_invalid_listing(self):
+        passManager = PassManager(verify=True)
+        passManager.Verify(MakeListing(), 'test')
+        passManager.Verify([Alias('_B_Run', '_A_Run')], 'test')
+        for listing, message in ((MakeListing('_while_exit_7'), 'Jump to undefined label _while_exit_7 in _A_Run '
+                                                                'after test!'),
+                                 (MakeListing() + [Label('_while_condition_1')],
+                                  'Label _while_condition_1 is defined twice in _A_Run after test!'),
+                                 (MakeListing()[1:], 'Listing after test doesn\'t start with label of method!'),
+                                 ([], 'Listing after test doesn\'t start with label of method!'),
+                                 (MakeListing() + [Alias('_B_Run', '_A_Run')],
+                                  'Listing of _A_Run after test contains Alias!'),
+                                 (MakeListing() + [Instruction('MOV', ['EAX', 'EBX'])],
+                                  'Instruction MOV in _A_Run after test has invalid operands!')):
+            with self.subTest(message=message):
+                with self.assertRaises(Exception) as context:
+                    passManager.Verify(listing, 'test')
+                self.assertEqual(str(context.exception), message)
+        # generated listing is checked before passes
+        self.assertRaisesRegex(Exception, 'after generation!', passManager.Run, MakeListing('_else_statement_3'))
+
+
+    def test_verify_finds_broken_pass(self):
+        for brokenPass, message in ((DuplicateLabelPass, 'Label _while_exit_2 is defined twice in _A_Run after '
+                                                         'duplicate label!'),
+                                    (DanglingJumpPass, 'Jump to undefined label _while_exit_2 in _A_Run after '
+                                                       'dangling jump!')):
+            with self.subTest(brokenPass=brokenPass.NAME):
+                passManager = PassManager(2, True)
+                passManager.AddPass(brokenPass())
+                self.assertRaisesRegex(Exception, message, passManager.Run, MakeListing())
+                # without verify broken code is emitted
+                passManager = PassManager(2)
+                passManager.AddPass(brokenPass())
+                passManager.Run(MakeListing())
+
+
+    def test_verify_passes_of_code(self):
+        srcFile = MakeProgram(3)
+        code = Analyze(srcFile).BuildCode()
+        self.assertEqual(Analyze(srcFile, verifyPasses=True).BuildCode(), code)
+        # pass of code generator that breaks code is found
+        with mock.patch('CodeGenerator.CodeFolder', DanglingJumpPass):
+            self.assertRaisesRegex(Exception, 'after dangling jump!', Analyze, srcFile, verifyPasses=True)
+            self.assertNotEqual(Analyze(srcFile).BuildCode(), code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+from Instruction import Instruction
+
+
+# registers that hold values in code of CodeGenerator
+GENERAL_REGISTERS = ('EAX', 'EBX', 'ECX', 'EDX')
+
+
+def IsStackAllocation(instruction:Instruction) -> bool:
+    return instruction.opcode == 'SUB' and instruction.operands == ('ESP', '4')
+
+
+def IsRegisterLoad(instruction:Instruction) -> bool:
+    # instruction only sets register and doesn't read it
+    return instruction.opcode in ('MOV', 'LEA') and instruction.operands[0] in GENERAL_REGISTERS \
+        and instruction.operands[0] not in instruction.operands[1]
+
+
+def RemoveZeroAdjustment(adjustment:Instruction) -> list:
+    # ADD ESP, 0 -> nothing
+    if adjustment.opcode in ('ADD', 'SUB') and adjustment.operands[1] == '0' \
+            and (adjustment.operands[0] == 'ESP' or adjustment.operands[0] in GENERAL_REGISTERS):
+        return []
+    return None
+
+
+def RemoveStackAdjustmentBeforeRestore(adjustment:Instruction, restore:Instruction) -> list:
+    # ADD ESP, 8; MOV ESP, EBP -> MOV ESP, EBP
+    if adjustment.opcode == 'ADD' and adjustment.operands[0] == 'ESP' \
+            and restore.opcode == 'MOV' and restore.operands == ('ESP', 'EBP'):
+        return [restore]
+    return None
+
+
+def LoadAddress(move:Instruction, subtraction:Instruction) -> list:
+    # MOV EBX, EBP; SUB EBX, 8 -> LEA EBX, [EBP - 8]
+    if move.opcode == 'MOV' and subtraction.opcode == 'SUB' and move.operands[0] in GENERAL_REGISTERS \
+            and move.operands[1] == 'EBP' and subtraction.operands[0] == move.operands[0] \
+            and subtraction.operands[1].isdigit():
+        return [Instruction('LEA', (move.operands[0], '[EBP - ' + subtraction.operands[1] + ']'))]
+    return None
+
+
+def Push(allocation:Instruction, move:Instruction) -> list:
+    # SUB ESP, 4; MOV [ESP], EAX -> PUSH EAX
+    if IsStackAllocation(allocation) and move.opcode == 'MOV' and move.operands[0] == '[ESP]' \
+            and '[' not in move.operands[1]:
+        return [Instruction('PUSH', (move.operands[1],))]
+    return None
+
+
+def SinkStackAllocation(allocation:Instruction, instruction:Instruction) -> list:
+    # SUB ESP, 4; MOV EAX, [EBP - 8] -> MOV EAX, [EBP - 8]; SUB ESP, 4
+    # so allocation gets to MOV [ESP] that sets allocated variable
+    if IsStackAllocation(allocation) and instruction.opcode in ('MOV', 'LEA', 'SUB') \
+            and instruction.operands[0] in GENERAL_REGISTERS and 'ESP' not in instruction.operands[1]:
+        return [instruction, allocation]
+    return None
+
+
+def LoadToEBX(load:Instruction, move:Instruction, nextLoad:Instruction) -> list:
+    # MOV EAX, DWORD 5; MOV EBX, EAX; MOV EAX, [EBP - 8] -> MOV EBX, DWORD 5; MOV EAX, [EBP - 8]
+    # value of EAX is overwritten by the next load anyway
+    if load.opcode in ('MOV', 'LEA') and load.operands[0] == 'EAX' \
+            and move.opcode == 'MOV' and move.operands == ('EBX', 'EAX') \
+            and IsRegisterLoad(nextLoad) and nextLoad.operands[0] == 'EAX':
+        return [Instruction(load.opcode, ('EBX', load.operands[1])), nextLoad]
+    return None
+
+
+def RemoveRepeatedLoad(load:Instruction, instruction:Instruction, repeatedLoad:Instruction) -> list:
+    # MOV EAX, [EBP + 8]; MOV EBX, [EAX - 4]; MOV EAX, [EBP + 8] -> MOV EAX, [EBP + 8]; MOV EBX, [EAX - 4]
+    if load.opcode == 'MOV' and IsRegisterLoad(load) and repeatedLoad.opcode == 'MOV' \
+            and repeatedLoad.operands == load.operands and IsRegisterLoad(instruction) \
+            and instruction.operands[0] != load.operands[0] and instruction.operands[0] not in load.operands[1]:
+        return [load, instruction]
+    return None
+
+
+class PeepholeOptimizer(object):
+    """Optimization pass that rewrites short sequences of instructions of method by
+    table of rules. Instructions are added to result one by one and rules are
+    tried on the end of result; code made by rule is added again, so it can be
+    rewritten by other rules. Sequence with label doesn't match, so code isn't
+    rewritten across jump targets. Rules rely on code of CodeGenerator: flags
+    are read only right after CMP and EBX is set before use in every statement"""
+
+    NAME = 'peephole'
+    # the lowest optimization level that runs pass
+    LEVEL = 1
+    # name of rule, count of instructions it matches, opcodes of the last of
+    # them, function that returns instructions for matched ones or None
+    RULES = [
+        ('adjustment by zero', 1, ('ADD', 'SUB'), RemoveZeroAdjustment),
+        ('stack adjustment before restore', 2, ('MOV',), RemoveStackAdjustmentBeforeRestore),
+        ('address by LEA', 2, ('SUB',), LoadAddress),
+        ('PUSH', 2, ('MOV',), Push),
+        ('stack allocation after load', 2, ('MOV', 'LEA', 'SUB'), SinkStackAllocation),
+        ('load to EBX', 3, ('MOV', 'LEA'), LoadToEBX),
+        ('repeated load', 3, ('MOV',), RemoveRepeatedLoad)
+    ]
+    MAX_RULE_SIZE = 3
+
+    def __init__(self):
+        # name of rule -> count of rewritten sequences
+        self.hitCounts = dict.fromkeys([name for name, size, opcodes, rule in PeepholeOptimizer.RULES], 0)
+        # opcode of the last instruction -> rules that can match, in order of table
+        self.rulesByOpcode = dict()
+        for name, size, opcodes, rule in PeepholeOptimizer.RULES:
+            for opcode in opcodes:
+                self.rulesByOpcode.setdefault(opcode, list()).append((name, size, rule))
+
+
+    def Run(self, listing:list) -> list:
+        # returns optimized list of instructions and labels of method
+        result = list()
+        # instructions to add, the next one is the last
+        pending = listing[::-1]
+        while pending:
+            instruction = pending.pop()
+            result.append(instruction)
+            if type(instruction) is not Instruction or instruction.opcode not in self.rulesByOpcode:
+                continue
+            # count of instructions without labels at the end of result
+            instructionsCount = 0
+            while instructionsCount < min(len(result), PeepholeOptimizer.MAX_RULE_SIZE) \
+                    and type(result[-1 - instructionsCount]) is Instruction:
+                instructionsCount += 1
+            for name, size, rule in self.rulesByOpcode[instruction.opcode]:
+                if size > instructionsCount:
+                    continue
+                replacement = rule(*result[-size:])
+                if replacement != None:
+                    self.hitCounts[name] += 1
+                    del result[-size:]
+                    pending.extend(reversed(replacement))
+                    break
+        return result
@@ -0,0 +1,258 @@
+import unittest
+from Instruction import Instruction
+from Instruction import Label
+from Instruction import RenderListing
+from PeepholeOptimizer import PeepholeOptimizer
+from PeepholeOptimizer import IsRegisterLoad
+from SyntaxAnalyzerTest import Analyze
+
+SOURCE = '''class P {
+  int x;
+  int y;
+  Move(int d) {
+    this.x = d;
+    if (this.y < d) { this.y = this.x; }
+  }
+}
+main() {
+  int a = 5;
+  P p = P.CreateInstance();
+  p.Move(a);
+  print(p.x);
+}
+'''
+
+# code of methods of SOURCE before and after peephole rules
+MAIN_CODE = ('_main: ',
+             'MOV EBP, ESP ',
+             'SUB ESP, 4 ',
+             'MOV EAX, DWORD 5',
+             'MOV [ESP], EAX ',
+             'SUB ESP, 4 ',
+             'MOV [ESP], DWORD 0 ',
+             'SUB ESP, 4 ',
+             'MOV [ESP], DWORD 0 ',
+             'MOV EAX, [EBP - 4]',
+             'PUSH EAX ',
+             'MOV EBX, EBP ',
+             'SUB EBX, 8',
+             'PUSH EBX ',
+             'CALL _P_Move',
+             'ADD ESP, 8 ',
+             'MOV EAX, [EBP - 8]',
+             'PUSH EAX ',
+             'CALL _Print ',
+             'ADD ESP, 4 ',
+             'ADD ESP, 12')
+OPTIMIZED_MAIN_CODE = ('_main: ',
+                       'MOV EBP, ESP ',
+                       'MOV EAX, DWORD 5',
+                       'PUSH EAX',
+                       'PUSH DWORD 0',
+                       'PUSH DWORD 0',
+                       'MOV EAX, [EBP - 4]',
+                       'PUSH EAX ',
+                       'LEA EBX, [EBP - 8]',
+                       'PUSH EBX ',
+                       'CALL _P_Move',
+                       'ADD ESP, 8 ',
+                       'MOV EAX, [EBP - 8]',
+                       'PUSH EAX ',
+                       'CALL _Print ',
+                       'ADD ESP, 4 ',
+                       'ADD ESP, 12')
+MOVE_CODE = ('_P_Move:',
+             'PUSH EBP ',
+             'MOV EBP, ESP ',
+             'MOV EBX, [EBP + 8] ',
+             'SUB EBX, 0',
+             'MOV EAX, [EBP + 12] ',
+             'MOV [EBX], EAX ',
+             'MOV EAX, [EBP + 12] ',
+             'MOV EBX, EAX ',
+             'MOV EAX, [EBP + 8] ',
+             'MOV EAX, [EAX - 4]',
+             'CMP EAX, EBX ',
+             'jnL _else_statement_1',
+             'MOV EBX, [EBP + 8] ',
+             'SUB EBX, 4',
+             'MOV EAX, [EBP + 8] ',
+             'MOV EAX, [EAX - 0]',
+             'MOV [EBX], EAX ',
+             'ADD ESP, 0',
+             '_else_statement_1: ',
+             'ADD ESP, 0',
+             'MOV ESP, EBP ',
+             'POP EBP ',
+             'RET ')
+OPTIMIZED_MOVE_CODE = ('_P_Move:',
+                       'PUSH EBP ',
+                       'MOV EBP, ESP ',
+                       'MOV EBX, [EBP + 8] ',
+                       'MOV EAX, [EBP + 12] ',
+                       'MOV [EBX], EAX ',
+                       'MOV EBX, [EBP + 12]',
+                       'MOV EAX, [EBP + 8] ',
+                       'MOV EAX, [EAX - 4]',
+                       'CMP EAX, EBX ',
+                       'jnL _else_statement_1',
+                       'MOV EBX, [EBP + 8] ',
+                       'SUB EBX, 4',
+                       'MOV EAX, [EBP + 8] ',
+                       'MOV EAX, [EAX - 0]',
+                       'MOV [EBX], EAX ',
+                       '_else_statement_1: ',
+                       'MOV ESP, EBP ',
+                       'POP EBP ',
+                       'RET ')
+
+
+def Parse(*lines) -> list:
+    # returns listing of lines of code: label ends with ':', instruction is
+    # opcode and operands separated by ', '
+    listing = list()
+    for line in lines:
+        if line.endswith(':'):
+            listing.append(Label(line[:-1]))
+        elif ' ' in line:
+            opcode, operands = line.split(' ', 1)
+            listing.append(Instruction(opcode, tuple(operands.split(', '))))
+        else:
+            listing.append(Instruction(line))
+    return listing
+
+
+def GetMethodCode(code:str, methodLabel:str) -> tuple:
+    # returns lines of code of method up to the empty line (P.Move is the last method)
+    lines = code[code.index('\n' + methodLabel + ':') + 1:].split('\n')
+    return tuple(lines[:lines.index('')])
+
+
+class Test_Rules(unittest.TestCase):
+    def Optimize(self, *lines) -> tuple:
+        # returns lines of optimized code and names of rules with hits
+        optimizer = PeepholeOptimizer()
+        code = RenderListing(optimizer.Run(Parse(*lines)))
+        return tuple(code.splitlines()), {name for name, count in optimizer.hitCounts.items() if count > 0}
+
+
+    def assertRewritten(self, lines:tuple, optimizedLines:tuple, ruleName:str):
+        self.assertEqual(self.Optimize(*lines), (optimizedLines, {ruleName}))
+
+
+    def assertNotRewritten(self, *lines):
+        self.assertEqual(self.Optimize(*lines), (lines, set()))
+
+
+    def test_adjustment_by_zero(self):
+        self.assertRewritten(('ADD ESP, 0', 'RET'), ('RET',), 'adjustment by zero')
+        self.assertRewritten(('SUB EBX, 0', 'RET'), ('RET',), 'adjustment by zero')
+        self.assertNotRewritten('ADD ESP, 4', 'SUB EBX, 8')
+        self.assertNotRewritten('SUB [EBX], 0')
+
+
+    def test_stack_adjustment_before_restore(self):
+        self.assertRewritten(('ADD ESP, 8', 'MOV ESP, EBP', 'POP EBP'), ('MOV ESP, EBP', 'POP EBP'),
+                             'stack adjustment before restore')
+        self.assertNotRewritten('ADD ESP, 8', 'MOV ESP, EBX')
+        self.assertNotRewritten('ADD EAX, 8', 'MOV ESP, EBP')
+
+
+    def test_address_by_lea(self):
+        self.assertRewritten(('MOV EBX, EBP', 'SUB EBX, 8'), ('LEA EBX, [EBP - 8]',), 'address by LEA')
+        self.assertNotRewritten('MOV EBX, EBP', 'SUB EAX, 8')
+        self.assertNotRewritten('MOV EBX, [EBP + 8]', 'SUB EBX, 4')
+        self.assertNotRewritten('MOV EBX, EBP', 'SUB EBX, EAX')
+
+
+    def test_push(self):
+        self.assertRewritten(('SUB ESP, 4', 'MOV [ESP], EAX'), ('PUSH EAX',), 'PUSH')
+        self.assertRewritten(('SUB ESP, 4', 'MOV [ESP], DWORD 0'), ('PUSH DWORD 0',), 'PUSH')
+        self.assertNotRewritten('SUB ESP, 8', 'MOV [ESP], EAX')
+        self.assertNotRewritten('SUB ESP, 4', 'MOV [ESP], DWORD [EBX]')
+
+
+    def test_stack_allocation_after_load(self):
+        self.assertRewritten(('SUB ESP, 4', 'MOV EAX, [EBP - 8]'), ('MOV EAX, [EBP - 8]', 'SUB ESP, 4'),
+                             'stack allocation after load')
+        self.assertNotRewritten('SUB ESP, 4', 'MOV EAX, [ESP]')
+        self.assertNotRewritten('SUB ESP, 4', 'MOV [EBX], EAX')
+        # allocation gets to store to allocated variable
+        self.assertEqual(self.Optimize('SUB ESP, 4', 'MOV EAX, [EBP - 8]', 'MOV [ESP], EAX'),
+                         (('MOV EAX, [EBP - 8]', 'PUSH EAX'), {'stack allocation after load', 'PUSH'}))
+
+
+    def test_load_to_ebx(self):
+        self.assertRewritten(('MOV EAX, DWORD 5', 'MOV EBX, EAX', 'MOV EAX, [EBP - 8]'),
+                             ('MOV EBX, DWORD 5', 'MOV EAX, [EBP - 8]'), 'load to EBX')
+        self.assertRewritten(('LEA EAX, [EBP - 4]', 'MOV EBX, EAX', 'MOV EAX, DWORD 1'),
+                             ('LEA EBX, [EBP - 4]', 'MOV EAX, DWORD 1'), 'load to EBX')
+        self.assertNotRewritten('MOV EAX, DWORD 5', 'MOV EBX, EAX', 'MOV EDX, [EBP - 8]')
+        self.assertNotRewritten('MOV EAX, DWORD 5', 'MOV EBX, EAX', 'CMP EAX, EBX')
+
+
+    def test_register_load_guard(self):
+        # the next load reads EAX, so value of EAX is used
+        self.assertFalse(IsRegisterLoad(Instruction('MOV', ('EAX', '[EAX - 4]'))))
+        self.assertFalse(IsRegisterLoad(Instruction('MOV', ('[EBX]', 'EAX'))))
+        self.assertTrue(IsRegisterLoad(Instruction('LEA', ('EBX', '[EBP - 8]'))))
+        self.assertNotRewritten('MOV EAX, [EBP + 8]', 'MOV EBX, EAX', 'MOV EAX, [EAX - 4]')
+
+
+    def test_repeated_load(self):
+        self.assertRewritten(('MOV EAX, [EBP + 8]', 'MOV EBX, [EAX - 4]', 'MOV EAX, [EBP + 8]'),
+                             ('MOV EAX, [EBP + 8]', 'MOV EBX, [EAX - 4]'), 'repeated load')
+        # the second instruction changes register or address of load
+        self.assertNotRewritten('MOV EAX, [EBP + 8]', 'MOV EAX, [EAX - 4]', 'MOV EAX, [EBP + 8]')
+        self.assertNotRewritten('MOV EAX, [EBX + 8]', 'MOV EBX, DWORD 1', 'MOV EAX, [EBX + 8]')
+        self.assertNotRewritten('MOV EAX, [EBP + 8]', 'MOV [EBX], EAX', 'MOV EAX, [EBP + 8]')
+
+
+    def test_rules_do_not_cross_label(self):
+        self.assertNotRewritten('ADD ESP, 8', '_label:', 'MOV ESP, EBP')
+        self.assertNotRewritten('MOV EBX, EBP', '_label:', 'SUB EBX, 8')
+        self.assertNotRewritten('SUB ESP, 4', '_label:', 'MOV [ESP], EAX')
+        self.assertNotRewritten('MOV EAX, [EBP + 8]', 'MOV EBX, [EAX - 4]', '_label:', 'MOV EAX, [EBP + 8]')
+        self.assertRewritten(('MOV EAX, DWORD 1', '_label:', 'ADD ESP, 0'), ('MOV EAX, DWORD 1', '_label:'),
+                             'adjustment by zero')
+
+
+    def test_hit_counts(self):
+        optimizer = PeepholeOptimizer()
+        self.assertEqual(list(optimizer.hitCounts), [name for name, size, opcodes, rule in PeepholeOptimizer.RULES])
+        self.assertEqual(set(optimizer.hitCounts.values()), {0})
+        optimizer.Run(Parse('SUB ESP, 4', 'MOV [ESP], EAX', 'ADD ESP, 0', 'SUB ESP, 4', 'MOV [ESP], EBX'))
+        optimizer.Run(Parse('MOV EBX, EBP', 'SUB EBX, 8'))
+        self.assertEqual(optimizer.hitCounts, {'adjustment by zero': 1, 'stack adjustment before restore': 0,
+                                               'address by LEA': 1, 'PUSH': 2, 'stack allocation after load': 0,
+                                               'load to EBX': 0, 'repeated load': 0})
+
+
+class Test_Code(unittest.TestCase):
+    def test_code_before_and_after_rules(self):
+        code = Analyze(SOURCE, optimizationLevel=0).BuildCode()
+        self.assertEqual(GetMethodCode(code, '_main'), MAIN_CODE + ('XOR EAX, EAX ', 'RET '))
+        self.assertEqual(GetMethodCode(code, '_P_Move'), MOVE_CODE)
+        analyzer = Analyze(SOURCE, optimizationLevel=1)
+        code = analyzer.BuildCode()
+        self.assertEqual(GetMethodCode(code, '_main'), OPTIMIZED_MAIN_CODE + ('XOR EAX, EAX ', 'RET '))
+        self.assertEqual(GetMethodCode(code, '_P_Move'), OPTIMIZED_MOVE_CODE)
+        self.assertEqual(analyzer.peepholeOptimizer.hitCounts, {
+            'adjustment by zero': 3, 'stack adjustment before restore': 0, 'address by LEA': 1, 'PUSH': 3,
+            'stack allocation after load': 1, 'load to EBX': 1, 'repeated load': 0})
+
+
+    def test_code_without_rules_is_unchanged(self):
+        # SOURCE has no dead methods, so -O1 without peephole rules is -O0
+        code = Analyze(SOURCE, optimizationLevel=0).BuildCode()
+        for options in ({'optimizationLevel': 0}, {'optimizationLevel': 0, 'optimizePeephole': True},
+                        {'optimizationLevel': 1, 'optimizePeephole': False},
+                        {'optimizePeephole': False, 'foldIdenticalCode': False}):
+            with self.subTest(**options):
+                analyzer = Analyze(SOURCE, **options)
+                self.assertIsNone(analyzer.peepholeOptimizer)
+                self.assertEqual(analyzer.BuildCode(), code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,564 @@
+from Token import TokenType
+from Token import Token
+from YADLSyntaxStructures import YADLClassData
+from YADLSyntaxStructures import YADLMethodData
+from SymbolTable import SymbolTable
+from SymbolTable import SymbolData
+from VariableTypes import LValueType
+from VariableTypes import RValueType
+from Diagnostics import YADLError
+from Diagnostics import YADLSyntaxError
+from Diagnostics import YADLSemanticError
+from Diagnostics import Diagnostics
+from SyntaxTree import ValueNode
+from SyntaxTree import InvalidStatementNode
+from SyntaxTree import IntVarInitNode
+from SyntaxTree import StrVarInitNode
+from SyntaxTree import ObjectVarInitNode
+from SyntaxTree import AssigningNode
+from SyntaxTree import MethodCallNode
+from SyntaxTree import BlockStatementNode
+from SyntaxTree import IfNode
+from SyntaxTree import WhileNode
+from SyntaxTree import PrintNode
+from SyntaxTree import PrintStringNode
+from SyntaxTree import FieldNode
+from SyntaxTree import MethodNode
+from SyntaxTree import ClassNode
+from SyntaxTree import ProgramNode
+from SyntaxTree import WalkStatements
+from SymbolIndex import SymbolKind
+from SymbolIndex import SymbolIndex
+from StringPool import StringPool
+from CallGraph import CallGraph
+
+
+class SemanticAnalyzer(object):
+    """class that checks syntax tree of YADL source file: defines classes and
+    variables, checks names and types and saves in nodes data for code
+    generation (locations of variables in stack, called methods). Nodes are
+    checked in order of source; node with syntax error is checked up to its
+    unparsed part and then its error is reported, so errors are reported in
+    the same order as they are in source file. If symbolIndex is given,
+    every resolved identifier is added to it"""
+    def __init__(self, program:ProgramNode, symbolIndex:SymbolIndex = None):
+        self.program = program
+        self.symbolIndex = symbolIndex
+        # strings of data section; SymbolData of str variable -> label of its string
+        self.program.stringPool = StringPool()
+        self.stringLabels = dict()
+        self.program.callGraph = CallGraph()
+        # dictionary that contains YADLClassData for every defined in src class
+        self.definedClasses = dict()
+        # Symbol Table for methods
+        self.localSymbolTable = SymbolTable()
+        # vars that hold current values
+        self.currentClassName = str()
+        self.currentMethodName = str()
+        # token of node that is checked now, errors are reported at it
+        self.checkedToken = None
+        # errors found in source file; checks continue after error from the
+        # next statement, class member or class
+        self.diagnostics = Diagnostics()
+        # type of statement node -> method that checks it
+        self.statementChecks = {
+            InvalidStatementNode: self.InvalidStatement,
+            IntVarInitNode: self.IntVarInit,
+            StrVarInitNode: self.StrVarInit,
+            ObjectVarInitNode: self.ObjectVarInit,
+            AssigningNode: self.Assigning,
+            MethodCallNode: self.MethodCall,
+            IfNode: self.BlockStatement,
+            WhileNode: self.BlockStatement,
+            PrintNode: self.PrintStatement,
+            PrintStringNode: self.PrintStringStatement
+        }
+
+
+    def Check(self):
+        for classNode in self.program.classes:
+            try:
+                self.ClassDef(classNode)
+            except YADLError as ex:
+                self.ReportError(ex)
+        try:
+            self.MainDef(self.program.main)
+        except YADLError as ex:
+            self.ReportError(ex)
+        if self.symbolIndex != None:
+            self.symbolIndex.Finish()
+
+
+    def SemanticError(self, message:str) -> YADLSemanticError:
+        # returns error at the checked token
+        return YADLSemanticError(message, self.checkedToken.line, self.checkedToken.pos)
+
+
+    def SyntaxErrorAt(self, token:Token, message:str = '') -> YADLSyntaxError:
+        return YADLSyntaxError(message, token.line, token.pos)
+
+
+    def ReportError(self, ex:YADLError):
+        self.diagnostics.Add(ex)
+
+
+    def IndexDeclaration(self, declaration, token:Token, kind:SymbolKind, type:str = None, methodName:str = None):
+        if self.symbolIndex != None:
+            self.symbolIndex.AddDeclaration(declaration, token, kind, type, self.currentClassName, methodName)
+
+
+    def IndexReference(self, declaration, token:Token):
+        # declaration is SymbolData, YADLMethodData, YADLClassData or (class name, field name)
+        if self.symbolIndex != None:
+            self.symbolIndex.AddReference(declaration, token)
+
+
+    def ClassDef(self, classNode:ClassNode):
+        if classNode.nameToken == None:
+            raise classNode.error
+
+        # if class with such name already defined
+        self.checkedToken = classNode.nameToken
+        className = classNode.nameToken.value
+        if self.IsClassDefined(className):
+            raise self.SemanticError('Class with ' + className + ' has been already defined!')
+
+        self.definedClasses[className] = YADLClassData(className)
+        self.currentClassName = className
+        self.IndexDeclaration(self.definedClasses[className], classNode.nameToken, SymbolKind.CLASS)
+
+        for field in classNode.fields:
+            try:
+                self.FieldDef(field)
+            except YADLError as ex:
+                self.ReportError(ex)
+        self.definedClasses[self.currentClassName].Freeze()
+
+        for method in classNode.methods:
+            try:
+                self.MethodDef(method)
+            except YADLError as ex:
+                self.ReportError(ex)
+
+        if classNode.methodsEndToken != None and len(self.definedClasses[self.currentClassName].methods) == 0:
+            # all parsed methods have errors in header
+            raise self.SyntaxErrorAt(classNode.methodsEndToken,
+                    'Class method definitinon expected! Class should contain at least 1 method definition!')
+        if classNode.error != None:
+            raise classNode.error
+
+
+    def IsClassDefined(self, className):
+        return className in self.definedClasses
+
+
+    def FieldDef(self, field:FieldNode):
+        if field.nameToken == None:
+            raise field.error
+
+        self.checkedToken = field.nameToken
+        fieldName = field.nameToken.value
+        # check if field name free in current class
+        if self.definedClasses[self.currentClassName].IsVarInList(fieldName):
+            raise self.SemanticError('Class variable ' + fieldName + ' has been already defined!')
+
+        self.definedClasses[self.currentClassName].AddVar(fieldName)
+        self.IndexDeclaration((self.currentClassName, fieldName), field.nameToken, SymbolKind.FIELD, 'int')
+        if field.error != None:
+            raise field.error
+
+
+    def MethodDef(self, method:MethodNode):
+        if method.nameToken == None:
+            raise method.error
+
+        methodName = method.nameToken.value
+        methodParamType = None
+        methodParamName = None
+        if method.paramTypeToken != None:
+            self.checkedToken = method.paramTypeToken
+            methodParamType = method.paramTypeToken.value
+            if not (methodParamType in self.definedClasses.keys() or methodParamType == 'int'):
+                raise self.SemanticError('Type ' + methodParamType + ' not defined above!')
+            self.IndexReference(self.definedClasses.get(methodParamType), method.paramTypeToken)
+            if method.paramNameToken != None:
+                methodParamName = method.paramNameToken.value
+
+        if method.openToken == None:
+            raise method.error
+
+        self.checkedToken = method.openToken
+        if self.definedClasses[self.currentClassName].FindMethodInList(methodName) != None:
+            raise self.SemanticError('Method with name ' + methodName + ' has been already defined!')
+
+        methodData = YADLMethodData(methodName, methodParamType, methodParamName)
+        self.definedClasses[self.currentClassName].AddMethod(methodData)
+        self.IndexDeclaration(methodData, method.nameToken, SymbolKind.METHOD, methodParamType)
+
+        self.currentMethodName = methodName
+
+        self.localSymbolTable.Clear()
+        if methodParamName != None:
+            self.localSymbolTable.AddParamSymbol(SymbolData(methodParamName, methodParamType))
+            self.IndexDeclaration(self.localSymbolTable.paramSymbol, method.paramNameToken, SymbolKind.PARAM,
+                                  methodParamType, methodName)
+
+        self.Statements(method.statements)
+
+        # size of locals for clean up of the stack
+        method.localsSize = self.GetLocalVarsSize()
+        if method.error != None:
+            raise method.error
+
+
+    def MainDef(self, main:MethodNode):
+        if main.openToken == None:
+            raise main.error
+
+        self.currentMethodName = 'main'
+        self.currentClassName = None
+        self.localSymbolTable.Clear()
+
+        self.Statements(main.statements)
+
+        main.localsSize = self.GetLocalVarsSize()
+        if main.error != None:
+            raise main.error
+
+
+    def Statements(self, statements:list):
+        # statement with body opens scope of its block, the scope is removed
+        # after statements of the block
+        for statement, isBlockEnd in WalkStatements(statements):
+            if isBlockEnd:
+                if isinstance(statement, BlockStatementNode):
+                    statement.scopeSymbolsCount = len(self.localSymbolTable.GetLastTable().symbolsData)
+                self.localSymbolTable.RemoveLastScopeTable()
+                continue
+            try:
+                self.statementChecks[type(statement)](statement)
+            except YADLError as ex:
+                self.ReportError(ex)
+            if statement.body != None:
+                self.localSymbolTable.AddNewScopeTable()
+
+
+    def CalculateLocationOfVariableInStackFromTop(self, varName:str):
+        # returns distance between variable varName in stack and
+        # start of stack frame (in EBP register) in bytes.
+        # Uses to get or set value of a variable, ex. [ebp - 8]
+        # Location is calculated once when variable is declared (see SymbolTable.AddSymbol)
+        data = self.localSymbolTable.FindSymbolGlobal(varName)
+        if data == None:
+            raise self.SemanticError('Unexpected variable!')
+        if data.location == None and self.localSymbolTable.IsInNestedScope():
+            # method parameter isn't found in nested scopes
+            raise self.SemanticError('Unexpected variable!')
+        return data.location
+
+
+    def GetCopiedObjectLocation(self, varName:str) -> int:
+        # returns location of object whose variables are copied; object that is
+        # method parameter isn't in stack frame of method
+        location = self.CalculateLocationOfVariableInStackFromTop(varName)
+        if location == None:
+            raise self.SemanticError('Object ' + varName + ' is method parameter, it can\'t be copied!')
+        return location
+
+
+    def GetCurrentClass(self, varName:str) -> YADLClassData:
+        # returns data of class of method for this.var, main has no class
+        if self.currentClassName == None:
+            raise self.SemanticError('Variable this.' + varName + ' can\'t be used in main!')
+        return self.definedClasses[self.currentClassName]
+
+
+    def GetObjectClass(self, objectName:str, objectType:str, varName:str) -> YADLClassData:
+        # returns data of class of object for obj.var, int and str have no variables
+        if objectType not in self.definedClasses:
+            raise self.SemanticError('Variable ' + objectName + ' of type ' + objectType + ' has no variable '
+                                     + varName + '!')
+        return self.definedClasses[objectType]
+
+
+    def GetVarSize(self, varType:str) -> int:
+        # returns size in bytes of local variable of type varType in stack
+        if varType == 'int':
+            return 4
+        elif varType == 'str':
+            return 0
+        return self.definedClasses[varType].size
+
+
+    def GetLocalVarsSize(self) -> int:
+        # returns size in bytes of local variables
+        return self.localSymbolTable.GetLastTable().symbolsSize
+
+
+    def InvalidStatement(self, node:InvalidStatementNode):
+        raise node.error
+
+
+    def DeclareLocalVar(self, nameToken:Token, varType:str, usedNameMessage:str):
+        self.checkedToken = nameToken
+        localVarName = nameToken.value
+        # check if var name is available
+        if not self.localSymbolTable.IsNameFreeInScope(localVarName):
+            raise self.SemanticError('Variable with name ' + localVarName + usedNameMessage)
+        elif localVarName in self.definedClasses.keys():
+            raise self.SemanticError('Variable with name ' + localVarName + " can't be declared, because this name has been already occupied by class!")
+
+        symbol = SymbolData(localVarName, varType, self.GetVarSize(varType))
+        self.localSymbolTable.AddSymbol(symbol)
+        self.IndexDeclaration(symbol, nameToken, SymbolKind.LOCAL, varType, self.currentMethodName)
+        return symbol
+
+
+    def IntVarInit(self, node:IntVarInitNode):
+        node.symbol = self.DeclareLocalVar(node.nameToken, 'int', ' has been already defined in local scope!')
+        if node.value == None:
+            raise node.error
+
+        self.RValueWithExpectedType(node.value, 'int', node.error)
+        if node.error != None:
+            raise node.error
+
+
+    def StrVarInit(self, node:StrVarInitNode):
+        node.symbol = self.DeclareLocalVar(node.nameToken, 'str', ' has been already defined in local scope!')
+        if node.stringToken != None:
+            node.label = self.program.stringPool.Intern(node.stringToken.value[1:-1],
+                                                       (self.currentClassName, self.currentMethodName))
+            self.stringLabels[node.symbol] = node.label
+        if node.error != None:
+            raise node.error
+
+
+    def ObjectVarInit(self, node:ObjectVarInitNode):
+        self.checkedToken = node.typeToken
+        objType = node.typeToken.value
+        if objType not in self.definedClasses.keys():
+            raise self.SemanticError('Undefined type ' + objType + '!')
+        self.IndexReference(self.definedClasses[objType], node.typeToken)
+
+        if node.nameToken == None:
+            raise node.error
+
+        node.symbol = self.DeclareLocalVar(node.nameToken, objType, ' has been already defined!')
+        if node.rightToken == None:
+            raise node.error
+
+        rightName = node.rightToken.value
+        if node.constructorEndToken != None:
+            # constructor call
+            self.IndexReference(self.definedClasses.get(rightName), node.rightToken)
+            # check types
+            self.checkedToken = node.constructorEndToken
+            if objType != rightName:
+                raise self.SemanticError('Can\'t cast ' + objType + ' to ' + rightName + '!')
+            node.fieldsCount = len(self.definedClasses[objType].vars)
+        else:
+            self.RValueWithExpectedType(node.value, objType, node.error)
+            # copy all variables of the right var
+            objLocation = self.CalculateLocationOfVariableInStackFromTop(node.nameToken.value)
+            rightLocation = self.GetCopiedObjectLocation(rightName)
+            node.copyLocations = [(rightLocation + i*4, objLocation + i*4)
+                                  for i in range(0, len(self.definedClasses[objType].vars))]
+
+        if node.error != None:
+            raise node.error
+
+
+    def Assigning(self, node:AssigningNode):
+        lvalue = node.left
+        self.LValue(lvalue, node.error)
+        if node.assignToken == None:
+            raise node.error
+
+        if lvalue.valueType == LValueType.OBJECT_WITH_INT_VARIABLE:
+            lvalueType = 'int'
+        else:
+            lvalueType = lvalue.varType
+
+        self.checkedToken = node.assignToken
+        if self.localSymbolTable.IsItMethodParamName(lvalue.nameToken.value) and lvalue.varType == 'int':
+            raise self.SemanticError('It is prohibited to set value to method parameter of type <int>!')
+
+        rvalue = node.value
+        self.RValueWithExpectedType(rvalue, lvalueType, node.error)
+        if lvalueType != 'int':
+            leftLocation = self.GetCopiedObjectLocation(lvalue.nameToken.value)
+            rightLocation = self.GetCopiedObjectLocation(rvalue.nameToken.value)
+            # EAX contains address of first variable of object
+            node.copyLocations = [(rightLocation + i*4, leftLocation + i*4)
+                                  for i in range(0, len(self.definedClasses[lvalue.varType].vars))]
+
+        if node.error != None:
+            raise node.error
+
+
+    def MethodCall(self, node:MethodCallNode):
+        if node.objectToken != None:
+            # method defined in another class
+            self.checkedToken = node.objectToken
+            objData = self.localSymbolTable.FindSymbolGlobal(node.objectToken.value)
+            if objData == None:
+                raise self.SemanticError('Object ' + node.objectToken.value + ' is undefined in method '
+                                         + self.currentMethodName + '!')
+            parentClass = objData.type
+            self.IndexReference(objData, node.objectToken)
+        else:
+            # method definded in current class
+            parentClass = self.currentClassName
+
+        self.checkedToken = node.methodToken
+        methodName = node.methodToken.value
+        if parentClass == None:
+            raise self.SemanticError('Method ' + methodName + ' can\'t be called without object in main!')
+        if parentClass not in self.definedClasses:
+            raise self.SemanticError('Method ' + methodName + ' can\'t be called for variable '
+                                     + node.objectToken.value + ' of type ' + parentClass + '!')
+        methodData = self.definedClasses[parentClass].FindMethodInList(methodName)
+        if methodData == None:
+            raise self.SemanticError('Method does not defined in class ' + parentClass + '!')
+        self.IndexReference(methodData, node.methodToken)
+        self.program.callGraph.AddCall((self.currentClassName, self.currentMethodName), (parentClass, methodName))
+
+        if node.openToken == None:
+            raise node.error
+
+        # argument is passed to method with parameter only
+        self.checkedToken = node.openToken
+        if methodData.paramName != None:
+            if node.argument == None:
+                raise self.SyntaxErrorAt(node.closeToken)
+            self.RValueWithExpectedType(node.argument, methodData.paramType, node.error)
+
+        if node.objectToken != None:
+            node.objectLocation = self.CalculateLocationOfVariableInStackFromTop(node.objectToken.value)
+        if methodData.paramName == None and node.argumentToken != None:
+            # ')' expected
+            raise self.SyntaxErrorAt(node.argumentToken)
+        node.className = parentClass
+        node.method = methodData
+
+        if node.error != None:
+            raise node.error
+
+
+    def BlockStatement(self, node:BlockStatementNode):
+        if node.left == None:
+            raise node.error
+        self.RValueWithExpectedType(node.left, 'int', node.error)
+        if node.compareToken == None:
+            raise node.error
+        if node.right == None:
+            raise node.error
+        self.RValueWithExpectedType(node.right, 'int', node.error)
+        if node.error != None:
+            raise node.error
+
+
+    def PrintStatement(self, node:PrintNode):
+        if node.value == None:
+            raise node.error
+        self.RValueWithExpectedType(node.value, 'int', node.error)
+        if node.error != None:
+            raise node.error
+
+
+    def PrintStringStatement(self, node:PrintStringNode):
+        if node.valueToken == None:
+            raise node.error
+        self.checkedToken = node.valueToken
+        if node.valueToken.type == TokenType.IDENTIFIER:
+            varData = self.localSymbolTable.FindSymbolGlobal(node.valueToken.value)
+            if varData == None:
+                raise self.SemanticError('Variable ' + node.valueToken.value + ' is undefined in method '
+                                         + self.currentMethodName + '!')
+            self.IndexReference(varData, node.valueToken)
+            if varData.type != 'str':
+                raise self.SemanticError('String type expected!')
+            node.label = self.stringLabels.get(varData)
+        else:
+            node.label = self.program.stringPool.Intern(node.valueToken.value[1:-1],
+                                                       (self.currentClassName, self.currentMethodName))
+        if node.error != None:
+            raise node.error
+
+
+    def LValue(self, lvalue:ValueNode, error:YADLError):
+        # checks left value and finds out data of it for code generation
+        if lvalue.valueType == None:
+            raise error
+        self.checkedToken = lvalue.nameToken
+        varName = lvalue.nameToken.value
+        if lvalue.valueType == LValueType.VARIABLE_OF_CURRENT_CLASS:
+            if not self.GetCurrentClass(varName).IsVarInList(varName):
+                    raise self.SemanticError('Variable ' + varName + ' is undefined in class ' + self.currentClassName + '!')
+            self.IndexReference((self.currentClassName, varName), lvalue.nameToken)
+            lvalue.varType = 'int'
+            lvalue.offset = self.definedClasses[self.currentClassName].GetVarOffset(varName)
+            return
+
+        lvalue.symbol = self.localSymbolTable.FindSymbolGlobal(varName)
+        if lvalue.symbol == None:
+            raise self.SemanticError('Variable ' + varName + ' is undefined in method ' + self.currentMethodName + '!')
+        self.IndexReference(lvalue.symbol, lvalue.nameToken)
+        lvalue.varType = lvalue.symbol.type
+        lvalue.isParam = self.localSymbolTable.IsItMethodParamName(varName)
+        if lvalue.valueType == LValueType.OBJECT_WITH_INT_VARIABLE:
+            if lvalue.childToken == None:
+                raise error
+            self.checkedToken = lvalue.childToken
+            lobjectVarName = lvalue.childToken.value
+            if not self.GetObjectClass(varName, lvalue.varType, lobjectVarName).IsVarInList(lobjectVarName):
+                raise self.SemanticError('Variable ' + lobjectVarName + ' is undefined in class ' + lvalue.varType + '!')
+            self.IndexReference((lvalue.varType, lobjectVarName), lvalue.childToken)
+            lvalue.offset = self.definedClasses[lvalue.varType].GetVarOffset(lobjectVarName)
+        if not lvalue.isParam:
+            lvalue.location = self.CalculateLocationOfVariableInStackFromTop(varName)
+
+
+    def RValueWithExpectedType(self, rvalue:ValueNode, expType:str, error:YADLError):
+        # checks right value and its type, finds out data of it for code generation
+        if rvalue.valueType == None:
+            raise error
+        self.checkedToken = rvalue.nameToken
+        varName = rvalue.nameToken.value
+        if rvalue.valueType == RValueType.NUMBER:
+            if expType != 'int':
+                    raise self.SemanticError('Type ' + expType + ' expected! Got type int!')
+            rvalue.varType = 'int'
+            return
+        if rvalue.valueType == RValueType.VARIABLE_OF_CURRENT_CLASS:
+            if not self.GetCurrentClass(varName).IsVarInList(varName):
+                    raise self.SemanticError('Variable ' + varName + ' is undefined in class ' + self.currentClassName + '!')
+            self.IndexReference((self.currentClassName, varName), rvalue.nameToken)
+            if expType != 'int':
+                    raise self.SemanticError('Type ' + expType + ' expected! Got type int!')
+            rvalue.varType = 'int'
+            rvalue.offset = self.definedClasses[self.currentClassName].GetVarOffset(varName)
+            return
+
+        rvalue.symbol = self.localSymbolTable.FindSymbolGlobal(varName)
+        if rvalue.symbol == None:
+            raise self.SemanticError('Variable ' + varName + ' is undefined in method ' + self.currentMethodName + '!')
+        self.IndexReference(rvalue.symbol, rvalue.nameToken)
+        rvalue.varType = rvalue.symbol.type
+        if rvalue.valueType == RValueType.OBJECT_WITH_INT_VARIABLE:
+            if rvalue.childToken == None:
+                raise error
+            self.checkedToken = rvalue.childToken
+            robjectVarName = rvalue.childToken.value
+            if not self.GetObjectClass(varName, rvalue.varType, robjectVarName).IsVarInList(robjectVarName):
+                raise self.SemanticError('Variable ' + robjectVarName + ' is undefined in class ' + rvalue.varType + '!')
+            self.IndexReference((rvalue.varType, robjectVarName), rvalue.childToken)
+            if expType != 'int':
+                raise self.SemanticError('Type ' + expType + ' expected! Got type int!')
+            rvalue.offset = self.definedClasses[rvalue.varType].GetVarOffset(robjectVarName)
+        elif rvalue.varType != expType:
+            raise self.SemanticError('Type ' + expType + ' expected! Got type ' + rvalue.varType + '!')
+        rvalue.isParam = self.localSymbolTable.IsItMethodParamName(varName)
+        if not rvalue.isParam:
+            rvalue.location = self.CalculateLocationOfVariableInStackFromTop(varName)
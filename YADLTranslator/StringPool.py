@@ -0,0 +1,42 @@
+class StringPool(object):
+    """Class that holds strings of data section. Every distinct string is
+    declared once with its own label, all str variables and prints literals
+    with the same contents use this label"""
+    def __init__(self):
+        # string -> label in order of first use
+        self.labelsByString = dict()
+        # string -> set of methods that use it, method is (class name, method name)
+        self.methodsByString = dict()
+        # count of str variables and prints literals
+        self.usesCount = 0
+        # size of declarations if every use had its own declaration
+        self.usesSize = 0
+
+
+    def Intern(self, string:str, method:tuple) -> str:
+        # returns label of string used in method, string is contents of literal without quotes
+        label = self.labelsByString.get(string)
+        if label == None:
+            label = '_string_' + str(len(self.labelsByString) + 1)
+            self.labelsByString[string] = label
+            self.methodsByString[string] = set()
+        self.methodsByString[string].add(method)
+        self.usesCount += 1
+        self.usesSize += len(StringPool.GetDeclaration(label, string))
+        return label
+
+
+    @staticmethod
+    def GetDeclaration(label:str, string:str) -> str:
+        return label + ': db "' + string + '", 0xA, 0 \n'
+
+
+    def GetDeclarations(self, liveMethods:set = None) -> list:
+        # returns declarations of strings used by liveMethods (of all strings if it is None)
+        return [StringPool.GetDeclaration(label, string) for string, label in self.labelsByString.items()
+                if liveMethods == None or not self.methodsByString[string].isdisjoint(liveMethods)]
+
+
+    def GetSavedSize(self) -> int:
+        # returns size in chars of declarations that aren't emitted because of sharing of labels
+        return self.usesSize - sum(len(declaration) for declaration in self.GetDeclarations())
@@ -0,0 +1,78 @@
+import unittest
+from StringPool import StringPool
+from SyntaxAnalyzerTest import Analyze
+
+MAIN = (None, 'main')
+
+
+class Test_StringPool(unittest.TestCase):
+    def test_equal_strings_share_label(self):
+        stringPool = StringPool()
+        label = stringPool.Intern('hello', MAIN)
+        self.assertEqual(label, '_string_1')
+        self.assertEqual(stringPool.Intern('hello', ('C', 'Show')), label)
+        self.assertEqual(stringPool.Intern('hello', MAIN), label)
+        self.assertEqual(stringPool.GetDeclarations(), ['_string_1: db "hello", 0xA, 0 \n'])
+        self.assertEqual(stringPool.usesCount, 3)
+
+
+    def test_distinct_strings_have_own_labels(self):
+        stringPool = StringPool()
+        labels = [stringPool.Intern(string, MAIN) for string in ('a', 'b', 'a b', 'A', 'a')]
+        self.assertEqual(labels, ['_string_1', '_string_2', '_string_3', '_string_4', '_string_1'])
+        self.assertEqual(stringPool.GetDeclarations(), ['_string_1: db "a", 0xA, 0 \n',
+                                                        '_string_2: db "b", 0xA, 0 \n',
+                                                        '_string_3: db "a b", 0xA, 0 \n',
+                                                        '_string_4: db "A", 0xA, 0 \n'])
+
+
+    def test_saved_size(self):
+        stringPool = StringPool()
+        self.assertEqual(stringPool.GetSavedSize(), 0)
+        stringPool.Intern('hello', MAIN)
+        stringPool.Intern('bye', MAIN)
+        self.assertEqual(stringPool.GetSavedSize(), 0)
+        stringPool.Intern('hello', MAIN)
+        stringPool.Intern('hello', ('C', 'Show'))
+        declarationSize = len('_string_1: db "hello", 0xA, 0 \n')
+        self.assertEqual(stringPool.GetSavedSize(), 2 * declarationSize)
+        self.assertEqual(stringPool.usesSize, 3 * declarationSize + len('_string_2: db "bye", 0xA, 0 \n'))
+
+
+    def test_strings_of_live_methods(self):
+        stringPool = StringPool()
+        stringPool.Intern('main', MAIN)
+        stringPool.Intern('dead', ('C', 'Unused'))
+        stringPool.Intern('both', ('C', 'Unused'))
+        stringPool.Intern('both', ('C', 'Show'))
+        self.assertEqual(stringPool.GetDeclarations({MAIN, ('C', 'Show')}),
+                         ['_string_1: db "main", 0xA, 0 \n', '_string_3: db "both", 0xA, 0 \n'])
+
+
+    def test_code_uses_one_label_for_equal_literals(self):
+        code = Analyze('''class C {
+  int f;
+  Show() {
+    prints('hello');
+    str t = 'world';
+  }
+}
+main() {
+  str s = 'hello';
+  C c = C.CreateInstance();
+  c.Show();
+  prints(s);
+  prints('hello');
+  prints('world');
+}
+''').BuildCode()
+        dataSection = code[:code.index('section .text')]
+        self.assertEqual(dataSection.count('db "hello"'), 1)
+        self.assertEqual(dataSection.count('db "world"'), 1)
+        self.assertIn('_string_1: db "hello", 0xA, 0 \n', dataSection)
+        self.assertEqual(code.count('PUSH DWORD _string_1'), 3)
+        self.assertEqual(code.count('PUSH DWORD _string_2'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
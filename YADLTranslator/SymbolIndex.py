@@ -0,0 +1,213 @@
+import sys
+import zlib
+import struct
+from enum import Enum
+from array import array
+from bisect import bisect_right
+from Token import Token
+
+
+class SymbolKind(Enum):
+    """Kind of declaration that identifier is resolved to"""
+    LOCAL = 1                       # SymbolData of local variable
+    PARAM = 2                       # method parameter
+    FIELD = 3                       # variable of class (YADLClassData.vars)
+    METHOD = 4                      # method of class (YADLClassData.methods)
+    CLASS = 5                       # type name
+
+
+# SymbolKind by its value, so kind code from array is converted without Enum call
+_SYMBOL_KINDS = {kind.value: kind for kind in SymbolKind}
+
+
+class SymbolReference(object):
+    """Identifier token of source file and data of declaration it is resolved
+    to. Declaration token is resolved to itself"""
+    __slots__ = ('line', 'pos', 'length', 'kind', 'name', 'type', 'className', 'methodName',
+                 'declarationLine', 'declarationPos')
+
+    def __init__(self, line:int, pos:int, length:int, kind:SymbolKind, name:str, type:str = None,
+                 className:str = None, methodName:str = None, declarationLine:int = None, declarationPos:int = None):
+        self.line = line
+        self.pos = pos
+        self.length = length
+        self.kind = kind
+        self.name = name
+        # type of variable, type of parameter of method, None for class
+        self.type = type
+        # class of field or method, class of method with local or parameter (None for main)
+        self.className = className
+        # method with local or parameter
+        self.methodName = methodName
+        self.declarationLine = declarationLine
+        self.declarationPos = declarationPos
+
+
+class SymbolIndex(object):
+    """Sorted index of identifier tokens of source file by their positions,
+    SemanticAnalyzer fills it while it resolves names. Tokens don't overlap,
+    so token at cursor position is found by binary search in O(log n).
+    Index is encoded to bytes, so editor can keep it between requests"""
+
+    MAGIC = b'YADS'
+    FORMAT_VERSION = 1
+    # magic, format version, references count, strings count, size of strings
+    # table, CRC32 of data after header
+    HEADER = struct.Struct('<4sHIIII')
+    # index of None in strings table
+    NO_STRING = 0xFFFFFFFF
+    # type code and count of items per reference of arrays of references in
+    # order of data: lines, positions, lengths, declaration lines, declaration
+    # positions, indexes of 4 strings (name, type, class, method), kinds
+    REFERENCE_ARRAYS = (('i', 1), ('i', 1), ('i', 1), ('i', 1), ('i', 1), ('I', 4), ('B', 1))
+    # size in bytes of one reference in arrays
+    REFERENCE_SIZE = sum(array(typeCode).itemsize * count for typeCode, count in REFERENCE_ARRAYS)
+
+    def __init__(self):
+        # references sorted by (line, pos) after Finish
+        self.references = list()
+        self.starts = list()
+        # declaration (SymbolData, YADLMethodData, YADLClassData or
+        # (class name, field name)) -> reference of its token
+        self.declarations = dict()
+
+
+    def AddDeclaration(self, declaration, token:Token, kind:SymbolKind, type:str = None,
+                       className:str = None, methodName:str = None):
+        reference = SymbolReference(token.line, token.pos, len(token.value), kind, token.value, type,
+                                    className, methodName, token.line, token.pos)
+        self.declarations[declaration] = reference
+        self.references.append(reference)
+
+
+    def AddReference(self, declaration, token:Token):
+        # token that uses name of declaration added before
+        declarationReference = self.declarations.get(declaration)
+        if declarationReference == None:
+            return
+        self.references.append(SymbolReference(token.line, token.pos, len(token.value), declarationReference.kind,
+                               declarationReference.name, declarationReference.type,
+                               declarationReference.className, declarationReference.methodName,
+                               declarationReference.declarationLine, declarationReference.declarationPos))
+
+
+    def Finish(self):
+        # use this function when analysis ends: sorts references by position,
+        # the same token added twice is kept once
+        self.references.sort(key=lambda reference: (reference.line, reference.pos))
+        references = list()
+        starts = list()
+        for reference in self.references:
+            start = (reference.line, reference.pos)
+            if starts and starts[-1] == start:
+                continue
+            references.append(reference)
+            starts.append(start)
+        self.references = references
+        self.starts = starts
+        self.declarations.clear()
+
+
+    def Find(self, line:int, pos:int) -> SymbolReference:
+        # returns reference of identifier at cursor position or None
+        i = bisect_right(self.starts, (line, pos)) - 1
+        if i < 0:
+            return None
+        reference = self.references[i]
+        if reference.line != line or pos >= reference.pos + reference.length:
+            return None
+        return reference
+
+
+    def FindDeclaration(self, line:int, pos:int) -> SymbolReference:
+        # returns reference of declaration token of identifier at cursor position or None
+        reference = self.Find(line, pos)
+        if reference == None or reference.declarationLine == None:
+            return None
+        return self.Find(reference.declarationLine, reference.declarationPos)
+
+
+    def Encode(self) -> bytes:
+        lines = array('i')
+        positions = array('i')
+        lengths = array('i')
+        kinds = array('B')
+        declarationLines = array('i')
+        declarationPositions = array('i')
+        stringIndexes = array('I')
+        indexByString = dict()
+        strings = list()
+        for reference in self.references:
+            lines.append(reference.line)
+            positions.append(reference.pos)
+            lengths.append(reference.length)
+            kinds.append(reference.kind.value)
+            declarationLines.append(reference.declarationLine)
+            declarationPositions.append(reference.declarationPos)
+            for string in (reference.name, reference.type, reference.className, reference.methodName):
+                if string == None:
+                    stringIndexes.append(SymbolIndex.NO_STRING)
+                    continue
+                stringIndex = indexByString.get(string)
+                if stringIndex == None:
+                    stringIndex = len(strings)
+                    indexByString[string] = stringIndex
+                    strings.append(string.encode('utf-8', 'surrogatepass'))
+                stringIndexes.append(stringIndex)
+        stringLengths = array('I', [len(string) for string in strings])
+        stringsTable = b''.join(strings)
+        arrays = (stringLengths, lines, positions, lengths, declarationLines, declarationPositions, stringIndexes, kinds)
+        if sys.byteorder == 'big':
+            # index is always little-endian
+            for indexArray in arrays:
+                indexArray.byteswap()
+        data = stringLengths.tobytes() + stringsTable + b''.join(indexArray.tobytes() for indexArray in arrays[1:])
+        header = SymbolIndex.HEADER.pack(SymbolIndex.MAGIC, SymbolIndex.FORMAT_VERSION, len(self.references),
+                                         len(strings), len(stringsTable), zlib.crc32(data))
+        return header + data
+
+
+    @staticmethod
+    def Decode(data:bytes):
+        # returns SymbolIndex or None if data isn't valid index
+        header = SymbolIndex.HEADER
+        if len(data) < header.size:
+            return None
+        magic, formatVersion, referencesCount, stringsCount, stringsTableSize, checksum = header.unpack_from(data)
+        if magic != SymbolIndex.MAGIC or formatVersion != SymbolIndex.FORMAT_VERSION:
+            return None
+        data = memoryview(data)[header.size:]
+        dataSize = array('I').itemsize * stringsCount + stringsTableSize + SymbolIndex.REFERENCE_SIZE * referencesCount
+        if len(data) != dataSize or zlib.crc32(data) != checksum:
+            return None
+        arrays = list()
+        start = 0
+        for typeCode, count in [('I', stringsCount), (None, stringsTableSize)] \
+                + [(typeCode, count * referencesCount) for typeCode, count in SymbolIndex.REFERENCE_ARRAYS]:
+            if typeCode == None:
+                stringsTable = data[start:start+count]
+                start += count
+                continue
+            indexArray = array(typeCode)
+            indexArray.frombytes(data[start:start+count*indexArray.itemsize])
+            if sys.byteorder == 'big':
+                indexArray.byteswap()
+            arrays.append(indexArray)
+            start += count * indexArray.itemsize
+        stringLengths, lines, positions, lengths, declarationLines, declarationPositions, stringIndexes, kinds = arrays
+        try:
+            strings = list()
+            start = 0
+            for length in stringLengths:
+                strings.append(sys.intern(str(stringsTable[start:start+length], 'utf-8', 'surrogatepass')))
+                start += length
+            index = SymbolIndex()
+            for i in range(referencesCount):
+                referenceStrings = [None if stringIndex == SymbolIndex.NO_STRING else strings[stringIndex]
+                                    for stringIndex in stringIndexes[4*i:4*i+4]]
+                index.references.append(SymbolReference(lines[i], positions[i], lengths[i], _SYMBOL_KINDS[kinds[i]],
+                                        *referenceStrings, declarationLines[i], declarationPositions[i]))
+                index.starts.append((lines[i], positions[i]))
+        except (KeyError, IndexError, UnicodeDecodeError):
+            return None
+        return index
@@ -0,0 +1,97 @@
+import unittest
+from SymbolIndex import SymbolKind
+from SymbolIndex import SymbolIndex
+from SyntaxAnalyzerTest import Analyze
+
+SOURCE = '''class Box {
+  int size;
+  Grow(int n) {
+    this.size = n;
+  }
+}
+main() {
+  int a = 1;
+  while (a < 2) { int a = 5; print(a); }
+  print(a);
+  Box b = Box.CreateInstance();
+  b.Grow(a);
+}
+'''
+
+
+def BuildIndex(srcFile:str) -> SymbolIndex:
+    return Analyze(srcFile, checkOnly=True, buildSymbolIndex=True).symbolIndex
+
+
+def GetFields(reference) -> tuple:
+    return tuple(getattr(reference, name) for name in type(reference).__slots__)
+
+
+class Test_SymbolIndex(unittest.TestCase):
+    def test_lookup_between_tokens(self):
+        index = BuildIndex(SOURCE)
+        # 'Box' of class definition takes positions 8, 9 and 10 of line 1
+        self.assertIsNone(index.Find(1, 1))
+        self.assertIsNone(index.Find(1, 7))
+        for pos in (8, 9, 10):
+            self.assertEqual(index.Find(1, pos).name, 'Box')
+        self.assertIsNone(index.Find(1, 11))
+        self.assertIsNone(index.Find(2, 100))
+        # '.' between object and method
+        self.assertEqual(index.Find(12, 3).name, 'b')
+        self.assertIsNone(index.Find(12, 4))
+        self.assertEqual(index.Find(12, 6).kind, SymbolKind.METHOD)
+        self.assertIsNone(index.Find(0, 0))
+        self.assertIsNone(index.Find(100, 1))
+
+
+    def test_shadowed_locals(self):
+        index = BuildIndex(SOURCE)
+        outer = (8, 8)
+        inner = (9, 27)
+        for line, pos, declaration in ((9, 11, outer), (9, 27, inner), (9, 43, inner), (10, 10, outer),
+                                        (12, 12, outer)):
+            reference = index.Find(line, pos)
+            self.assertEqual((reference.kind, reference.name), (SymbolKind.LOCAL, 'a'))
+            self.assertEqual((reference.declarationLine, reference.declarationPos), declaration)
+            declarationReference = index.FindDeclaration(line, pos)
+            self.assertEqual((declarationReference.line, declarationReference.pos), declaration)
+        param = index.Find(4, 19)
+        self.assertEqual((param.kind, param.className, param.methodName), (SymbolKind.PARAM, 'Box', 'Grow'))
+
+
+    def test_encode_decode_round_trip(self):
+        index = BuildIndex(SOURCE + '\n' + "class Тест {\n  int поле;\n  Show() {\n    print(this.поле);\n  }\n}\n")
+        data = index.Encode()
+        decoded = SymbolIndex.Decode(data)
+        self.assertEqual([GetFields(reference) for reference in decoded.references],
+                         [GetFields(reference) for reference in index.references])
+        self.assertEqual(decoded.starts, index.starts)
+        self.assertEqual(decoded.Encode(), data)
+        empty = SymbolIndex.Decode(SymbolIndex().Encode())
+        self.assertEqual(empty.references, [])
+        self.assertIsNone(empty.Find(1, 1))
+
+
+    def test_invalid_data_is_rejected(self):
+        data = BuildIndex(SOURCE).Encode()
+        headerSize = SymbolIndex.HEADER.size
+        corrupted = bytearray(data)
+        corrupted[headerSize + 10] ^= 0xFF
+        self.assertIsNone(SymbolIndex.Decode(bytes(corrupted)))
+        self.assertIsNone(SymbolIndex.Decode(data[:-1]))
+        self.assertIsNone(SymbolIndex.Decode(data + b'\0'))
+        self.assertIsNone(SymbolIndex.Decode(b'XXXX' + data[4:]))
+        self.assertIsNone(SymbolIndex.Decode(data[:headerSize - 1]))
+
+
+    def test_size_of_reference(self):
+        data = BuildIndex(SOURCE).Encode()
+        index = SymbolIndex.Decode(data)
+        # reference with the same strings doesn't change strings table
+        index.references.append(index.references[-1])
+        self.assertEqual(len(index.Encode()) - len(data), SymbolIndex.REFERENCE_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,25 +1,54 @@
 class SymbolData(object):
     """Class that hold data about local symbol that stored in SymbolTable"""
-    def __init__(self, name:str, type:str):
+    __slots__ = ('name', 'type', 'size', 'location')
+
+    def __init__(self, name:str, type:str, size:int = 0):
         self.name = name
         self.type = type
+        # size in bytes of variable in stack
+        self.size = size
+        # distance from EBP to variable in bytes, set by SymbolTable.AddSymbol.
+        # Method parameter is not in stack frame of method, so it has None
+        self.location = None
+
+
+class SymbolScope(object):
+    """Class that holds symbols declared in one scope: method body or
+    built in scope such as cycle or if-statement"""
+    __slots__ = ('symbolsData', 'symbolsSize')
+
+    def __init__(self):
+        # name -> SymbolData in order of declaration
+        self.symbolsData = dict()
+        # size of symbols in this scope
+        self.symbolsSize = 0
 
 
 class SymbolTable(object):
     """Class that represent symbol table that contains data about local variables
-    such as name and type. This type is used for method scope. Also it supports
-    double linked list symbol tables for situations when method has another built 
-    in scope such as cycles or if-statements """
+    such as name and type. This type is used for method scope. It keeps stack of
+    scopes for situations when method has another built in scope such as cycles
+    or if-statements, and one dict from name to stack of symbols with this name
+    (inner scope symbol shadows outer one), so lookup, declaration, adding and
+    removing of scope don't depend on count of symbols and scopes"""
     def __init__(self):
-        self.symbolsData = list()
-        self.nextScopeTable = None
-        self.prevTable = None
+        self.scopes = [SymbolScope()]
+        # name -> list of symbols with this name from outer to inner scope
+        self.symbolsByName = dict()
         self.paramSymbol = None
-        
+        # size of symbols in all scopes
+        self.localsSize = 0
+
 
     def AddSymbol(self, s:SymbolData):
-        lastTable = self.GetLastTable()
-        lastTable.symbolsData.append(s)
+        # variables are placed in stack one after another in order of declaration,
+        # so location is known when symbol is added and it never changes
+        lastScope = self.scopes[-1]
+        lastScope.symbolsData[s.name] = s
+        lastScope.symbolsSize += s.size
+        self.symbolsByName.setdefault(s.name, []).append(s)
+        s.location = 4 + self.localsSize
+        self.localsSize += s.size
 
 
     def AddParamSymbol(self, s:SymbolData):
@@ -27,57 +56,50 @@ class SymbolTable(object):
 
 
     def AddNewScopeTable(self):
-        lastTable = self.GetLastTable()
-        lastTable.nextScopeTable = SymbolTable()
-        lastTable.nextScopeTable.prevTable = lastTable
+        self.scopes.append(SymbolScope())
 
 
     def RemoveLastScopeTable(self):
-        lastTable = self.GetLastTable()
-        lastTable.prevTable.nextScopeTable = None
-        lastTable.prevTable = None
-        del lastTable
+        lastScope = self.scopes.pop()
+        self.localsSize -= lastScope.symbolsSize
+        for name in lastScope.symbolsData:
+            shadowedSymbols = self.symbolsByName[name]
+            shadowedSymbols.pop()
+            if not shadowedSymbols:
+                del self.symbolsByName[name]
+
 
+    def GetLastTable(self) -> SymbolScope:
+        return self.scopes[-1]
 
-    def GetLastTable(self):
-        lastTable = self
-        while lastTable.nextScopeTable != None:
-            lastTable = lastTable.nextScopeTable
-        return lastTable
+
+    def IsInNestedScope(self) -> bool:
+        return len(self.scopes) > 1
 
 
     def FindSymbolInLastTable(self, name:str) -> SymbolData:
-        lastTable = self.GetLastTable()
-        if lastTable.paramSymbol != None and lastTable.paramSymbol.name == name:
-            return lastTable.paramSymbol
-        for symbol in lastTable.symbolsData:
-            if symbol.name == name:
-                return symbol
-        return None
+        if len(self.scopes) == 1 and self.paramSymbol != None and self.paramSymbol.name == name:
+            return self.paramSymbol
+        return self.scopes[-1].symbolsData.get(name)
 
 
     def FindSymbolGlobal(self, name) -> SymbolData:
         if self.paramSymbol != None and self.paramSymbol.name == name:
             return self.paramSymbol
-        # recursive upper search
-        lastTable = self.GetLastTable()
-        for symbol in lastTable.symbolsData:
-            if symbol.name == name:
-                return symbol
-        while lastTable.prevTable != None:
-            lastTable = lastTable.prevTable
-            for symbol in lastTable.symbolsData:
-                if symbol.name == name:
-                    return symbol
-        return None
+        shadowedSymbols = self.symbolsByName.get(name)
+        if shadowedSymbols == None:
+            return None
+        return shadowedSymbols[-1]
 
 
     def Clear(self):
         # use this function when method definition starts
-        # when every scope ends it cleans up last Symbol Table
-        # so when method ends this table contains only one Table
-        self.symbolsData.clear()
+        # when every scope ends it cleans up last scope
+        # so when method ends this table contains only one scope
+        self.scopes = [SymbolScope()]
+        self.symbolsByName.clear()
         self.paramSymbol = None
+        self.localsSize = 0
 
 
     def IsNameFreeInScope(self, name:str) -> bool:
@@ -91,4 +113,4 @@ class SymbolTable(object):
     def IsItMethodParamName(self, name:str) -> bool:
         if self.paramSymbol != None and name == self.paramSymbol.name:
             return True
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,101 @@
+import unittest
+from SymbolTable import SymbolData
+from SymbolTable import SymbolTable
+from SyntaxAnalyzerTest import Analyze
+from SyntaxAnalyzerTest import Walk
+
+
+class Test_SymbolTable(unittest.TestCase):
+    def test_locations_follow_declarations(self):
+        symbolTable = SymbolTable()
+        a = SymbolData('a', 'int', 4)
+        s = SymbolData('s', 'str', 0)
+        p = SymbolData('p', 'Pair', 8)
+        for symbol in (a, s, p):
+            symbolTable.AddSymbol(symbol)
+        symbolTable.AddNewScopeTable()
+        b = SymbolData('b', 'int', 4)
+        symbolTable.AddSymbol(b)
+        self.assertEqual(symbolTable.localsSize, 16)
+        symbolTable.RemoveLastScopeTable()
+        # variable declared after scope takes place of its variables
+        c = SymbolData('c', 'int', 4)
+        symbolTable.AddSymbol(c)
+        self.assertEqual([symbol.location for symbol in (a, s, p, b, c)], [4, 8, 8, 16, 16])
+        self.assertEqual(symbolTable.localsSize, 16)
+
+
+    def test_inner_symbol_shadows_outer(self):
+        symbolTable = SymbolTable()
+        outer = SymbolData('a', 'int', 4)
+        symbolTable.AddSymbol(outer)
+        symbolTable.AddNewScopeTable()
+        self.assertIsNone(symbolTable.FindSymbolInLastTable('a'))
+        self.assertTrue(symbolTable.IsNameFreeInScope('a'))
+        inner = SymbolData('a', 'Pair', 8)
+        symbolTable.AddSymbol(inner)
+        self.assertIs(symbolTable.FindSymbolGlobal('a'), inner)
+        self.assertIs(symbolTable.FindSymbolInLastTable('a'), inner)
+        self.assertFalse(symbolTable.IsNameFreeInScope('a'))
+
+
+    def test_names_are_restored_on_scope_exit(self):
+        symbolTable = SymbolTable()
+        outer = SymbolData('a', 'int', 4)
+        symbolTable.AddSymbol(outer)
+        for depth in range(3):
+            symbolTable.AddNewScopeTable()
+            symbolTable.AddSymbol(SymbolData('a', 'int', 4))
+            symbolTable.AddSymbol(SymbolData('b' + str(depth), 'int', 4))
+        for depth in reversed(range(3)):
+            self.assertIsNotNone(symbolTable.FindSymbolGlobal('b' + str(depth)))
+            symbolTable.RemoveLastScopeTable()
+            self.assertIsNone(symbolTable.FindSymbolGlobal('b' + str(depth)))
+        self.assertIs(symbolTable.FindSymbolGlobal('a'), outer)
+        self.assertFalse(symbolTable.IsInNestedScope())
+        self.assertEqual(symbolTable.symbolsByName, {'a': [outer]})
+        self.assertEqual(symbolTable.localsSize, 4)
+
+
+    def test_param_is_found_before_locals(self):
+        symbolTable = SymbolTable()
+        param = SymbolData('p', 'int')
+        symbolTable.AddParamSymbol(param)
+        self.assertIs(symbolTable.FindSymbolInLastTable('p'), param)
+        self.assertFalse(symbolTable.IsNameFreeInScope('p'))
+        symbolTable.AddNewScopeTable()
+        # parameter name can't be declared in nested scope too
+        self.assertIsNone(symbolTable.FindSymbolInLastTable('p'))
+        self.assertFalse(symbolTable.IsNameFreeInScope('p'))
+        self.assertIs(symbolTable.FindSymbolGlobal('p'), param)
+        symbolTable.Clear()
+        self.assertIsNone(symbolTable.FindSymbolGlobal('p'))
+
+
+    def test_locations_match_generated_offsets(self):
+        # offsets from EBP of code generated by original translator for this source
+        program = Analyze('''class Pair {
+  int x;
+  int y;
+  Get() {
+    print(this.y);
+  }
+}
+main() {
+  int a = 1;
+  str s = 'text';
+  Pair p = Pair.CreateInstance();
+  while (a < 2) { int b = a; a = b; }
+  int c = a;
+  print(c);
+  print(p.y);
+}
+''').program
+        locations = {statement.symbol.name: statement.symbol.location
+                     for statement in Walk(program.main.statements) if hasattr(statement, 'symbol')}
+        self.assertEqual(locations, {'a': 4, 's': 8, 'p': 8, 'b': 16, 'c': 16})
+        self.assertEqual(program.main.localsSize, 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,72 +1,194 @@
+import time
 from Token import TokenType
 from Token import Token
-from YADLSyntaxStructures import YADLClassData
-from YADLSyntaxStructures import YADLMethodData
-from SymbolTable import SymbolTable
-from SymbolTable import SymbolData
-from VariableTypes import LValue
+from TokenBuffer import TokenBuffer
 from VariableTypes import LValueType
-from VariableTypes import RValue
 from VariableTypes import RValueType
+from Diagnostics import YADLError
+from Diagnostics import YADLSyntaxError
+from Diagnostics import YADLSemanticError
+from Diagnostics import AnalysisError
+from SyntaxTree import ValueNode
+from SyntaxTree import InvalidStatementNode
+from SyntaxTree import IntVarInitNode
+from SyntaxTree import StrVarInitNode
+from SyntaxTree import ObjectVarInitNode
+from SyntaxTree import AssigningNode
+from SyntaxTree import MethodCallNode
+from SyntaxTree import IfNode
+from SyntaxTree import WhileNode
+from SyntaxTree import PrintNode
+from SyntaxTree import PrintStringNode
+from SyntaxTree import FieldNode
+from SyntaxTree import MethodNode
+from SyntaxTree import ClassNode
+from SyntaxTree import ProgramNode
+from SemanticAnalyzer import SemanticAnalyzer
+from SymbolIndex import SymbolIndex
+from CodeGenerator import CodeGenerator
 
 
 class SyntaxAnalyzer(object):
     """class that performs syntax analysis of YADL source file based on tokens
-    from Parser and makes syntax based translation"""
-    def __init__(self, tokens:list):
-        # tokens got from Parser
-        self.tokens = tokens 
-        # current token index in tokens list
-        self.currTokenIndex = -1
-        # dictionary that contains YADLClassData for every defined in src class
-        self.definedClasses = dict()
-        # Symbol Table for methods
-        self.localSymbolTable = SymbolTable()
-        # vars that hold current values
-        self.currentClassName = str()
-        self.currentMethodName = str()
-        # dict that contains classes. Classe contains methods. Method contains asm code
-        self.listingsForClasses = dict()
-        # variable for creating unique labels
-        self.originalIdNum = 0
-        # for strings declarations
-        self.dataSection = 'section .data \n'     \
-                + "NumFormat: db '%d', 0xA, 0 \n" \
-    
-
-    def Analyze(self):
-        # main method; uses rule START -> CLASSES_DEFS MAIN_METHOD_DEF
+    from Parser and makes syntax based translation. Analysis has three phases:
+    parsing of tokens to syntax tree (this class), checks of the tree
+    (SemanticAnalyzer) and generation of asm code from it (CodeGenerator)"""
+    def __init__(self, tokens, workersCount:int = 0, checkOnly:bool = False, buildSymbolIndex:bool = False,
+                 removeDeadMethods:bool = True, foldIdenticalCode:bool = True, optimizePeephole:bool = True,
+                 optimizationLevel:int = 2, verifyPasses:bool = False, measureDeadMethods:bool = False):
+        # tokens got from Parser: list or generator in stream mode
+        self.tokenBuffer = TokenBuffer(tokens)
+        # count of worker processes that generate code of classes
+        self.workersCount = workersCount
+        # source file is only checked for errors, code isn't generated
+        self.checkOnly = checkOnly
+        # index of identifiers by position for editor, it is built by semantic checks
+        self.symbolIndex = SymbolIndex() if buildSymbolIndex else None
+        # code isn't generated for methods that can't be called from main
+        self.removeDeadMethods = removeDeadMethods
+        # method with the same code as method before is alias of it
+        self.foldIdenticalCode = foldIdenticalCode
+        # CodeFolder of the last generated code, for statistics
+        self.codeFolder = None
+        # instructions of methods are rewritten by peephole rules
+        self.optimizePeephole = optimizePeephole
+        # PeepholeOptimizer of the last generated code, for statistics
+        self.peepholeOptimizer = None
+        # optimization passes of this level and lower run over code (see PassManager),
+        # code is checked after every pass if verifyPasses
+        self.optimizationLevel = optimizationLevel
+        self.verifyPasses = verifyPasses
+        # PassManager of the last generated code, for timings of passes
+        self.passManager = None
+        # size of code without dead methods is compared with size of code with them
+        # while code is generated, for statistics (see GetDeadMethodsStats)
+        self.measureDeadMethods = measureDeadMethods
+        self.deadMethodsStats = None
+        # names of classes parsed so far, object creation is parsed with them
+        self.classNames = set()
+        # syntax tree of source file
+        self.program = None
+        self.semanticAnalyzer = None
+        self.codeGenerator = None
+        # phase name -> time of phase in seconds
+        self.phaseTimings = dict()
+        # LL(1) table of statement rules: the first token (type and keyword) selects
+        # rule or table that selects it by type of the next token and so on
+        self.statementRules = {
+            (TokenType.KEYWORD, 'int'): self.VarInit,
+            (TokenType.KEYWORD, 'str'): self.VarInit,
+            (TokenType.KEYWORD, 'if'): self.IfStatement,
+            (TokenType.KEYWORD, 'while'): self.WhileStatement,
+            (TokenType.KEYWORD, 'print'): self.PrintStatement,
+            (TokenType.KEYWORD, 'prints'): self.PrintStringStatement,
+            # this.var =
+            (TokenType.KEYWORD, 'this'): {TokenType.ACCESS: {TokenType.IDENTIFIER: {TokenType.ASSIGN: self.Assigning}}},
+            (TokenType.IDENTIFIER, None): {
+                TokenType.IDENTIFIER: self.VarInit,                 # Type obj =
+                TokenType.ASSIGN: self.Assigning,                   # var =
+                TokenType.O_ROUND_BRACKET: self.MethodCall,         # Method(
+                TokenType.ACCESS: {TokenType.IDENTIFIER: {
+                    TokenType.ASSIGN: self.Assigning,               # obj.var =
+                    TokenType.O_ROUND_BRACKET: self.MethodCall      # obj.Method(
+                }}
+            }
+        }
+
+
+    def Analyze(self, outFile = None):
+        # main method: parses tokens to syntax tree, checks it and generates code
+        # (if not checkOnly). If text stream outFile is given, code is written to
+        # it while it is generated and isn't kept. Raises AnalysisError with all
+        # found errors, then nothing is written
+        startTime = time.perf_counter()
+        self.program = self.ParseProgram()
+        parseEndTime = time.perf_counter()
+        self.phaseTimings['parse'] = parseEndTime - startTime
+
+        self.semanticAnalyzer = SemanticAnalyzer(self.program, self.symbolIndex)
+        self.semanticAnalyzer.Check()
+        semanticEndTime = time.perf_counter()
+        self.phaseTimings['semantic'] = semanticEndTime - parseEndTime
+        if self.semanticAnalyzer.diagnostics.HasErrors():
+            raise AnalysisError(self.semanticAnalyzer.diagnostics)
+        if self.checkOnly:
+            return
+
+        codeGenerator = CodeGenerator(self.program, self.semanticAnalyzer.definedClasses, self.workersCount,
+                                      self.removeDeadMethods, self.foldIdenticalCode, self.optimizePeephole,
+                                      self.optimizationLevel, self.verifyPasses, self.measureDeadMethods)
+        if outFile == None:
+            codeGenerator.Generate()
+            self.codeGenerator = codeGenerator
+        else:
+            codeGenerator.WriteCode(outFile)
+        self.codeFolder = codeGenerator.codeFolder
+        self.peepholeOptimizer = codeGenerator.peepholeOptimizer
+        self.passManager = codeGenerator.passManager
+        if self.measureDeadMethods:
+            size = codeGenerator.GetCodeSize()
+            self.deadMethodsStats = (codeGenerator.methodsCount, codeGenerator.deadMethodsCount,
+                                     size + codeGenerator.deadMethodsSize, size)
+        self.phaseTimings['codegen'] = time.perf_counter() - semanticEndTime
+
+
+    def BuildCode(self) -> str:
+        if self.codeGenerator == None:
+            raise Exception('Code is not generated! Source file should be analyzed without checkOnly and outFile.')
+        return self.codeGenerator.BuildCode()
+
+
+    def GetDeadMethodsStats(self) -> tuple:
+        # returns count of methods, count of dead methods and size of code in chars
+        # with all methods (estimate, see CodeGenerator.MeasureDeadMethods) and
+        # without dead ones. Use it after Analyze with measureDeadMethods
+        if self.deadMethodsStats == None:
+            raise Exception('Dead methods are not measured! Source file should be analyzed with measureDeadMethods.')
+        return self.deadMethodsStats
+
+
+    def ParseProgram(self) -> ProgramNode:
+        # uses rule START -> CLASSES_DEFS MAIN_METHOD_DEF
+        program = ProgramNode()
+        self.ClassDefs(program)
+        program.main = MethodNode()
         try:
-            self.ClassDefs()
-            self.MainDef()
-        except Exception as ex:
-            raise Exception(str(ex) + 'Unexpected syntax token at line: ' + str(self.tokens[self.currTokenIndex].line) \
-                + ' and position: ' + str(self.tokens[self.currTokenIndex].pos))
+            self.MainDef(program.main)
+        except YADLError as ex:
+            program.main.error = ex
+        return program
+
+
+    def SyntaxError(self, message:str = '') -> YADLSyntaxError:
+        # returns error at the current token
+        line, pos = self.GetCurrentPosition()
+        return YADLSyntaxError(message, line, pos)
 
 
-    def GetOriginalIdNum(self) -> int:
-        # return original number for asm labels
-        self.originalIdNum += 1
-        return self.originalIdNum
+    def SemanticError(self, message:str) -> YADLSemanticError:
+        # returns error at the current token
+        line, pos = self.GetCurrentPosition()
+        return YADLSemanticError(message, line, pos)
+
+
+    def GetCurrentPosition(self):
+        # returns line and position of the current token, None and None for file without tokens
+        if self.GetCurrentToken() == None or self.tokenBuffer.IsEnd() and self.tokenBuffer.index == 0:
+            return None, None
+        return self.GetCurrentToken().line, self.GetCurrentToken().pos
 
 
     def GetNextToken(self) -> Token:
-        if self.currTokenIndex < len(self.tokens)-1:
-            self.currTokenIndex += 1
-            return self.tokens[self.currTokenIndex]
-        else:
-            raise Exception()
+        # returns EOF token at the end of tokens
+        return self.tokenBuffer.Next()
 
 
     def PeekNextToken(self) -> Token:
-        if self.currTokenIndex < len(self.tokens)-1:
-            return self.tokens[self.currTokenIndex+1]
-        else:
-            raise Exception()
+        return self.tokenBuffer.Peek()
 
 
     def GetCurrentToken(self) -> Token:
-        return self.tokens[self.currTokenIndex]
+        return self.tokenBuffer.GetCurrent()
 
 
     def Match(self, token:Token, type:TokenType, value:str = None):
@@ -78,877 +200,518 @@ class SyntaxAnalyzer(object):
             return False
 
 
-    def ClassDefs(self):
+    def ClassDefs(self, program:ProgramNode):
         # CLASS_DEFS → CLASS_DEF CLASS_DEFS | λ
-        try:
-            while True:
-                t = self.PeekNextToken()
-                if self.Match(t, TokenType.KEYWORD, 'class'):
-                   self.ClassDef()
-                else:
-                    return
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def ClassDef(self):
-        try:
-            if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'class') \
-                    or not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-                raise Exception()
-            
-            # if class with such name already defined
-            className = self.GetCurrentToken().value
-            if self.IsClassDefined(className):
-                raise Exception('Class with ' + className + ' has been already defined!')
-
-            self.definedClasses[className] = YADLClassData(className)
-            self.currentClassName = className
-            
-            if not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
-                raise Exception()
-            
-            self.listingsForClasses[self.currentClassName] = dict()
-
-            self.FieldDefs()
-            self.MethodDefs()
-                
-            if not self.Match(self.GetNextToken(), TokenType.C_FIGURE_BRACKET):
-                raise Exception()            
-
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def IsClassDefined(self, className):
-        return className in self.definedClasses
-
-
-    def FieldDefs(self):
-        try:
-            while True:
-                t = self.PeekNextToken()
-                if self.Match(t, TokenType.KEYWORD, 'int'):
-                    self.FieldDef()
-                elif len(self.definedClasses[self.currentClassName].vars) > 0:
-                    return
-                else:
-                    raise Exception('Class variable definitinon expected! Class should contain at least 1 variable definition!')
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def FieldDef(self):
-        try:
-            if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'int') \
-                    or not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-                raise Exception
-            
-            fieldName = self.GetCurrentToken().value
-            # check if field name free in current class
-            if fieldName in self.definedClasses[self.currentClassName].vars:
-                raise Exception('Class variable ' + fieldName + ' has been already defined!')
-            
-            self.definedClasses[self.currentClassName].vars.append(fieldName)
-            if not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
-                raise Exception
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def MethodDefs(self):
-        try:
-            while True:
-                t = self.PeekNextToken()
-                if self.Match(t, TokenType.IDENTIFIER):
-                    self.MethodDef()
-                elif len(self.definedClasses[self.currentClassName].methods) > 0:
-                    return
-                else:
-                    raise Exception('Class method definitinon expected! Class should contain at least 1 method definition!')
-        
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def MethodDef(self):
-        try:
-            if not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-                raise Exception()
-
-            methodName = self.GetCurrentToken().value
-
-            if not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
-                raise Exception()
-            
-            methodParamType = None
-            methodParamName = None
-            # if method with parameter defined
-            if self.Match(self.GetNextToken(), TokenType.IDENTIFIER) \
-                    or self.Match(self.GetCurrentToken(), TokenType.KEYWORD, 'int'): 
-                methodParamType = self.GetCurrentToken().value
-                if not (methodParamType in self.definedClasses.keys() or methodParamType == 'int'):
-                    raise Exception('Type ' + methodParamType + ' not defined above!')
-                if not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-                    raise Exception()
-                methodParamName = self.GetCurrentToken().value
-                if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET):
-                    raise Exception()
-            elif not self.Match(self.GetCurrentToken(), TokenType.C_ROUND_BRACKET):
-                raise Exception()
-
-            if not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
-                raise Exception()
-
-            if self.definedClasses[self.currentClassName].FindMethodInList(methodName) != None:
-                raise Exception('Method with name ' + methodName + ' has been already defined!')
-     
-            self.definedClasses[self.currentClassName].methods\
-                    .append(YADLMethodData(methodName, methodParamType, methodParamName))
-            
-            self.currentMethodName = methodName
-
-            self.localSymbolTable.Clear()
-            if methodParamName != None:
-                self.localSymbolTable.AddParamSymbol(SymbolData(methodParamName, methodParamType))
-            # create new stack frame
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] = str()
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                            '_' + self.currentClassName + '_' + self.currentMethodName + ':\n' \
-                            + 'PUSH EBP \n' \
-                            + 'MOV EBP, ESP \n' 
-            
-            self.Statements()
-
-            # cleans up the stack
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'ADD ESP, ' + str(self.GetLocalVarsSize()) + '\n'
-            # restore EBP
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                            'MOV ESP, EBP \n'   \
-                            + 'POP EBP \n'      \
-                            + 'RET \n'
-            if not self.Match(self.GetNextToken(), TokenType.C_FIGURE_BRACKET):
-                raise Exception()
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def Statements(self):
-        try:
-            self.Statement()  # method can't be empty
-            while(True):
-                if not self.Match(self.PeekNextToken(), TokenType.C_FIGURE_BRACKET):
-                    self.Statement()
-                else:
-                    return
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def Statement(self):
-        try:
-            # find out rule type with help of next Token
-            if self.PredictVarInit():
-                self.VarInit()
-            elif self.PredictAssigning():
-                self.Assigning()
-            elif self.PredictMethodCall():
-                self.MethodCall()
-            elif self.Match(self.PeekNextToken(), TokenType.KEYWORD, 'if'):
-                self.IfStatement()
-            elif self.Match(self.PeekNextToken(), TokenType.KEYWORD, 'while'):
-                self.WhileStatement()
-            elif self.Match(self.PeekNextToken(), TokenType.KEYWORD, 'print'):
-                self.PrintStatement()
-            elif self.Match(self.PeekNextToken(), TokenType.KEYWORD, 'prints'):
-                self.PrintStringStatement()
+        while True:
+            t = self.PeekNextToken()
+            if self.Match(t, TokenType.KEYWORD, 'class'):
+                classNode = ClassNode()
+                program.classes.append(classNode)
+                try:
+                    self.ClassDef(classNode)
+                except YADLError as ex:
+                    classNode.error = ex
+                    self.SkipClass()
             else:
-                raise Exception()
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    # PREDICT methods peek next tokens to find out if their sequence match to specified rules
-    def PredictMethodCall(self) -> bool:
-        i = self.currTokenIndex
-        if i + 4 <= len(self.tokens)-1 \
-                and self.tokens[i+1].type == TokenType.IDENTIFIER \
-                and self.tokens[i+2].type == TokenType.ACCESS \
-                and self.tokens[i+3].type == TokenType.IDENTIFIER \
-                and self.tokens[i+4].type == TokenType.O_ROUND_BRACKET:
-            return True
-        if i + 2 <= len(self.tokens)-1 \
-                and self.tokens[i+1].type == TokenType.IDENTIFIER \
-                and self.tokens[i+2].type == TokenType.O_ROUND_BRACKET:
-            return True
-        return False
-
-
-    def PredictAssigning(self) -> bool:
-        i = self.currTokenIndex
-        if i + 2 <= len(self.tokens)-1 \
-                and self.tokens[i+1].type == TokenType.IDENTIFIER \
-                and self.tokens[i+2].type == TokenType.ASSIGN:
-            return True
-        elif i + 4 <= len(self.tokens)-1 \
-                and self.tokens[i+1].type == TokenType.IDENTIFIER \
-                and self.tokens[i+2].type == TokenType.ACCESS \
-                and self.tokens[i+3].type == TokenType.IDENTIFIER \
-                and self.tokens[i+4].type == TokenType.ASSIGN:
-            return True
-        elif i + 4 <= len(self.tokens)-1 \
-                and self.tokens[i+1].value == 'this' \
-                and self.tokens[i+2].type == TokenType.ACCESS \
-                and self.tokens[i+3].type == TokenType.IDENTIFIER \
-                and self.tokens[i+4].type == TokenType.ASSIGN:
-            return True
-        return False
+                return
 
 
-    def PredictVarInit(self) -> bool:
-        i = self.currTokenIndex
-        if i + 1 <= len(self.tokens)-1 \
-                and self.tokens[i+1].value == 'int':
-            return True
-        if i + 1 <= len(self.tokens)-1 \
-                and self.tokens[i+1].value == 'str':
-            return True
-        if i + 2 <= len(self.tokens)-1 \
-                and self.tokens[i+1].type == TokenType.IDENTIFIER \
-                and self.tokens[i+2].type == TokenType.IDENTIFIER:
-            return True
-        return False
-
-
-    def CalculateLocationOfVariableInStackFromTop(self, varName:str):
-        # calculates distance between variable varName in stack and 
-        # start of stack frame (in EBP register) in bytes.
-        # Uses to get or set value of a variable, ex. [ebp - 8]
-        localTable = self.localSymbolTable
-        data = localTable.FindSymbolGlobal(varName)
-        if data == None:
-            raise Exception('Unexpected variable!')
-        dwLength = 4 # length in double words (4 bytes)
-        for symbolData in localTable.symbolsData:
-            if symbolData == data:
-                return dwLength
-            else:
-                if symbolData.type == 'int':
-                    dwLength += 4
-                elif symbolData.type == 'str':
-                    continue
-                else: 
-                    dwLength += 4 * len(self.definedClasses[symbolData.type].vars)
-        while localTable.nextScopeTable != None:
-            localTable = localTable.nextScopeTable
-            data = localTable.FindSymbolGlobal(varName)
-            if data == None:
-                raise Exception('Unexpected variable!')
-            for symbolData in localTable.symbolsData:
-                if symbolData == data:
-                    return dwLength
-                else:
-                    if symbolData.type == 'int':
-                        dwLength += 4
-                    elif symbolData.type == 'str':
-                        continue
-                    else: 
-                        dwLength += 4 * len(self.definedClasses[symbolData.type].vars)
-
-
-    def VarInit(self):
-        try:
+    def SkipClass(self):
+        # skips tokens of class with error up to the next class or main method
+        while True:
+            t = self.PeekNextToken()
+            if self.Match(t, TokenType.EOF) or self.Match(t, TokenType.KEYWORD, 'class') \
+                    or self.Match(t, TokenType.KEYWORD, 'main'):
+                return
             self.GetNextToken()
-            if self.Match(self.GetCurrentToken(), TokenType.KEYWORD, 'int'):
-                # int var init
-                localVarName = self.GetNextToken().value
-                # check if var name is available
-                if not self.localSymbolTable.IsNameFreeInScope(localVarName):
-                    raise Exception('Variable with name ' + localVarName + ' has been already defined in local scope!')
-                elif localVarName in self.definedClasses.keys():
-                    raise Exception('Variable with name ' + localVarName + " can't be declared, because this name has been already occupied by class!")
-                
-                self.localSymbolTable.AddSymbol(SymbolData(localVarName, 'int'))
-
-                if not self.Match(self.GetNextToken(), TokenType.ASSIGN):
-                    raise Exception()
-
-                rvalue = self.GetRValueWithExpectedType('int')
-                self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                                        'SUB ESP, 4 \n' \
-                                        + rvalue.codeWithAddressOrValueInEAX \
-                                        + 'MOV [ESP], EAX \n'
-
-            elif self.Match(self.GetCurrentToken(), TokenType.IDENTIFIER):
-                # local complex var init
-                objType = self.GetCurrentToken().value
-                if objType not in self.definedClasses.keys():
-                    raise Exception('Undefined type ' + objType + '!')
 
-                if not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-                    raise Exception()
-
-                objName = self.GetCurrentToken().value
-                if not self.localSymbolTable.IsNameFreeInScope(objName):
-                    raise Exception('Variable with name ' + objName + ' has been already defined!')
-                elif objName in self.definedClasses.keys():
-                    raise Exception('Variable with name ' + objName + " can't be declared, because this name has been already occupied by class!")
-                
-                self.localSymbolTable.AddSymbol(SymbolData(objName, objType))
-
-                if not self.Match(self.GetNextToken(), TokenType.ASSIGN) \
-                        or not self.Match(self.PeekNextToken(), TokenType.IDENTIFIER):
-                    # peek because self.GetRValue will read next token and it expects IDENTIFIER
-                    raise Exception()
-
-                rightName = self.PeekNextToken().value
-                # peek because self.GetRValue will read next token and expect IDENTIFIER
-                if rightName in self.definedClasses.keys() \
-                        and self.Match(self.GetNextToken(), TokenType.IDENTIFIER) \
-                        and self.Match(self.GetNextToken(), TokenType.ACCESS) \
-                        and self.Match(self.GetNextToken(), TokenType.KEYWORD, 'CreateInstance') \
-                        and self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET) \
-                        and self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET):
-                    # constructor call
-                    # check types
-                    if objType != rightName:
-                        raise Exception('Can\'t cast ' + objType + ' to ' + rightName + '!')
-                    # allocate space in stack and set 0
-                    for i in range(0, len(self.definedClasses[objType].vars)):
-                        self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                            'SUB ESP, 4 \n' \
-                            + 'MOV [ESP], DWORD 0 \n'
-                else:
-                    rvalue = self.GetRValueWithExpectedType(objType)
-                    # copy all variables of the right var
-                    objLocation = self.CalculateLocationOfVariableInStackFromTop(objName)
-                    rightLocation = self.CalculateLocationOfVariableInStackFromTop(rightName)
-                    # EAX contains address of first variable of object
-                    for i in range(0, len(self.definedClasses[objType].vars)):
-                        self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                                'MOV EDX, [EAX - ' + str(rightLocation + i*4) + '] \n' \
-                                + 'MOV [EBP - ' + str(objLocation + i*4) + '], EDX \n'
-
-            elif self.Match(self.GetCurrentToken(), TokenType.KEYWORD, 'str'):
-                # str var init
-                localVarName = self.GetNextToken().value
-                # check if var name is available
-                if not self.localSymbolTable.IsNameFreeInScope(localVarName):
-                    raise Exception('Variable with name ' + localVarName + ' has been already defined in local scope!')
-                elif localVarName in self.definedClasses.keys():
-                    raise Exception('Variable with name ' + localVarName + " can't be declared, because this name has been already occupied by class!")
-                
-                self.localSymbolTable.AddSymbol(SymbolData(localVarName, 'str'))
-
-                if not self.Match(self.GetNextToken(), TokenType.ASSIGN) \
-                        or not self.Match(self.GetNextToken(), TokenType.STRING_LITERAL):
-                    raise Exception()
-
-                self.dataSection += str(self.currentClassName) + '_' + self.currentMethodName + '_' + localVarName \
-                            + ': db "' + self.GetCurrentToken().value[1:-1] + '", 0xA, 0 \n'
-
-            if not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
-                raise Exception()
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def Assigning(self):
-        try:
-            lvalue = self.GetLValue()
-
-            if not self.Match(self.GetNextToken(), TokenType.ASSIGN):
-                raise Exception()
 
-            if lvalue.lvalueType == LValueType.OBJECT_WITH_INT_VARIABLE:
-                lvalueType = 'int'
+    def ClassDef(self, classNode:ClassNode):
+        if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'class') \
+                or not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
+            raise self.SyntaxError()
+
+        classNode.nameToken = self.GetCurrentToken()
+        # class defined twice is skipped, SemanticAnalyzer reports it
+        className = classNode.nameToken.value
+        if className in self.classNames:
+            raise self.SemanticError('Class with ' + className + ' has been already defined!')
+        self.classNames.add(className)
+
+        if not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
+            raise self.SyntaxError()
+
+        classNode.openToken = self.GetCurrentToken()
+        self.FieldDefs(classNode)
+        self.MethodDefs(classNode)
+
+        if not self.Match(self.GetNextToken(), TokenType.C_FIGURE_BRACKET):
+            raise self.SyntaxError()
+
+
+    def FieldDefs(self, classNode:ClassNode):
+        namedFieldsCount = 0
+        while True:
+            t = self.PeekNextToken()
+            if self.Match(t, TokenType.KEYWORD, 'int'):
+                field = FieldNode()
+                classNode.fields.append(field)
+                try:
+                    self.FieldDef(field)
+                except YADLError as ex:
+                    field.error = ex
+                    self.SkipFieldDef()
+                if field.nameToken != None:
+                    namedFieldsCount += 1
+            elif self.Match(t, TokenType.EOF):
+                raise self.SyntaxError()
+            elif namedFieldsCount > 0:
+                return
             else:
-                lvalueType = lvalue.varType
-
-            if self.localSymbolTable.IsItMethodParamName(lvalue.varName) and lvalue.varType == 'int':
-                raise Exception('It is prohibited to set value to method parameter of type <int>!')
-
-            rvalue = self.GetRValueWithExpectedType(lvalueType)
-            if lvalueType == 'int':
-                self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                            lvalue.codeWithAddressInEBX \
-                            + rvalue.codeWithAddressOrValueInEAX \
-                            + 'MOV [EBX], EAX \n'
+                raise self.SyntaxError('Class variable definitinon expected! Class should contain at least 1 variable definition!')
+
+
+    def SkipFieldDef(self):
+        # skips tokens of field definition with error up to ';' or start of method
+        if self.Match(self.GetCurrentToken(), TokenType.SEMICOLON):
+            return
+        if self.Match(self.GetCurrentToken(), TokenType.IDENTIFIER) \
+                and self.Match(self.PeekNextToken(), TokenType.O_ROUND_BRACKET) \
+                or self.Match(self.GetCurrentToken(), TokenType.C_FIGURE_BRACKET):
+            # start of method or end of class after field without ';'
+            self.tokenBuffer.Unread()
+            return
+        while True:
+            t = self.PeekNextToken()
+            if self.Match(t, TokenType.EOF) or self.Match(t, TokenType.C_FIGURE_BRACKET) \
+                    or self.Match(t, TokenType.IDENTIFIER) \
+                    and self.Match(self.tokenBuffer.Peek(2), TokenType.O_ROUND_BRACKET):
+                return
+            if self.Match(self.GetNextToken(), TokenType.SEMICOLON):
+                return
+
+
+    def FieldDef(self, field:FieldNode):
+        if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'int') \
+                or not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
+            raise self.SyntaxError()
+
+        field.nameToken = self.GetCurrentToken()
+        if not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
+            raise self.SyntaxError()
+
+
+    def MethodDefs(self, classNode:ClassNode):
+        parsedMethodsCount = 0
+        while True:
+            t = self.PeekNextToken()
+            if self.Match(t, TokenType.IDENTIFIER):
+                method = MethodNode()
+                classNode.methods.append(method)
+                try:
+                    self.MethodDef(method)
+                except YADLError as ex:
+                    method.error = ex
+                    self.SkipMethodDef()
+                if method.openToken != None:
+                    parsedMethodsCount += 1
+            elif self.Match(t, TokenType.EOF):
+                raise self.SyntaxError()
+            elif parsedMethodsCount > 0:
+                # methods with errors in header aren't defined, so SemanticAnalyzer
+                # checks that class has method at this token
+                classNode.methodsEndToken = self.GetCurrentToken()
+                return
             else:
-                leftLocation = self.CalculateLocationOfVariableInStackFromTop(lvalue.varName)
-                rightLocation = self.CalculateLocationOfVariableInStackFromTop(rvalue.varName)
-                # EAX contains address of first variable of object
-                for i in range(0, len(self.definedClasses[lvalue.varType].vars)):
-                    self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                            'MOV EDX, [EAX - ' + str(rightLocation + i*4) + '] \n' \
-                            + 'MOV [EBP - ' + str(leftLocation + i*4) + '], EDX \n'
+                raise self.SyntaxError('Class method definitinon expected! Class should contain at least 1 method definition!')
+
+
+    def SkipMethodDef(self):
+        # skips tokens of method with error in its header up to '}' of its body.
+        # Errors in body are handled by Statements
+        depth = 0
+        if self.Match(self.GetCurrentToken(), TokenType.O_FIGURE_BRACKET):
+            depth = 1
+        elif self.Match(self.GetCurrentToken(), TokenType.C_FIGURE_BRACKET):
+            # end of class after method header
+            self.tokenBuffer.Unread()
+            return
+        while True:
+            t = self.PeekNextToken()
+            if self.Match(t, TokenType.EOF) or depth == 0 and self.Match(t, TokenType.C_FIGURE_BRACKET) \
+                    or self.Match(t, TokenType.KEYWORD, 'class') or self.Match(t, TokenType.KEYWORD, 'main'):
+                # end of class
+                return
+            self.GetNextToken()
+            if self.Match(t, TokenType.O_FIGURE_BRACKET):
+                depth += 1
+            elif self.Match(t, TokenType.C_FIGURE_BRACKET):
+                depth -= 1
+                if depth == 0:
+                    return
 
-            if not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
-                    raise Exception()
-        except Exception as ex:
-            raise Exception(str(ex))
 
+    def MethodDef(self, method:MethodNode):
+        if not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
+            raise self.SyntaxError()
 
-    def MethodCall(self):
-        try:
-            self.GetNextToken() # TokenType.IDENTIFIER                
-            if self.Match(self.PeekNextToken(), TokenType.ACCESS):
-                # method defined in another class
-                isMethodOfCurrentClass = False
-
-                objName = self.GetCurrentToken().value
-                objData = self.localSymbolTable.FindSymbolGlobal(objName)
-                if objName == None:
-                    raise Exception('Variable ' + objName + ' undefined in method ' + self.currentMethodName + '!')
-                parentClass = objData.type
-
-                self.GetNextToken() # TokenType.ACCESS
-                self.GetNextToken() # TokenType.IDENTIFIER
-            else:
-                # next token O_ROUND_BRACKET, method definded in current class
-                isMethodOfCurrentClass = True
-                parentClass = self.currentClassName
-
-            methodName = self.GetCurrentToken().value
-            methodData = self.definedClasses[parentClass].FindMethodInList(methodName)
-            if methodData == None:
-                raise Exception('Method does not defined in class ' + parentClass + '!')
-                    
-            if not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
-                raise Exception()
-
-            if methodData.paramName != None:
-                rvalue = self.GetRValueWithExpectedType(methodData.paramType)
-                self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        rvalue.codeWithAddressOrValueInEAX \
-                        + 'PUSH EAX \n' 
-
-            if isMethodOfCurrentClass:
-                self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'PUSH DWORD [EBP + 8] \n' 
-            else:
-                self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'MOV EBX, EBP \n' \
-                        + 'SUB EBX, ' + str(self.CalculateLocationOfVariableInStackFromTop(objName)) + '\n' \
-                        + 'PUSH EBX \n'
+        method.nameToken = self.GetCurrentToken()
 
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'CALL ' + '_' + parentClass + '_' + methodName + '\n'
+        if not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
+            raise self.SyntaxError()
 
-            if methodData.paramName == None:
-                self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'ADD ESP, 4 \n'
+        # if method with parameter defined
+        if self.Match(self.GetNextToken(), TokenType.IDENTIFIER) \
+                or self.Match(self.GetCurrentToken(), TokenType.KEYWORD, 'int'):
+            method.paramTypeToken = self.GetCurrentToken()
+            if not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
+                raise self.SyntaxError()
+            method.paramNameToken = self.GetCurrentToken()
+            if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET):
+                raise self.SyntaxError()
+        elif not self.Match(self.GetCurrentToken(), TokenType.C_ROUND_BRACKET):
+            raise self.SyntaxError()
+
+        if not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
+            raise self.SyntaxError()
+
+        method.openToken = self.GetCurrentToken()
+        method.statements = list()
+        self.Statements(method.statements)
+
+        if not self.Match(self.GetNextToken(), TokenType.C_FIGURE_BRACKET):
+            raise self.SyntaxError()
+
+
+    def Statements(self, statements:list):
+        # parses statements of method body to statements list. Blocks of if and
+        # while statements aren't parsed recursively: their rules parse block
+        # header and return list for statements of the block. Outer list is
+        # kept in stack of open blocks up to '}' of the block, so depth of
+        # nesting doesn't depend on Python stack. Statement with error keeps
+        # its parsed part and error, its tokens are skipped
+        openBlocks = list()
+        isBlockEmpty = True  # method and blocks can't be empty
+        while(True):
+            if isBlockEmpty or not self.Match(self.PeekNextToken(), TokenType.C_FIGURE_BRACKET):
+                startIndex = self.tokenBuffer.index
+                statementsCount = len(statements)
+                try:
+                    block = self.Statement(statements)
+                except YADLError as ex:
+                    if len(statements) == statementsCount:
+                        statements.append(InvalidStatementNode())
+                    statements[-1].error = ex
+                    block = self.SkipStatement(startIndex)
+                    statements[-1].body = block
+                    if self.Match(self.PeekNextToken(), TokenType.EOF):
+                        return
+                isBlockEmpty = block != None
+                if block != None:
+                    openBlocks.append(statements)
+                    statements = block
+            elif len(openBlocks) > 0:
+                self.GetNextToken()
+                statements = openBlocks.pop()
             else:
-                self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'ADD ESP, 8 \n'
-
-            if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
-                    or not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
-                raise Exception()
-            
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def IfStatement(self):
-        try:
-            if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'if') \
-                    or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
-                raise Exception()
-
-            leftRValue = self.GetRValueWithExpectedType('int')
-            
-            # detect compare sign
-            self.GetNextToken()
-            if not (self.Match(self.GetCurrentToken(), TokenType.EQUAL) \
-                    or self.Match(self.GetCurrentToken(), TokenType.GREATER) \
-                    or self.Match(self.GetCurrentToken(), TokenType.GREATER_EQUAL) \
-                    or self.Match(self.GetCurrentToken(), TokenType.LESS) \
-                    or self.Match(self.GetCurrentToken(), TokenType.LESS_EQUAL)):
-                raise Exception()
-            cmpType = self.GetCurrentToken().type
-
-            rightRValue = self.GetRValueWithExpectedType('int')
-
-            if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
-                    or not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
-                raise Exception()
-
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        rightRValue.codeWithAddressOrValueInEAX \
-                        + 'MOV EBX, EAX \n' \
-                        + leftRValue.codeWithAddressOrValueInEAX \
-                        + 'CMP EAX, EBX \n'
-
-            cmpInstr = str()
-            if cmpType == TokenType.EQUAL:
-                cmpInstr = 'E'
-            elif cmpType == TokenType.GREATER:
-                cmpInstr = 'G'
-            elif cmpType == TokenType.GREATER_EQUAL:
-                cmpInstr = 'GE'
-            elif cmpType == TokenType.LESS:
-                cmpInstr = 'L'
-            elif cmpType == TokenType.LESS_EQUAL:
-                cmpInstr = 'LE'
-
-            jmpLabel = '_else_statement_' + str(self.GetOriginalIdNum())
-            # jump to else statement (code after if statements)
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'jn' + cmpInstr + ' ' + jmpLabel + '\n'   
-
-            self.localSymbolTable.AddNewScopeTable()
-
-            self.Statements()
-
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'ADD ESP, ' + str(len(self.localSymbolTable.GetLastTable().symbolsData)) + '\n'
-            self.localSymbolTable.RemoveLastScopeTable()
-
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        jmpLabel + ': \n'
-
-            if not self.Match(self.GetNextToken(), TokenType.C_FIGURE_BRACKET):
-                raise Exception
-
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def WhileStatement(self):
-        try:
-            if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'while') \
-                    or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
-                raise Exception()
-
-            leftRValue = self.GetRValueWithExpectedType('int')
-            
-            # detect compare sign
-            self.GetNextToken()
-            if not (self.Match(self.GetCurrentToken(), TokenType.EQUAL) \
-                    or self.Match(self.GetCurrentToken(), TokenType.GREATER) \
-                    or self.Match(self.GetCurrentToken(), TokenType.GREATER_EQUAL) \
-                    or self.Match(self.GetCurrentToken(), TokenType.LESS) \
-                    or self.Match(self.GetCurrentToken(), TokenType.LESS_EQUAL)):
-                raise Exception()
-            cmpType = self.GetCurrentToken().type
-
-            rightRValue = self.GetRValueWithExpectedType('int')
-
-            if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
-                    or not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
-                raise Exception()
-
-            whileConditionLabel = '_while_condition_' + str(self.GetOriginalIdNum())
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        whileConditionLabel + ':'\
-                        + rightRValue.codeWithAddressOrValueInEAX \
-                        + 'MOV EBX, EAX \n' \
-                        + leftRValue.codeWithAddressOrValueInEAX \
-                        + 'CMP EAX, EBX \n'
-
-            cmpInstr = str()
-            if cmpType == TokenType.EQUAL:
-                cmpInstr = 'E'
-            elif cmpType == TokenType.GREATER:
-                cmpInstr = 'G'
-            elif cmpType == TokenType.GREATER_EQUAL:
-                cmpInstr = 'GE'
-            elif cmpType == TokenType.LESS:
-                cmpInstr = 'L'
-            elif cmpType == TokenType.LESS_EQUAL:
-                cmpInstr = 'LE'
-
-            whileExitLabel = '_while_exit_' + str(self.GetOriginalIdNum())
-            # jump to else statement (code after if statements)
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'jn' + cmpInstr + ' ' + whileExitLabel + '\n'   
-
-            self.localSymbolTable.AddNewScopeTable()
-
-            self.Statements()
-
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'ADD ESP, ' + str(len(self.localSymbolTable.GetLastTable().symbolsData)) + '\n'
-
-            self.localSymbolTable.RemoveLastScopeTable()
-
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'JMP ' + whileConditionLabel + '\n' \
-                        + whileExitLabel + ': \n'
-
-            if not self.Match(self.GetNextToken(), TokenType.C_FIGURE_BRACKET):
-                raise Exception
-
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def PrintStatement(self):
-        try:
-            if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'print') \
-                    or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
-                raise Exception()
-
-            rvalue = self.GetRValueWithExpectedType('int')
-
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                rvalue.codeWithAddressOrValueInEAX \
-                + 'PUSH EAX \n' \
-                + 'CALL _Print \n' \
-                + 'ADD ESP, 4 \n'
+                return
+
+
+    def SkipStatement(self, startIndex:int) -> list:
+        # skips tokens of statement with error up to ';' or '}' of its block.
+        # Block that starts in skipped statement is parsed as its body, list
+        # for statements of the block is returned like from Statement
+        t = self.GetCurrentToken()
+        isTokenOfStatement = self.tokenBuffer.index > startIndex
+        while True:
+            if isTokenOfStatement and self.Match(t, TokenType.SEMICOLON):
+                return None
+            if isTokenOfStatement and self.Match(t, TokenType.C_FIGURE_BRACKET):
+                # '}' ends block, so it is returned to tokens
+                self.tokenBuffer.Unread()
+                return None
+            if isTokenOfStatement and self.Match(t, TokenType.O_FIGURE_BRACKET):
+                return list()
+            if self.Match(self.PeekNextToken(), TokenType.EOF):
+                return None
+            t = self.GetNextToken()
+            isTokenOfStatement = True
+
+
+    def Statement(self, statements:list) -> list:
+        # adds node of statement to statements; returns list for statements
+        # of block for if and while statements, otherwise None
+        rule = self.SelectStatementRule()
+        if rule == None:
+            raise self.SyntaxError()
+        return rule(statements)
+
+
+    def SelectStatementRule(self):
+        # finds out rule of next statement with statements table; returns None
+        # if next tokens don't start any statement
+        token = self.tokenBuffer.Peek()
+        if token.type == TokenType.KEYWORD:
+            rule = self.statementRules.get((TokenType.KEYWORD, token.value))
+        else:
+            rule = self.statementRules.get((token.type, None))
+        distance = 1
+        while type(rule) is dict:
+            distance += 1
+            rule = rule.get(self.tokenBuffer.Peek(distance).type)
+        return rule
+
+
+    def VarInit(self, statements:list):
+        # node is added to statements before its tokens are parsed, so node of
+        # statement with error keeps parsed part of it
+        self.GetNextToken()
+        if self.Match(self.GetCurrentToken(), TokenType.KEYWORD, 'int'):
+            # int var init
+            node = IntVarInitNode()
+            statements.append(node)
+            node.nameToken = self.GetNextToken()
 
-            if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
-                    or not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
-                raise Exception()
-        except Exception as ex:
-            raise Exception(str(ex))
+            if not self.Match(self.GetNextToken(), TokenType.ASSIGN):
+                raise self.SyntaxError()
 
+            node.value = ValueNode()
+            self.GetRValue(node.value)
 
-    def PrintStringStatement(self):
-        try:
-            if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'prints') \
-                    or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
-                raise Exception()
+        elif self.Match(self.GetCurrentToken(), TokenType.IDENTIFIER):
+            # local complex var init
+            node = ObjectVarInitNode()
+            statements.append(node)
+            node.typeToken = self.GetCurrentToken()
 
-            self.GetNextToken()
-            if self.Match(self.GetCurrentToken(), TokenType.IDENTIFIER):
-                varName = self.GetCurrentToken().value
-                varData = self.localSymbolTable.FindSymbolGlobal(varName)
-                if varData.type != 'str':
-                    raise Exception('String type expected!')
-                strIdentifier = str(self.currentClassName) + '_' + self.currentMethodName + '_' + varName
-            elif self.Match(self.GetCurrentToken(), TokenType.STRING_LITERAL):
-                strIdentifier = str(self.currentClassName) + '_' + self.currentMethodName + '_' \
-                        + str(self.GetOriginalIdNum())
-                self.dataSection += strIdentifier + ': db "' + self.GetCurrentToken().value[1:-1] \
-                        + '", 0xA, 0 \n'
+            if not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
+                raise self.SyntaxError()
+
+            node.nameToken = self.GetCurrentToken()
+
+            if not self.Match(self.GetNextToken(), TokenType.ASSIGN) \
+                    or not self.Match(self.PeekNextToken(), TokenType.IDENTIFIER):
+                # peek because self.GetRValue will read next token and it expects IDENTIFIER
+                raise self.SyntaxError()
+
+            node.rightToken = self.PeekNextToken()
+            if node.rightToken.value in self.classNames \
+                    and self.Match(self.GetNextToken(), TokenType.IDENTIFIER) \
+                    and self.Match(self.GetNextToken(), TokenType.ACCESS) \
+                    and self.Match(self.GetNextToken(), TokenType.KEYWORD, 'CreateInstance') \
+                    and self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET) \
+                    and self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET):
+                # constructor call
+                node.constructorEndToken = self.GetCurrentToken()
             else:
-                raise Exception('String type expected!')
+                node.value = ValueNode()
+                self.GetRValue(node.value)
+
+        elif self.Match(self.GetCurrentToken(), TokenType.KEYWORD, 'str'):
+            # str var init
+            node = StrVarInitNode()
+            statements.append(node)
+            node.nameToken = self.GetNextToken()
+
+            if not self.Match(self.GetNextToken(), TokenType.ASSIGN) \
+                    or not self.Match(self.GetNextToken(), TokenType.STRING_LITERAL):
+                raise self.SyntaxError()
+
+            node.stringToken = self.GetCurrentToken()
+
+        if not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
+            raise self.SyntaxError()
+
+
+    def Assigning(self, statements:list):
+        node = AssigningNode()
+        statements.append(node)
+        node.left = ValueNode()
+        self.GetLValue(node.left)
+
+        if not self.Match(self.GetNextToken(), TokenType.ASSIGN):
+            raise self.SyntaxError()
+
+        node.assignToken = self.GetCurrentToken()
+        node.value = ValueNode()
+        self.GetRValue(node.value)
+
+        if not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
+                raise self.SyntaxError()
+
+
+    def MethodCall(self, statements:list):
+        node = MethodCallNode()
+        statements.append(node)
+        self.GetNextToken() # TokenType.IDENTIFIER
+        if self.Match(self.PeekNextToken(), TokenType.ACCESS):
+            # method defined in another class
+            node.objectToken = self.GetCurrentToken()
+            self.GetNextToken() # TokenType.ACCESS
+            self.GetNextToken() # TokenType.IDENTIFIER
+        node.methodToken = self.GetCurrentToken()
+
+        if not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
+            raise self.SyntaxError()
+
+        node.openToken = self.GetCurrentToken()
+        # argument is checked with parameter of method by SemanticAnalyzer
+        if not self.Match(self.PeekNextToken(), TokenType.C_ROUND_BRACKET):
+            node.argumentToken = self.PeekNextToken()
+            node.argument = ValueNode()
+            self.GetRValue(node.argument)
+
+        if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET):
+            raise self.SyntaxError()
+        node.closeToken = self.GetCurrentToken()
+        if not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
+            raise self.SyntaxError()
+
+
+    def IfStatement(self, statements:list) -> list:
+        node = IfNode()
+        statements.append(node)
+        if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'if') \
+                or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
+            raise self.SyntaxError()
+
+        self.ConditionAndBlock(node)
+        # statements of the block are parsed by Statements
+        return node.body
+
+
+    def WhileStatement(self, statements:list) -> list:
+        node = WhileNode()
+        statements.append(node)
+        if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'while') \
+                or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
+            raise self.SyntaxError()
+
+        self.ConditionAndBlock(node)
+        # statements of the block are parsed by Statements
+        return node.body
+
+
+    def ConditionAndBlock(self, node):
+        # parses condition of if or while statement up to '{' of its block
+        node.left = ValueNode()
+        self.GetRValue(node.left)
+
+        # detect compare sign
+        self.GetNextToken()
+        if not (self.Match(self.GetCurrentToken(), TokenType.EQUAL) \
+                or self.Match(self.GetCurrentToken(), TokenType.GREATER) \
+                or self.Match(self.GetCurrentToken(), TokenType.GREATER_EQUAL) \
+                or self.Match(self.GetCurrentToken(), TokenType.LESS) \
+                or self.Match(self.GetCurrentToken(), TokenType.LESS_EQUAL)):
+            raise self.SyntaxError()
+        node.compareToken = self.GetCurrentToken()
+
+        node.right = ValueNode()
+        self.GetRValue(node.right)
+
+        if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
+                or not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
+            raise self.SyntaxError()
+        node.body = list()
+
+
+    def PrintStatement(self, statements:list):
+        node = PrintNode()
+        statements.append(node)
+        if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'print') \
+                or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
+            raise self.SyntaxError()
+
+        node.value = ValueNode()
+        self.GetRValue(node.value)
+
+        if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
+                or not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
+            raise self.SyntaxError()
+
+
+    def PrintStringStatement(self, statements:list):
+        node = PrintStringNode()
+        statements.append(node)
+        if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'prints') \
+                or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET):
+            raise self.SyntaxError()
+
+        self.GetNextToken()
+        if self.Match(self.GetCurrentToken(), TokenType.IDENTIFIER) \
+                or self.Match(self.GetCurrentToken(), TokenType.STRING_LITERAL):
+            node.valueToken = self.GetCurrentToken()
+        elif self.Match(self.GetCurrentToken(), TokenType.EOF):
+            raise self.SyntaxError()
+        else:
+            raise self.SemanticError('String type expected!')
 
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'PUSH DWORD ' + strIdentifier + '\n' \
-                        + 'CALL _PrintString \n' \
-                        + 'ADD ESP, 4 \n'
+        if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
+                or not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
+            raise self.SyntaxError()
 
-            if not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
-                    or not self.Match(self.GetNextToken(), TokenType.SEMICOLON):
-                raise Exception()
-        except Exception as ex:
-            raise Exception(str(ex))
 
+    def MainDef(self, main:MethodNode):
+        # uses rule: MAIN_METHOD_DEF -> main() { STATEMENTS }
+        if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'main') \
+                or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET) \
+                or not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
+                or not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
+            raise self.SyntaxError()
 
-    def MainDef(self):
-        try:
-            # uses rule: MAIN_METHOD_DEF -> main() { STATEMENTS }
-            if not self.Match(self.GetNextToken(), TokenType.KEYWORD, 'main') \
-                    or not self.Match(self.GetNextToken(), TokenType.O_ROUND_BRACKET) \
-                    or not self.Match(self.GetNextToken(), TokenType.C_ROUND_BRACKET) \
-                    or not self.Match(self.GetNextToken(), TokenType.O_FIGURE_BRACKET):
-                raise Exception()
-
-            self.currentMethodName = 'main'
-            self.currentClassName = None
-            self.listingsForClasses[self.currentClassName] = dict()
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] = str()
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        '_main: \n' \
-                        + 'MOV EBP, ESP \n'
-            
-            self.localSymbolTable.Clear()
-
-            self.Statements()
-
-            # cleans up the stack
-            self.listingsForClasses[self.currentClassName][self.currentMethodName] += \
-                        'ADD ESP, ' + str(self.GetLocalVarsSize()) + '\n'
-
-            if not self.Match(self.GetNextToken(), TokenType.C_FIGURE_BRACKET):
-                raise Exception
-        except Exception as ex:
-            raise Exception(str(ex))
+        main.openToken = self.GetCurrentToken()
+        main.statements = list()
+        self.Statements(main.statements)
 
+        if not self.Match(self.GetNextToken(), TokenType.C_FIGURE_BRACKET):
+            raise self.SyntaxError()
 
-    def BuildCode(self) -> str:
-        code = 'extern _printf \n\n'    \
-                + self.dataSection + '\n'\
-                + 'section .text \n'    \
-                + 'global _main\n\n'    \
-                + '_Print: \n'          \
-                + 'PUSH EBP \n'         \
-                + 'MOV EBP, ESP \n'     \
-                + 'MOV EAX, [EBP+8] \n' \
-                + 'PUSH EAX \n'         \
-                + 'PUSH NumFormat \n'   \
-                + 'CALL _printf \n'     \
-                + 'SUB ESP, 8 \n'       \
-                + 'MOV ESP, EBP \n'     \
-                + 'POP EBP \n'          \
-                + 'RET \n\n'            \
-                + '_PrintString: \n'    \
-                + 'PUSH EBP \n'         \
-                + 'MOV EBP, ESP \n'     \
-                + 'MOV EAX, [EBP+8] \n' \
-                + 'PUSH EAX \n'         \
-                + 'CALL _printf \n'     \
-                + 'SUB ESP, 4 \n'       \
-                + 'MOV ESP, EBP \n'     \
-                + 'POP EBP \n'          \
-                + 'RET \n\n'
-        # place function for printing numbers at code start
-
-        code += self.listingsForClasses[None]['main']
-
-        code += 'XOR EAX, EAX \n'\
-                + 'RET \n\n' # exit sequence
-
-        for className in self.listingsForClasses.keys():
-            if className != None:
-                for methodName in self.listingsForClasses[className].keys():
-                    code += self.listingsForClasses[className][methodName] 
-
-        return code
-
-
-    def GetLValue(self):
+
+    def GetLValue(self, lvalue:ValueNode):
         # inspect next tokens for left value
         if self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-            if self.Match(self.PeekNextToken(), TokenType.ACCESS):
-                lobjectData = self.localSymbolTable.FindSymbolGlobal(self.GetCurrentToken().value)
-                if lobjectData == None:
-                    raise Exception('Variable ' + self.GetCurrentToken().value + ' is undefined in method ' + self.currentMethodName + '!')
-                lvalue = LValue(lobjectData.name, lobjectData.type, LValueType.OBJECT_WITH_INT_VARIABLE)
+            lvalue.nameToken = lvalue.lastToken = self.GetCurrentToken()
+            if self.Match(self.PeekNextToken(), TokenType.EOF):
+                raise self.SyntaxError()
+            elif self.Match(self.PeekNextToken(), TokenType.ACCESS):
+                lvalue.valueType = LValueType.OBJECT_WITH_INT_VARIABLE
                 self.GetNextToken()
                 if not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-                    raise Exception()
-                lobjectVarName = self.GetCurrentToken().value
-                if lobjectVarName not in self.definedClasses[lobjectData.type].vars:
-                    raise Exception('Variable ' + lobjectVarName + ' is undefined in class ' + lobjectData.type + '!')
-                lvalue.childVarName = lobjectVarName
+                    raise self.SyntaxError()
+                lvalue.childToken = lvalue.lastToken = self.GetCurrentToken()
             else:
-                lvalueData = self.localSymbolTable.FindSymbolGlobal(self.GetCurrentToken().value)
-                if lvalueData == None:
-                    raise Exception('Variable ' + self.GetCurrentToken().value + ' is undefined in method ' + self.currentMethodName + '!')
-                lvalue = LValue(lvalueData.name, lvalueData.type, LValueType.VARIABLE)
+                lvalue.valueType = LValueType.VARIABLE
         elif self.Match(self.GetCurrentToken(), TokenType.KEYWORD, 'this') \
                 and self.Match(self.GetNextToken(), TokenType.ACCESS) \
                 and self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-            lvalueName = self.GetCurrentToken().value
-            if lvalueName not in self.definedClasses[self.currentClassName].vars:
-                    raise Exception('Variable ' + lvalueName + ' is undefined in class ' + self.currentClassName + '!')
-            lvalue = LValue(lvalueName, 'int', LValueType.VARIABLE_OF_CURRENT_CLASS)
+            lvalue.valueType = LValueType.VARIABLE_OF_CURRENT_CLASS
+            lvalue.nameToken = lvalue.lastToken = self.GetCurrentToken()
         else:
-            raise Exception()
-        try:
-            lvalue.codeWithAddressInEBX = self.PushVarAddressToEBX(lvalue)
-            return lvalue
-        except Exception as ex:
-            raise Exception(str(ex))
-
-    
-    def GetRValueWithExpectedType(self, expType:str):
-        # inspect next tokens for right value
+            raise self.SyntaxError()
+
+
+    def GetRValue(self, rvalue:ValueNode):
+        # inspect next tokens for right value; its type is checked by SemanticAnalyzer
         if self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-            if self.Match(self.PeekNextToken(), TokenType.ACCESS):
-                robjectData = self.localSymbolTable.FindSymbolGlobal(self.GetCurrentToken().value)
-                if robjectData == None:
-                    raise Exception('Variable ' + self.GetCurrentToken().value + ' is undefined in method ' + self.currentMethodName + '!')
-                rvalue = RValue(robjectData.name, robjectData.type, RValueType.OBJECT_WITH_INT_VARIABLE)
+            rvalue.nameToken = rvalue.lastToken = self.GetCurrentToken()
+            if self.Match(self.PeekNextToken(), TokenType.EOF):
+                raise self.SyntaxError()
+            elif self.Match(self.PeekNextToken(), TokenType.ACCESS):
+                rvalue.valueType = RValueType.OBJECT_WITH_INT_VARIABLE
                 self.GetNextToken()
                 if not self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-                    raise Exception()
-                robjectVarName = self.GetCurrentToken().value
-                if robjectVarName not in self.definedClasses[robjectData.type].vars:
-                    raise Exception('Variable ' + robjectVarName + ' is undefined in class ' + robjectData.type + '!')
-                rvalue.childVarName = robjectVarName
-                if expType != 'int':
-                    raise Exception('Type ' + expType + ' expected! Got type int!')
+                    raise self.SyntaxError()
+                rvalue.childToken = rvalue.lastToken = self.GetCurrentToken()
             else:
-                rvalueData = self.localSymbolTable.FindSymbolGlobal(self.GetCurrentToken().value)
-                if rvalueData == None:
-                    raise Exception('Variable ' + self.GetCurrentToken().value + ' is undefined in method ' + self.currentMethodName + '!')
-                if rvalueData.type != expType:
-                    raise Exception('Type ' + expType + ' expected! Got type ' + rvalueData.type + '!')
-                rvalue = RValue(rvalueData.name, rvalueData.type, RValueType.VARIABLE)
+                rvalue.valueType = RValueType.VARIABLE
         elif self.Match(self.GetCurrentToken(), TokenType.KEYWORD, 'this') \
                 and self.Match(self.GetNextToken(), TokenType.ACCESS) \
                 and self.Match(self.GetNextToken(), TokenType.IDENTIFIER):
-            rvalueName = self.GetCurrentToken().value
-            if rvalueName not in self.definedClasses[self.currentClassName].vars:
-                    raise Exception('Variable ' + rvalueName + ' is undefined in class ' + self.currentClassName + '!')
-            if expType != 'int':
-                    raise Exception('Type ' + expType + ' expected! Got type int!')
-            rvalue = RValue(rvalueName, 'int', RValueType.VARIABLE_OF_CURRENT_CLASS)
+            rvalue.valueType = RValueType.VARIABLE_OF_CURRENT_CLASS
+            rvalue.nameToken = rvalue.lastToken = self.GetCurrentToken()
         elif self.Match(self.GetCurrentToken(), TokenType.NUMBER):
-            if expType != 'int':
-                    raise Exception('Type ' + expType + ' expected! Got type int!')
-            rvalue = RValue(self.GetCurrentToken().value, 'int', RValueType.NUMBER)
-        else:
-            raise Exception()
-        try:
-            rvalue.codeWithAddressOrValueInEAX = self.PushVarAddressOrValueToEAX(rvalue)
-            return rvalue
-        except Exception as ex:
-            raise Exception(str(ex))
-
-
-    def GetLocalVarsSize(self) -> int:
-        # returns size in bytes of local variables
-        size = 0
-        for varData in self.localSymbolTable.GetLastTable().symbolsData:
-            if varData.type == 'int':
-                size += 4
-            elif varData.type == 'str':
-                continue
-            else:
-                size += len(4*self.definedClasses[varData.type].vars)
-        return size
-
-
-    def PushVarAddressToEBX(self, lvalue:LValue) -> str:
-        if lvalue.lvalueType == LValueType.VARIABLE:
-            if self.localSymbolTable.IsItMethodParamName(lvalue.varName):
-                return 'MOV EBX, [EBP + 12]\n'
-            else:
-                return 'MOV EBX, EBP\nSUB EBX, ' + str(self.CalculateLocationOfVariableInStackFromTop(lvalue.varName)) + '\n'
-        elif lvalue.lvalueType == LValueType.OBJECT_WITH_INT_VARIABLE:
-            if self.localSymbolTable.IsItMethodParamName(lvalue.varName):
-                return 'MOV EBX, [EBP + 12]\n SUB EBX, ' \
-                    + str(4*self.definedClasses[lvalue.varType].vars.index(lvalue.childVarName)) + '\n'
-            else:
-                return 'MOV EBX, EBP\nSUB EBX, ' + str(self.CalculateLocationOfVariableInStackFromTop(lvalue.varName) \
-                    + 4*self.definedClasses[lvalue.varType].vars.index(lvalue.childVarName)) + '\n'
-        elif lvalue.lvalueType == LValueType.VARIABLE_OF_CURRENT_CLASS:
-            return 'MOV EBX, [EBP + 8] \nSUB EBX, ' \
-                    + str(4*self.definedClasses[self.currentClassName].vars.index(lvalue.varName)) + '\n'
-        else:
-            raise Exception()
-
-
-    def PushVarAddressOrValueToEAX(self, rvalue:RValue) -> str:
-        if rvalue.rvalueType == RValueType.VARIABLE:
-            if self.localSymbolTable.IsItMethodParamName(rvalue.varName):
-                if rvalue.varType == 'int':
-                    return 'MOV EAX, [EBP + 12] \n'
-                else:
-                    return 'MOV EAX, [EBP + 12] \n'
-            else:
-                if rvalue.varType == 'int':
-                    return 'MOV EAX, [EBP - ' + str(self.CalculateLocationOfVariableInStackFromTop(rvalue.varName)) + ']\n'
-                else:
-                    return 'MOV EAX, EBP\nSUB EAX, ' + str(self.CalculateLocationOfVariableInStackFromTop(rvalue.varName)) + '\n'
-        elif rvalue.rvalueType == RValueType.OBJECT_WITH_INT_VARIABLE:
-            if self.localSymbolTable.IsItMethodParamName(rvalue.varName):
-                return 'MOV EAX, [EBP + 12]\nMOV EAX, [EAX - ' \
-                    + str(4*self.definedClasses[rvalue.varType].vars.index(rvalue.childVarName)) + ']\n'
-            else:
-                return 'MOV EAX, [EBP - ' + str(self.CalculateLocationOfVariableInStackFromTop(rvalue.varName) \
-                    + 4*self.definedClasses[rvalue.varType].vars.index(rvalue.childVarName)) + ']\n'
-        elif rvalue.rvalueType == RValueType.VARIABLE_OF_CURRENT_CLASS:
-            return 'MOV EAX, [EBP + 8] \nMOV EAX, [EAX - ' \
-                    + str(4*self.definedClasses[self.currentClassName].vars.index(rvalue.varName)) + ']\n'
-        elif rvalue.rvalueType == RValueType.NUMBER:
-            return 'MOV EAX, DWORD ' + self.GetCurrentToken().value + '\n'
+            rvalue.valueType = RValueType.NUMBER
+            rvalue.nameToken = rvalue.lastToken = self.GetCurrentToken()
         else:
-            raise Exception()   
+            raise self.SyntaxError()
@@ -0,0 +1,423 @@
+import re
+import sys
+import unittest
+from unittest import mock
+from Parser import Parser
+from Diagnostics import YADLSyntaxError
+from Diagnostics import YADLSemanticError
+from Diagnostics import Diagnostics
+from Diagnostics import AnalysisError
+from SyntaxAnalyzer import SyntaxAnalyzer
+from SemanticAnalyzer import SemanticAnalyzer
+from CodeFolder import CodeFolder
+from SyntaxTree import StatementNode
+from SyntaxTree import InvalidStatementNode
+from SyntaxTree import IntVarInitNode
+from SyntaxTree import StrVarInitNode
+from SyntaxTree import ObjectVarInitNode
+from SyntaxTree import AssigningNode
+from SyntaxTree import MethodCallNode
+from SyntaxTree import IfNode
+from SyntaxTree import WhileNode
+from SyntaxTree import PrintNode
+from SyntaxTree import PrintStringNode
+
+SAMPLE = '''class Counter {
+  int count;
+  int step;
+  Add(int n) {
+    this.count = n;
+    prints('added');
+  }
+  Next() {
+    int i = 0;
+    while (i < 3) { print(this.count); i = this.step; }
+  }
+}
+main() {
+  Counter c = Counter.CreateInstance();
+  int limit = 10;
+  c.step = limit;
+  if (limit > 5) { c.Add(limit); prints('big'); }
+  c.Next();
+  print(c.count);
+}
+'''
+
+# code of SAMPLE generated by the original translator
+SAMPLE_ORIGINAL_CODE = (
+    'extern _printf \n'
+    '\n'
+    'section .data \n'
+    "NumFormat: db '%d', 0xA, 0 \n"
+    'Counter_Add_1: db "added", 0xA, 0 \n'
+    'None_main_5: db "big", 0xA, 0 \n'
+    '\n'
+    'section .text \n'
+    'global _main\n'
+    '\n'
+    '_Print: \n'
+    'PUSH EBP \n'
+    'MOV EBP, ESP \n'
+    'MOV EAX, [EBP+8] \n'
+    'PUSH EAX \n'
+    'PUSH NumFormat \n'
+    'CALL _printf \n'
+    'SUB ESP, 8 \n'
+    'MOV ESP, EBP \n'
+    'POP EBP \n'
+    'RET \n'
+    '\n'
+    '_PrintString: \n'
+    'PUSH EBP \n'
+    'MOV EBP, ESP \n'
+    'MOV EAX, [EBP+8] \n'
+    'PUSH EAX \n'
+    'CALL _printf \n'
+    'SUB ESP, 4 \n'
+    'MOV ESP, EBP \n'
+    'POP EBP \n'
+    'RET \n'
+    '\n'
+    '_main: \n'
+    'MOV EBP, ESP \n'
+    'SUB ESP, 4 \n'
+    'MOV [ESP], DWORD 0 \n'
+    'SUB ESP, 4 \n'
+    'MOV [ESP], DWORD 0 \n'
+    'SUB ESP, 4 \n'
+    'MOV EAX, DWORD 10\n'
+    'MOV [ESP], EAX \n'
+    'MOV EBX, EBP\n'
+    'SUB EBX, 8\n'
+    'MOV EAX, [EBP - 12]\n'
+    'MOV [EBX], EAX \n'
+    'MOV EAX, DWORD 5\n'
+    'MOV EBX, EAX \n'
+    'MOV EAX, [EBP - 12]\n'
+    'CMP EAX, EBX \n'
+    'jnG _else_statement_4\n'
+    'MOV EAX, [EBP - 12]\n'
+    'PUSH EAX \n'
+    'MOV EBX, EBP \n'
+    'SUB EBX, 4\n'
+    'PUSH EBX \n'
+    'CALL _Counter_Add\n'
+    'ADD ESP, 8 \n'
+    'PUSH DWORD None_main_5\n'
+    'CALL _PrintString \n'
+    'ADD ESP, 4 \n'
+    'ADD ESP, 0\n'
+    '_else_statement_4: \n'
+    'MOV EBX, EBP \n'
+    'SUB EBX, 4\n'
+    'PUSH EBX \n'
+    'CALL _Counter_Next\n'
+    'ADD ESP, 4 \n'
+    'MOV EAX, [EBP - 4]\n'
+    'PUSH EAX \n'
+    'CALL _Print \n'
+    'ADD ESP, 4 \n'
+    'ADD ESP, 12\n'
+    'XOR EAX, EAX \n'
+    'RET \n'
+    '\n'
+    '_Counter_Add:\n'
+    'PUSH EBP \n'
+    'MOV EBP, ESP \n'
+    'MOV EBX, [EBP + 8] \n'
+    'SUB EBX, 0\n'
+    'MOV EAX, [EBP + 12] \n'
+    'MOV [EBX], EAX \n'
+    'PUSH DWORD Counter_Add_1\n'
+    'CALL _PrintString \n'
+    'ADD ESP, 4 \n'
+    'ADD ESP, 0\n'
+    'MOV ESP, EBP \n'
+    'POP EBP \n'
+    'RET \n'
+    '_Counter_Next:\n'
+    'PUSH EBP \n'
+    'MOV EBP, ESP \n'
+    'SUB ESP, 4 \n'
+    'MOV EAX, DWORD 0\n'
+    'MOV [ESP], EAX \n'
+    '_while_condition_2:MOV EAX, DWORD 3\n'
+    'MOV EBX, EAX \n'
+    'MOV EAX, [EBP - 4]\n'
+    'CMP EAX, EBX \n'
+    'jnL _while_exit_3\n'
+    'MOV EAX, [EBP + 8] \n'
+    'MOV EAX, [EAX - 0]\n'
+    'PUSH EAX \n'
+    'CALL _Print \n'
+    'ADD ESP, 4 \n'
+    'MOV EBX, EBP\n'
+    'SUB EBX, 4\n'
+    'MOV EAX, [EBP + 8] \n'
+    'MOV EAX, [EAX - 4]\n'
+    'MOV [EBX], EAX \n'
+    'ADD ESP, 0\n'
+    'JMP _while_condition_2\n'
+    '_while_exit_3: \n'
+    'ADD ESP, 4\n'
+    'MOV ESP, EBP \n'
+    'POP EBP \n'
+    'RET \n'
+)
+
+
+def Analyze(srcFile:str, **options) -> SyntaxAnalyzer:
+    analyzer = SyntaxAnalyzer(Parser.ParseText(srcFile), **options)
+    analyzer.Analyze()
+    return analyzer
+
+
+def GetMessages(srcFile:str) -> list:
+    # returns message, line and position of errors of source file
+    try:
+        Analyze(srcFile)
+    except AnalysisError as ex:
+        return [(error.message, error.line, error.pos) for error in ex.diagnostics.errors]
+    return []
+
+
+def GetErrors(srcFile:str) -> list:
+    # returns type, line and position of errors of source file in order they are reported
+    try:
+        Analyze(srcFile)
+    except AnalysisError as ex:
+        return [(type(error), error.line, error.pos) for error in ex.diagnostics.errors]
+    return []
+
+
+def RenameLabels(code:str) -> str:
+    # names strings of data section and numbers labels of blocks in order of
+    # the first use; the original translator named strings by method and
+    # numbered them together with blocks
+    stringLabels = re.findall(r'^(\w+): db "', code, re.M)
+    for i, label in enumerate(stringLabels):
+        code = re.sub(r'\b' + label + r'\b', '_string_' + str(i + 1), code)
+    numbers = dict()
+    return CodeFolder.BLOCK_LABEL.sub(lambda match: match.group(1) + '_'
+                                      + str(numbers.setdefault(match.group(0), len(numbers) + 1)), code)
+
+
+def Walk(statements:list):
+    # yields statements of list and of their blocks, block follows its statement
+    pending = statements[::-1]
+    while pending:
+        statement = pending.pop()
+        yield statement
+        if statement.body != None:
+            pending.extend(reversed(statement.body))
+
+
+class Test_SyntaxTree(unittest.TestCase):
+    def test_nodes_reject_unknown_attributes(self):
+        program = Analyze(SAMPLE, checkOnly=True).program
+        nodes = [program, program.main] + program.classes
+        for classNode in program.classes:
+            nodes.extend(classNode.fields)
+            nodes.extend(classNode.methods)
+            for method in classNode.methods:
+                nodes.extend(Walk(method.statements))
+        nodes.extend(Walk(program.main.statements))
+        self.assertTrue(any(isinstance(node, StatementNode) for node in nodes))
+        for node in nodes:
+            self.assertFalse(hasattr(node, '__dict__'), type(node).__name__)
+            with self.assertRaises(AttributeError):
+                node.unknownAttribute = None
+
+
+class Test_StatementRules(unittest.TestCase):
+    # statement, rule that parses it, node that rule makes
+    STATEMENTS = [
+        ('int a = 1;', SyntaxAnalyzer.VarInit, IntVarInitNode),
+        ("str s = 'text';", SyntaxAnalyzer.VarInit, StrVarInitNode),
+        ('Point p = Point.CreateInstance();', SyntaxAnalyzer.VarInit, ObjectVarInitNode),
+        ('a = 2;', SyntaxAnalyzer.Assigning, AssigningNode),
+        ('p.x = a;', SyntaxAnalyzer.Assigning, AssigningNode),
+        ('this.x = a;', SyntaxAnalyzer.Assigning, AssigningNode),
+        ('Show(a);', SyntaxAnalyzer.MethodCall, MethodCallNode),
+        ('p.Show();', SyntaxAnalyzer.MethodCall, MethodCallNode),
+        ('if (a < 2) { print(a); }', SyntaxAnalyzer.IfStatement, IfNode),
+        ('while (a == 2) { a = 1; }', SyntaxAnalyzer.WhileStatement, WhileNode),
+        ('print(a);', SyntaxAnalyzer.PrintStatement, PrintNode),
+        ("prints('text');", SyntaxAnalyzer.PrintStringStatement, PrintStringNode)
+    ]
+
+    POINT_CLASS = 'class Point {\n  int x;\n  Show() {\n    print(this.x);\n  }\n}\n'
+
+    def test_rule_of_every_statement(self):
+        for statement, rule, nodeType in Test_StatementRules.STATEMENTS:
+            with self.subTest(statement=statement):
+                analyzer = SyntaxAnalyzer(Parser.ParseText(statement))
+                self.assertEqual(analyzer.SelectStatementRule(), getattr(analyzer, rule.__name__))
+                program = SyntaxAnalyzer(Parser.ParseText(Test_StatementRules.POINT_CLASS + 'main() {\n  '
+                                                          + statement + '\n}')).ParseProgram()
+                self.assertEqual(len(program.main.statements), 1)
+                node = program.main.statements[0]
+                self.assertIs(type(node), nodeType)
+                self.assertIsNone(node.error)
+
+
+    def test_tokens_that_do_not_start_statement(self):
+        for statement in ('5 = a;', '(a);', 'a;', 'this = a;', 'p.x.y = 1;', 'class = 1;'):
+            with self.subTest(statement=statement):
+                analyzer = SyntaxAnalyzer(Parser.ParseText(statement))
+                self.assertIsNone(analyzer.SelectStatementRule())
+                program = SyntaxAnalyzer(Parser.ParseText('main() {\n  int a = 1;\n  ' + statement
+                                                          + '\n}')).ParseProgram()
+                node = program.main.statements[-1]
+                self.assertIs(type(node), InvalidStatementNode)
+                # error is reported at the last parsed token like in original translator
+                self.assertIs(type(node.error), YADLSyntaxError)
+                self.assertEqual((node.error.line, node.error.pos), (2, 15))
+
+
+    def test_end_of_file(self):
+        self.assertEqual(GetErrors('main() {\n  int a = 1;\n'), [(YADLSyntaxError, 2, 15)])
+        self.assertEqual(GetErrors('main() {\n  int a = 1;\n  print(a'), [(YADLSyntaxError, 3, 9)])
+        self.assertEqual(GetErrors('main() {\n  int a = 1;\n  while (a < 1) {'), [(YADLSyntaxError, 3, 20)])
+        self.assertEqual(GetErrors(''), [(YADLSyntaxError, None, None)])
+
+
+class Test_Diagnostics(unittest.TestCase):
+    def test_all_independent_errors_in_order(self):
+        srcFile = '''class A {
+  int x;
+  int ;
+  int y;
+  M() {
+    int a = ;
+    print(a);
+    b = 1;
+  }
+  N( {
+    print(1);
+  }
+  K() {
+    print(z);
+  }
+}
+class {
+  int q;
+}
+class B {
+  int x;
+  int x;
+  P() {
+    print(this.x);
+  }
+}
+main() {
+  A o = A.CreateInstance();
+  o.Missing();
+  prints(s);
+  while (1 < 2) { int c = ; print(c); }
+  print(this.x);
+  print(1);
+}
+'''
+        self.assertEqual(GetErrors(srcFile), [
+            (YADLSyntaxError, 3, 8),        # field, SkipFieldDef
+            (YADLSyntaxError, 6, 15),       # statement, SkipStatement
+            (YADLSemanticError, 8, 5),
+            (YADLSyntaxError, 10, 7),       # method header, SkipMethodDef
+            (YADLSemanticError, 14, 12),
+            (YADLSyntaxError, 17, 8),       # class header, SkipClass
+            (YADLSemanticError, 22, 8),
+            (YADLSemanticError, 29, 6),
+            (YADLSemanticError, 30, 11),
+            (YADLSyntaxError, 31, 32),      # statement in block
+            (YADLSemanticError, 32, 16)
+        ])
+
+
+    def test_error_at_the_same_token_is_added_once(self):
+        diagnostics = Diagnostics()
+        diagnostics.Add(YADLSyntaxError('', 2, 5))
+        diagnostics.Add(YADLSemanticError('Type int expected! Got type str!', 2, 5))
+        diagnostics.Add(YADLSemanticError('Type int expected! Got type str!', 3, 5))
+        diagnostics.Add(YADLSyntaxError('', 2, 5))
+        self.assertEqual([(error.line, error.pos) for error in diagnostics.errors], [(2, 5), (3, 5), (2, 5)])
+        self.assertEqual(type(diagnostics.errors[0]), YADLSyntaxError)
+
+
+    def test_undefined_names(self):
+        classes = 'class C {\n  int f;\n  M(C p) {\n    print(1);\n  }\n}\n'
+        main = 'main() {\n  int a = 1;\n  str s = \'text\';\n  %s\n}\n'
+        for statement, message, pos in [
+            ('x.M(o);', 'Object x is undefined in method main!', 3),
+            ('M(a);', 'Method M can\'t be called without object in main!', 3),
+            ('a.M(a);', 'Method M can\'t be called for variable a of type int!', 6),
+            ('prints(t);', 'Variable t is undefined in method main!', 11),
+            ('print(this.f);', 'Variable this.f can\'t be used in main!', 16),
+            ('this.f = 1;', 'Variable this.f can\'t be used in main!', 9),
+            ('print(s.f);', 'Variable s of type str has no variable f!', 13),
+            ('a.f = 1;', 'Variable a of type int has no variable f!', 6)
+        ]:
+            with self.subTest(statement=statement):
+                self.assertEqual(GetMessages(classes + main % statement), [(message, 10, pos)])
+
+
+    def test_object_parameter_is_not_copied(self):
+        for statement, pos in [('C q = p;', 13), ('C q = C.CreateInstance();\n    q = p;', 10),
+                               ('C q = C.CreateInstance();\n    p = q;', 10)]:
+            with self.subTest(statement=statement):
+                srcFile = 'class C {\n  int f;\n  M(C p) {\n    ' + statement + '\n  }\n}\nmain() {\n  print(1);\n}\n'
+                line = 3 + statement.count('\n') + 1
+                self.assertEqual(GetMessages(srcFile), [('Object p is method parameter, it can\'t be copied!',
+                                                         line, pos)])
+
+
+    def test_internal_error_is_not_reported_as_source_error(self):
+        with mock.patch.object(SemanticAnalyzer, 'PrintStatement', side_effect=KeyError('value')):
+            self.assertRaises(KeyError, Analyze, SAMPLE)
+        with mock.patch.object(SyntaxAnalyzer, 'PrintStatement', side_effect=AttributeError('value')):
+            self.assertRaises(AttributeError, Analyze, SAMPLE)
+
+
+class Test_Phases(unittest.TestCase):
+    def test_code_of_original_translator(self):
+        # -O0 emits code as it is generated
+        code = Analyze(SAMPLE, optimizationLevel=0).BuildCode()
+        self.assertEqual(RenameLabels(code), RenameLabels(SAMPLE_ORIGINAL_CODE))
+
+
+    def test_timings_of_phases(self):
+        analyzer = Analyze(SAMPLE)
+        self.assertEqual(list(analyzer.phaseTimings), ['parse', 'semantic', 'codegen'])
+        for seconds in analyzer.phaseTimings.values():
+            self.assertGreaterEqual(seconds, 0)
+        self.assertEqual(list(Analyze(SAMPLE, checkOnly=True).phaseTimings), ['parse', 'semantic'])
+
+
+class Test_DeepNesting(unittest.TestCase):
+    # recursive parser, checks and code generation exceed Python stack at this depth
+    DEPTH = max(3000, 3 * sys.getrecursionlimit())
+
+    def test_deeply_nested_blocks(self):
+        depth = Test_DeepNesting.DEPTH
+        srcFile = 'main() {\n  int a = 1;\n' + 'while (a < 2) {\nif (a == 1) {\n' * depth + 'print(a);\n' \
+            + '}\n}\n' * depth + 'prints(\'end\');\n}\n'
+        analyzer = Analyze(srcFile)
+        statements = analyzer.program.main.statements
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(sum(1 for statement in Walk(statements)), 2 * depth + 3)
+        code = analyzer.BuildCode()
+        self.assertEqual(code.count('_while_exit_'), 2 * depth)
+        self.assertEqual(code.count('_else_statement_'), 2 * depth)
+
+
+    def test_error_in_deeply_nested_block(self):
+        depth = Test_DeepNesting.DEPTH
+        srcFile = 'main() {\n  int a = 1;\n' + 'while (a < 2) {\n' * depth + 'b = 1;\nprint(a;\n' \
+            + '}\n' * depth + '}\n'
+        line = depth + 3
+        self.assertEqual([(error[1]) for error in GetErrors(srcFile)], [line, line + 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
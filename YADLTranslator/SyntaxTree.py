@@ -0,0 +1,236 @@
+class ValueNode(object):
+    """Left or right value of statement: variable (var), variable of current
+    class (this.var), variable of object (obj.var) or number. Parser sets its
+    type and tokens, semantic pass sets data that code generation needs"""
+    __slots__ = ('valueType', 'nameToken', 'childToken', 'lastToken',
+                 'symbol', 'varType', 'isParam', 'location', 'offset')
+
+    def __init__(self):
+        # LValueType or RValueType; None until the first token is parsed
+        self.valueType = None
+        # variable, object, number or variable of current class (after this.)
+        self.nameToken = None
+        # variable of object (obj.var)
+        self.childToken = None
+        self.lastToken = None
+        # SymbolData of variable or object, type of it
+        self.symbol = None
+        self.varType = None
+        self.isParam = False
+        # distance from EBP to variable or object in stack
+        self.location = None
+        # distance from address of object to its variable
+        self.offset = None
+
+
+class StatementNode(object):
+    """Base class of method statements. Statement with error keeps parsed
+    part of it and the error, that is reported after checks of parsed part.
+    Body is list of statements of block: block of if or while statement or
+    block that is opened in skipped tokens of statement with error"""
+    __slots__ = ('error', 'body')
+
+    def __init__(self):
+        self.error = None
+        self.body = None
+
+
+class InvalidStatementNode(StatementNode):
+    """Tokens that don't start any statement"""
+    __slots__ = ()
+
+
+class IntVarInitNode(StatementNode):
+    """int var = rvalue;"""
+    __slots__ = ('nameToken', 'value', 'symbol')
+
+    def __init__(self):
+        super().__init__()
+        self.nameToken = None
+        self.value = None
+        self.symbol = None
+
+
+class StrVarInitNode(StatementNode):
+    """str var = 'string';"""
+    __slots__ = ('nameToken', 'stringToken', 'symbol', 'label')
+
+    def __init__(self):
+        super().__init__()
+        self.nameToken = None
+        self.stringToken = None
+        self.symbol = None
+        # label of string in data section
+        self.label = None
+
+
+class ObjectVarInitNode(StatementNode):
+    """Type obj = Type.CreateInstance(); or Type obj = rvalue;"""
+    __slots__ = ('typeToken', 'nameToken', 'rightToken', 'constructorEndToken', 'value', 'symbol',
+                 'fieldsCount', 'copyLocations')
+
+    def __init__(self):
+        super().__init__()
+        self.typeToken = None
+        self.nameToken = None
+        # the first token after '='
+        self.rightToken = None
+        # ')' of constructor call, None if object is copied from rvalue
+        self.constructorEndToken = None
+        self.value = None
+        self.symbol = None
+        # count of variables of created object
+        self.fieldsCount = 0
+        # pairs of locations of copied variables: (from rvalue, to object)
+        self.copyLocations = None
+
+
+class AssigningNode(StatementNode):
+    """lvalue = rvalue;"""
+    __slots__ = ('left', 'assignToken', 'value', 'copyLocations')
+
+    def __init__(self):
+        super().__init__()
+        self.left = None
+        self.assignToken = None
+        self.value = None
+        # pairs of locations of copied variables of objects: (from rvalue, to lvalue)
+        self.copyLocations = None
+
+
+class MethodCallNode(StatementNode):
+    """Method(argument); or obj.Method(argument); argument is optional"""
+    __slots__ = ('objectToken', 'methodToken', 'openToken', 'argumentToken', 'argument', 'closeToken',
+                 'className', 'method', 'objectLocation')
+
+    def __init__(self):
+        super().__init__()
+        # None for method of current class
+        self.objectToken = None
+        self.methodToken = None
+        self.openToken = None
+        # the first token of argument, None if there is no argument
+        self.argumentToken = None
+        self.argument = None
+        self.closeToken = None
+        # class and YADLMethodData of called method
+        self.className = None
+        self.method = None
+        self.objectLocation = None
+
+
+class BlockStatementNode(StatementNode):
+    """Base class of statements with condition and block"""
+    __slots__ = ('left', 'compareToken', 'right', 'scopeSymbolsCount')
+
+    def __init__(self):
+        super().__init__()
+        self.left = None
+        self.compareToken = None
+        self.right = None
+        # count of symbols declared in block
+        self.scopeSymbolsCount = 0
+
+
+class IfNode(BlockStatementNode):
+    """if (rvalue cmp rvalue) { statements }"""
+    __slots__ = ()
+
+
+class WhileNode(BlockStatementNode):
+    """while (rvalue cmp rvalue) { statements }"""
+    __slots__ = ()
+
+
+class PrintNode(StatementNode):
+    """print(rvalue);"""
+    __slots__ = ('value',)
+
+    def __init__(self):
+        super().__init__()
+        self.value = None
+
+
+class PrintStringNode(StatementNode):
+    """prints(var); or prints('string');"""
+    __slots__ = ('valueToken', 'label')
+
+    def __init__(self):
+        super().__init__()
+        self.valueToken = None
+        # label of printed string in data section
+        self.label = None
+
+
+class FieldNode(object):
+    """int var; in class"""
+    __slots__ = ('nameToken', 'error')
+
+    def __init__(self):
+        self.nameToken = None
+        self.error = None
+
+
+class MethodNode(object):
+    """Method of class or main method. Statements are set when its header is
+    parsed"""
+    __slots__ = ('nameToken', 'paramTypeToken', 'paramNameToken', 'openToken', 'statements', 'localsSize',
+                 'isLive', 'error')
+
+    def __init__(self):
+        self.nameToken = None
+        self.paramTypeToken = None
+        self.paramNameToken = None
+        # '{' of body
+        self.openToken = None
+        self.statements = None
+        # size of local variables in stack at the end of method
+        self.localsSize = 0
+        # False if method can't be called from main, its code isn't generated
+        self.isLive = True
+        self.error = None
+
+
+class ClassNode(object):
+    """Class with its variables and methods"""
+    __slots__ = ('nameToken', 'openToken', 'fields', 'methods', 'methodsEndToken', 'error')
+
+    def __init__(self):
+        self.nameToken = None
+        # '{' of class
+        self.openToken = None
+        self.fields = list()
+        self.methods = list()
+        # the last token of methods, None if they aren't parsed to the end
+        self.methodsEndToken = None
+        self.error = None
+
+
+class ProgramNode(object):
+    """Syntax tree of source file: classes and main method"""
+    __slots__ = ('classes', 'main', 'stringPool', 'callGraph')
+
+    def __init__(self):
+        self.classes = list()
+        self.main = None
+        # StringPool with strings of program, it is filled by semantic checks
+        self.stringPool = None
+        # CallGraph of methods, it is filled by semantic checks
+        self.callGraph = None
+
+
+def WalkStatements(statements:list):
+    # yields (statement, False) for every statement in order of source and
+    # (statement, True) after statements of its body. Uses stack of blocks
+    # instead of recursion, so depth of nesting doesn't depend on Python stack
+    blocks = [(iter(statements), None)]
+    while blocks:
+        statement = next(blocks[-1][0], None)
+        if statement == None:
+            blockStatement = blocks.pop()[1]
+            if blockStatement != None:
+                yield blockStatement, True
+            continue
+        yield statement, False
+        if statement.body != None:
+            blocks.append((iter(statement.body), statement))
@@ -2,11 +2,15 @@ from enum import Enum
 
 class Token(object):
     """Class that stores date about YADL token"""
-    def __init__(self, type, val:str, line:int, pos:int):
+    __slots__ = ('type', 'value', 'line', 'pos', 'offset')
+
+    def __init__(self, type, val:str, line:int, pos:int, offset:int = -1):
         self.type = type
         self.value = val
         self.line = line
         self.pos = pos
+        # index of the first char of token in source text
+        self.offset = offset
 
 
 class TokenType(Enum):
@@ -26,4 +30,5 @@ class TokenType(Enum):
     EQUAL = 13                      # ==
     SEMICOLON = 14                  # ;
     ACCESS = 15                     # .
-    STRING_LITERAL = 16             # 'string'
\ No newline at end of file
+    STRING_LITERAL = 16             # 'string'
+    EOF = 17                        # end of tokens (added by TokenBuffer)
\ No newline at end of file
@@ -0,0 +1,82 @@
+from collections import deque
+from Token import Token
+from Token import TokenType
+
+
+class TokenBuffer(object):
+    """Class that gives SyntaxAnalyzer access to tokens from any iterable
+    (list or Parser.ParseStream generator). It holds only the current token
+    and a bounded ring buffer of next tokens that are needed for lookahead.
+    Tokens end with EOF token that has line and position of the last token,
+    it is returned for any read after the end"""
+    def __init__(self, tokens, lookaheadSize:int = 4):
+        self.tokens = iter(tokens)
+        self.lookahead = deque()
+        self.lookaheadSize = lookaheadSize
+        self.currentToken = None
+        # index of current token in the whole sequence
+        self.index = -1
+        # exception raised by token generator (lexical error in stream mode)
+        self.lexerError = None
+        self.lastToken = None
+        self.eofToken = None
+
+
+    def ReadToken(self) -> bool:
+        # moves one more token from source to lookahead buffer; the last one is EOF
+        if self.eofToken != None:
+            return False
+        try:
+            self.lastToken = next(self.tokens)
+            self.lookahead.append(self.lastToken)
+        except StopIteration:
+            if self.lastToken == None:
+                self.eofToken = Token(TokenType.EOF, '', 1, 0)
+            else:
+                self.eofToken = Token(TokenType.EOF, '', self.lastToken.line, self.lastToken.pos, 
+                                      self.lastToken.offset + len(self.lastToken.value))
+            self.lookahead.append(self.eofToken)
+        except Exception as ex:
+            self.lexerError = ex
+            raise
+        return True
+
+
+    def Next(self) -> Token:
+        # makes next token current; EOF token stays current at the end of tokens
+        if not self.lookahead:
+            self.ReadToken()
+        if self.lookahead[0] == self.eofToken:
+            if self.currentToken != self.eofToken:
+                self.currentToken = self.eofToken
+                self.index += 1
+            return self.currentToken
+        self.currentToken = self.lookahead.popleft()
+        self.index += 1
+        return self.currentToken
+
+
+    def Peek(self, distance:int = 1) -> Token:
+        # returns token that is distance tokens after current one or EOF token
+        if distance > self.lookaheadSize:
+            raise IndexError('Lookahead is limited to ' + str(self.lookaheadSize) + ' tokens!')
+        while len(self.lookahead) < distance:
+            if not self.ReadToken():
+                return self.eofToken
+        return self.lookahead[distance-1]
+
+
+    def Unread(self):
+        # returns current token to the next tokens (used after syntax error).
+        # It stays current until the next read
+        if self.currentToken != self.eofToken:
+            self.lookahead.appendleft(self.currentToken)
+            self.index -= 1
+
+
+    def IsEnd(self) -> bool:
+        return self.currentToken != None and self.currentToken == self.eofToken
+
+
+    def GetCurrent(self) -> Token:
+        return self.currentToken
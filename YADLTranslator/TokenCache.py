@@ -0,0 +1,202 @@
+import gc
+import os
+import sys
+import zlib
+import struct
+import locale
+import hashlib
+import tempfile
+from array import array
+from Token import Token
+from Token import TokenType
+from Parser import LEXER_VERSION
+
+
+# TokenType by its value, so type code from array is converted without Enum call
+_TOKEN_TYPES = {tokenType.value: tokenType for tokenType in TokenType}
+
+
+class TokenCache(object):
+    """Class that keeps tokens of lexed files on disk, so unchanged file is not
+    lexed again. Entry is found by hash of file contents, lexer version and
+    encoding. Entry stores token fields in arrays and every distinct value
+    once (value table), it is checked with CRC32 when it is loaded. Entries
+    that were not used for the longest time are removed when cache is bigger
+    than maxSize bytes"""
+
+    MAGIC = b'YADT'
+    FORMAT_VERSION = 1
+    # magic, format version, lexer version, key, tokens count, values count,
+    # size of values table, CRC32 of data after header
+    HEADER = struct.Struct('<4sHH32sIIII')
+    ENTRY_EXTENSION = '.tokens'
+
+    def __init__(self, cacheDir:str, maxSize:int = 64 << 20):
+        # directory is chosen by user, it is created when the first entry is stored
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+
+
+    @staticmethod
+    def GetKey(filePath:str) -> bytes:
+        # tokens depend on file bytes, lexer version and encoding used to read file
+        try:
+            with open(filePath, 'rb') as srcFile:
+                srcBytes = srcFile.read()
+        except Exception:
+            raise IOError()
+        digest = hashlib.sha256(srcBytes)
+        digest.update(('\0' + str(LEXER_VERSION) + '\0' + locale.getpreferredencoding(False)).encode())
+        return digest.digest()
+
+
+    def GetEntryPath(self, key:bytes) -> str:
+        return os.path.join(self.cacheDir, key.hex() + self.ENTRY_EXTENSION)
+
+
+    def Load(self, key:bytes) -> list:
+        # returns cached tokens or None if there is no valid entry
+        entryPath = self.GetEntryPath(key)
+        try:
+            with open(entryPath, 'rb') as entryFile:
+                data = entryFile.read()
+        except OSError:
+            return None
+        tokens = TokenCache.Decode(data, key)
+        if tokens == None:
+            # entry is corrupted or written by other version
+            TokenCache.RemoveEntry(entryPath)
+            return None
+        try:
+            # modification time is the time of last use for eviction
+            os.utime(entryPath)
+        except OSError:
+            pass
+        return tokens
+
+
+    def Store(self, key:bytes, tokens) -> bool:
+        # saves tokens (list or TokenStream); returns False if cache can't be written
+        data = TokenCache.Encode(tokens, key)
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            # entry is written to temporary file first, so other process never reads a part of it
+            fd, tempPath = tempfile.mkstemp(suffix='.tmp', dir=self.cacheDir)
+            with os.fdopen(fd, 'wb') as tempFile:
+                tempFile.write(data)
+            os.replace(tempPath, self.GetEntryPath(key))
+            self.Evict()
+        except OSError:
+            return False
+        return True
+
+
+    def Evict(self):
+        # removes least recently used entries while cache is bigger than maxSize
+        entries = list()
+        for name in os.listdir(self.cacheDir):
+            if name.endswith(self.ENTRY_EXTENSION):
+                entryPath = os.path.join(self.cacheDir, name)
+                try:
+                    stat = os.stat(entryPath)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entryPath))
+        cacheSize = sum(entry[1] for entry in entries)
+        entries.sort()
+        for mtime, size, entryPath in entries:
+            if cacheSize <= self.maxSize:
+                break
+            TokenCache.RemoveEntry(entryPath)
+            cacheSize -= size
+
+
+    @staticmethod
+    def RemoveEntry(entryPath:str):
+        try:
+            os.remove(entryPath)
+        except OSError:
+            pass
+
+
+    @staticmethod
+    def Encode(tokens, key:bytes) -> bytes:
+        types = array('B')
+        valueIndexes = array('I')
+        offsets = array('q')
+        lines = array('i')
+        positions = array('i')
+        indexByValue = dict()
+        values = list()
+        for token in tokens:
+            valueIndex = indexByValue.get(token.value)
+            if valueIndex == None:
+                valueIndex = len(values)
+                indexByValue[token.value] = valueIndex
+                values.append(token.value.encode('utf-8', 'surrogatepass'))
+            types.append(token.type.value)
+            valueIndexes.append(valueIndex)
+            offsets.append(token.offset)
+            lines.append(token.line)
+            positions.append(token.pos)
+        valueLengths = array('I', [len(value) for value in values])
+        valuesTable = b''.join(values)
+        arrays = (valueLengths, types, valueIndexes, offsets, lines, positions)
+        if sys.byteorder == 'big':
+            # entries are always little-endian
+            for tokenArray in arrays:
+                tokenArray.byteswap()
+        data = valueLengths.tobytes() + valuesTable + b''.join(tokenArray.tobytes() for tokenArray in arrays[1:])
+        header = TokenCache.HEADER.pack(TokenCache.MAGIC, TokenCache.FORMAT_VERSION, LEXER_VERSION, key,
+                                        len(types), len(values), len(valuesTable), zlib.crc32(data))
+        return header + data
+
+
+    @staticmethod
+    def Decode(data:bytes, key:bytes) -> list:
+        # returns tokens of entry or None if entry isn't valid for the key
+        header = TokenCache.HEADER
+        if len(data) < header.size:
+            return None
+        magic, formatVersion, lexerVersion, entryKey, tokensCount, valuesCount, valuesTableSize, checksum = \
+            header.unpack_from(data)
+        if magic != TokenCache.MAGIC or formatVersion != TokenCache.FORMAT_VERSION \
+            or lexerVersion != LEXER_VERSION or entryKey != key:
+            return None
+        data = memoryview(data)[header.size:]
+        if len(data) != 4 * valuesCount + valuesTableSize + 21 * tokensCount or zlib.crc32(data) != checksum:
+            return None
+        arrays = list()
+        start = 0
+        for typeCode, count in (('I', valuesCount), (None, valuesTableSize), ('B', tokensCount), 
+                                ('I', tokensCount), ('q', tokensCount), ('i', tokensCount), ('i', tokensCount)):
+            if typeCode == None:
+                valuesTable = data[start:start+count]
+                start += count
+                continue
+            tokenArray = array(typeCode)
+            tokenArray.frombytes(data[start:start+count*tokenArray.itemsize])
+            if sys.byteorder == 'big':
+                tokenArray.byteswap()
+            arrays.append(tokenArray)
+            start += count * tokenArray.itemsize
+        valueLengths, types, valueIndexes, offsets, lines, positions = arrays
+        try:
+            values = list()
+            start = 0
+            for length in valueLengths:
+                values.append(sys.intern(str(valuesTable[start:start+length], 'utf-8', 'surrogatepass')))
+                start += length
+            # tokens don't make reference cycles, so garbage collector is not run
+            # for every few hundreds of new tokens
+            isGCEnabled = gc.isenabled()
+            gc.disable()
+            try:
+                return [Token(_TOKEN_TYPES[typeCode], values[valueIndex], line, pos, offset) 
+                        for typeCode, valueIndex, offset, line, pos in 
+                        zip(types, valueIndexes, offsets, lines, positions)]
+            finally:
+                if isGCEnabled:
+                    gc.enable()
+        except (KeyError, IndexError, UnicodeDecodeError):
+            return None
@@ -0,0 +1,72 @@
+import sys
+from array import array
+from Token import Token
+from Token import TokenType
+
+
+# TokenType by its value, so type code from array is converted without Enum call
+_TOKEN_TYPES = {tokenType.value: tokenType for tokenType in TokenType}
+
+
+class TokenStream(object):
+    """Class that stores tokens of source text in compact form. Every token
+    field is kept in typed array (struct of arrays) and token value is sliced
+    from source text only when it is requested. It supports len(), indexing
+    and iteration that return Token objects, so it can be passed to SyntaxAnalyzer.
+    Source can be also bytes (mmap) in given encoding, then offsets are in bytes"""
+    __slots__ = ('source', 'encoding', 'types', 'offsets', 'lengths', 'lines', 'positions')
+
+    def __init__(self, source, encoding:str = None):
+        self.source = source
+        self.encoding = encoding
+        self.types = array('B')
+        self.offsets = array('q')
+        self.lengths = array('i')
+        self.lines = array('i')
+        self.positions = array('i')
+
+
+    @staticmethod
+    def FromTokens(source:str, tokens):
+        # tokens should have offsets in source (set by Parser)
+        stream = TokenStream(source)
+        for token in tokens:
+            stream.Append(token)
+        return stream
+
+
+    def Append(self, token:Token):
+        self.types.append(token.type.value)
+        self.offsets.append(token.offset)
+        self.lengths.append(len(token.value))
+        self.lines.append(token.line)
+        self.positions.append(token.pos)
+
+
+    def GetType(self, index:int) -> TokenType:
+        return _TOKEN_TYPES[self.types[index]]
+
+
+    def GetValue(self, index:int) -> str:
+        # equal values of different tokens are the same interned str object
+        offset = self.offsets[index]
+        value = self.source[offset:offset+self.lengths[index]]
+        if self.encoding != None:
+            value = value.decode(self.encoding)
+            if '\r' in value:
+                value = value.replace('\r\n', '\n').replace('\r', '\n')
+        return sys.intern(value)
+
+
+    def __len__(self):
+        return len(self.types)
+
+
+    def __getitem__(self, index:int) -> Token:
+        return Token(_TOKEN_TYPES[self.types[index]], self.GetValue(index),
+                     self.lines[index], self.positions[index], self.offsets[index])
+
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self[index]
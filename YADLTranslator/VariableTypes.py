@@ -11,6 +11,8 @@ class LValue(object):
     """Represents left value in expression. Left value can be: local int variable,
     local variable of another type, class variable (with <this> keyword) or 
     object variable"""
+    __slots__ = ('varName', 'varType', 'childVarName', 'lvalueType', 'codeWithAddressInEBX')
+
     def __init__(self, name:str, type:str, ltype:LValueType):
         self.varName = name
         self.varType = type
@@ -28,6 +30,8 @@ class RValueType(Enum):
 
 class RValue(object):
     """Represent right value in expression"""
+    __slots__ = ('varName', 'varType', 'childVarName', 'rvalueType', 'codeWithAddressOrValueInEAX')
+
     def __init__(self, name:str, type:str, rtype:RValueType):
         self.varName = name
         self.varType = type
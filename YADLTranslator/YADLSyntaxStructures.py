@@ -1,5 +1,7 @@
 class YADLMethodData(object):
     """Class that holds data about class method"""
+    __slots__ = ('name', 'paramType', 'paramName')
+
     def __init__(self, name, paramType, paramName):
         self.name = name
         self.paramType = paramType
@@ -8,27 +10,43 @@ class YADLMethodData(object):
 
 class YADLClassData(object):
     """Represent structure of YADS class and saves data about defined 
-    methods and variables"""
+    methods and variables. Layout of class (offsets of variables and size
+    of instance) is frozen after variables definition, methods are found by
+    name in dict"""
+    __slots__ = ('name', 'vars', 'methods', 'fieldOffsets', 'methodsByName', 'size', 'isFrozen')
 
     def __init__(self, className:str):
         self.name = className
         self.vars = list()
         self.methods = list()
+        # variable name -> distance in bytes from address of object
+        self.fieldOffsets = dict()
+        self.methodsByName = dict()
+        # size in bytes of object in stack
+        self.size = 0
+        self.isFrozen = False
 
 
     def AddVar(self, varName:str):
+        if self.isFrozen:
+            raise Exception('Variables of class ' + self.name + ' can\'t be added after its methods!')
+        self.fieldOffsets[varName] = 4 * len(self.vars)
         self.vars.append(varName)
+        self.size += 4
+
+    def Freeze(self):
+        # use this function when variables definition ends
+        self.isFrozen = True
 
     def IsVarInList(self, varName:str) -> bool :
-        if varName in self.vars:
-            return True
-        return False
+        return varName in self.fieldOffsets
+
+    def GetVarOffset(self, varName:str) -> int:
+        return self.fieldOffsets[varName]
 
     def AddMethod(self, method):
         self.methods.append(method)
+        self.methodsByName[method.name] = method
 
     def FindMethodInList(self, methodName:str) -> YADLMethodData:
-        for method in self.methods:
-            if method.name == methodName:
-                return method
-        return None
\ No newline at end of file
+        return self.methodsByName.get(methodName)
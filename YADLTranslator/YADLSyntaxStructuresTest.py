@@ -0,0 +1,68 @@
+import unittest
+from YADLSyntaxStructures import YADLClassData
+from YADLSyntaxStructures import YADLMethodData
+from SyntaxAnalyzerTest import Analyze
+
+
+class Test_YADLClassData(unittest.TestCase):
+    def test_layout_of_variables(self):
+        classData = YADLClassData('Point')
+        for varName in ('x', 'y', 'z'):
+            classData.AddVar(varName)
+        classData.Freeze()
+        # the original translator placed variable at 4 * its index in vars
+        self.assertEqual([classData.GetVarOffset(varName) for varName in classData.vars], [0, 4, 8])
+        self.assertEqual(classData.size, 4 * len(classData.vars))
+        self.assertTrue(classData.IsVarInList('y'))
+        self.assertFalse(classData.IsVarInList('w'))
+
+
+    def test_variable_after_freeze_raises(self):
+        classData = YADLClassData('Point')
+        classData.AddVar('x')
+        classData.Freeze()
+        self.assertRaises(Exception, classData.AddVar, 'y')
+        self.assertEqual(classData.vars, ['x'])
+        self.assertEqual(classData.fieldOffsets, {'x': 0})
+        self.assertEqual(classData.size, 4)
+
+
+    def test_methods_by_name(self):
+        classData = YADLClassData('Point')
+        classData.Freeze()
+        move = YADLMethodData('Move', 'int', 'n')
+        show = YADLMethodData('Show', None, None)
+        classData.AddMethod(move)
+        classData.AddMethod(show)
+        self.assertIs(classData.FindMethodInList('Move'), move)
+        self.assertIs(classData.FindMethodInList('Show'), show)
+        self.assertIsNone(classData.FindMethodInList('Hide'))
+        self.assertEqual(classData.methods, [move, show])
+
+
+    def test_classes_of_program(self):
+        definedClasses = Analyze('''class Pair {
+  int x;
+  int y;
+  Get() {
+    print(this.y);
+  }
+  Set(int n) {
+    this.x = n;
+  }
+}
+main() {
+  Pair p = Pair.CreateInstance();
+  p.Get();
+}
+''', checkOnly=True).semanticAnalyzer.definedClasses
+        pair = definedClasses['Pair']
+        self.assertTrue(pair.isFrozen)
+        self.assertEqual(pair.fieldOffsets, {'x': 0, 'y': 4})
+        self.assertEqual(pair.size, 8)
+        self.assertEqual(list(pair.methodsByName), ['Get', 'Set'])
+        self.assertEqual(pair.FindMethodInList('Set').paramType, 'int')
+
+
+if __name__ == '__main__':
+    unittest.main()
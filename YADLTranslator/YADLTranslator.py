@@ -1,25 +1,121 @@
 import sys
 import os
+import argparse
 from Parser import Parser
 from Parser import Token
+from Parser import LexerEngine
 from SyntaxAnalyzer import SyntaxAnalyzer
+from CodeGenerator import CodeGenerator
+from TokenCache import TokenCache
 
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print('Usage: python YADLTranslator.py Path/To/File.txt')
-        exit()
-    if not os.path.exists(sys.argv[1]):
+    argParser = argparse.ArgumentParser(usage='python YADLTranslator.py Path/To/File.txt [options]')
+    argParser.add_argument('filePath')
+    argParser.add_argument('--lexer', choices=[e.name.lower() for e in LexerEngine], default='state_machine',
+                           help='lexer engine used to split source file to tokens')
+    argParser.add_argument('--stream', action='store_true',
+                           help='read source file by chunks and lex it lazily (uses regex engine)')
+    argParser.add_argument('--mmap', action='store_true',
+                           help='lex memory-mapped source file without decoding it')
+    argParser.add_argument('--jobs', type=int, default=0, metavar='N',
+                           help='lex source file and generate code of classes in N worker processes (uses regex engine)')
+    argParser.add_argument('--cache-dir', default=None, metavar='DIR',
+                           help='keep tokens of lexed files in directory DIR and don\'t lex unchanged file again '
+                                '(default: no cache, source file is always lexed)')
+    argParser.add_argument('-o', '--output', default=None, metavar='PATH',
+                           help='path of asm file or - for stdout (default: out.asm in directory of source file)')
+    argParser.add_argument('-O', dest='optimization_level', type=int, choices=[0, 1, 2], default=2, metavar='LEVEL',
+                           help='optimization level: -O0 emits code as it is generated, -O1 removes dead methods and '
+                                'rewrites instructions by peephole rules, -O2 also folds identical code (default)')
+    argParser.add_argument('--verify-passes', action='store_true',
+                           help='check code of every method after every optimization pass')
+    argParser.add_argument('--keep-dead-methods', action='store_true',
+                           help='generate code of methods that can\'t be called from main')
+    argParser.add_argument('--no-folding', action='store_true',
+                           help='emit code of every method, don\'t make method with the same code an alias')
+    argParser.add_argument('--no-peephole', action='store_true',
+                           help='emit instructions as they are generated, don\'t rewrite them by peephole rules')
+    argParser.add_argument('--check', action='store_true',
+                           help='only check source file for errors, don\'t generate code and out.asm')
+    argParser.add_argument('--timings', action='store_true',
+                           help='print time of parsing, semantic checks and code generation')
+    argParser.add_argument('--stats', action='store_true',
+                           help='print statistics of optimizations of code')
+    args = argParser.parse_args()
+    if not os.path.exists(args.filePath):
         print('Check path to file! File doesn\'t exist!')
         exit()
+    outFileName = args.output
+    if outFileName == None:
+        outFileName = os.path.join(os.path.dirname(args.filePath), 'out.asm')
+    # messages don't mix with code written to stdout
+    messageFile = sys.stderr if outFileName == '-' else sys.stdout
+    tempPath = None
     try:
-        tokens = Parser.Parse(sys.argv[1])
-        syntaxAnalyzer = SyntaxAnalyzer(tokens)
-        syntaxAnalyzer.Analyze()
-        code = syntaxAnalyzer.BuildCode()
-        outFileName = sys.argv[1][0:sys.argv[1].rindex('\\')+1] + 'out.asm'
-        outFile = open(outFileName, 'w')
-        outFile.write(code)
-        outFile.close()
-        print('Succesfully translated! Location: ' + outFileName)
+        tokens = None
+        if args.stream:
+            tokens = Parser.ParseStream(args.filePath)
+        elif args.cache_dir != None:
+            # lazy stream mode never has all tokens, so only other modes use cache
+            tokenCache = TokenCache(args.cache_dir)
+            cacheKey = TokenCache.GetKey(args.filePath)
+            tokens = tokenCache.Load(cacheKey)
+        if tokens == None:
+            if args.mmap:
+                tokens = Parser.ParseMapped(args.filePath)
+            elif args.jobs > 0:
+                tokens = Parser.ParseParallel(args.filePath, args.jobs)
+            else:
+                tokens = Parser.Parse(args.filePath, LexerEngine[args.lexer.upper()])
+            if args.cache_dir != None:
+                tokenCache.Store(cacheKey, tokens)
+        syntaxAnalyzer = SyntaxAnalyzer(tokens, args.jobs, args.check, removeDeadMethods=not args.keep_dead_methods,
+                                        foldIdenticalCode=not args.no_folding, optimizePeephole=not args.no_peephole,
+                                        optimizationLevel=args.optimization_level, verifyPasses=args.verify_passes,
+                                        measureDeadMethods=args.stats)
+        if args.check:
+            syntaxAnalyzer.Analyze()
+            print('Source file has no errors!', file=messageFile)
+        elif outFileName == '-':
+            syntaxAnalyzer.Analyze(sys.stdout)
+            sys.stdout.flush()
+        else:
+            # code is streamed to temporary file, so output file isn't changed if
+            # source file has errors
+            tempPath = outFileName + '.tmp'
+            with open(tempPath, 'w') as outFile:
+                syntaxAnalyzer.Analyze(outFile)
+            os.replace(tempPath, outFileName)
+            tempPath = None
+            print('Succesfully translated! Location: ' + outFileName, file=messageFile)
+        if args.timings:
+            for phase, seconds in syntaxAnalyzer.phaseTimings.items():
+                print(phase + ': ' + str(round(seconds * 1000, 3)) + ' ms', file=messageFile)
+            if syntaxAnalyzer.passManager != None:
+                for name, stats in syntaxAnalyzer.passManager.stats.items():
+                    print('  pass ' + name + ': ' + str(round(stats.seconds * 1000, 3)) + ' ms, instructions '
+                          + '{0:+d}'.format(stats.instructionsDelta), file=messageFile)
+        if args.stats:
+            stringPool = syntaxAnalyzer.program.stringPool
+            print('string pool: ' + str(len(stringPool.labelsByString)) + ' strings for ' + str(stringPool.usesCount)
+                  + ' uses, data section is smaller by ' + str(stringPool.GetSavedSize()) + ' chars', file=messageFile)
+            if not args.check and not args.keep_dead_methods \
+                    and args.optimization_level >= CodeGenerator.DEAD_METHODS_LEVEL:
+                methodsCount, deadMethodsCount, fullSize, size = syntaxAnalyzer.GetDeadMethodsStats()
+                print('dead methods: ' + str(deadMethodsCount) + ' of ' + str(methodsCount) + ' removed, code size '
+                      + str(fullSize) + ' -> ' + str(size) + ' chars', file=messageFile)
+            if syntaxAnalyzer.codeFolder != None:
+                print('identical code folding: ' + str(syntaxAnalyzer.codeFolder.foldedMethodsCount)
+                      + ' methods folded, code is smaller by ' + str(syntaxAnalyzer.codeFolder.savedSize) + ' chars',
+                      file=messageFile)
+            if syntaxAnalyzer.peepholeOptimizer != None:
+                print('peephole rules:', file=messageFile)
+                for name, count in syntaxAnalyzer.peepholeOptimizer.hitCounts.items():
+                    print('  ' + name + ': ' + str(count), file=messageFile)
     except Exception as Ex:
-        print(Ex)
\ No newline at end of file
+        print(Ex, file=messageFile)
+        if tempPath != None:
+            os.remove(tempPath)
+        if args.check:
+            # exit code tells if source file is valid
+            exit(1)
@@ -0,0 +1,91 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import subprocess
+from TokenCache import TokenCache
+
+TRANSLATOR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'YADLTranslator.py')
+
+
+class Test_CommandLine(unittest.TestCase):
+    def setUp(self):
+        self.workDir = tempfile.mkdtemp()
+        self.srcPath = os.path.join(self.workDir, 'src.txt')
+        self.outPath = os.path.join(self.workDir, 'out.asm')
+        open(self.srcPath, 'w').write('main() {\n  int a = 5;\n  print(a);\n}\n')
+
+
+    def tearDown(self):
+        shutil.rmtree(self.workDir)
+
+
+    def Translate(self, *options, env = None) -> subprocess.CompletedProcess:
+        return subprocess.run([sys.executable, TRANSLATOR_PATH, self.srcPath] + list(options),
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, env=env)
+
+
+    def test_check_of_valid_source(self):
+        result = self.Translate('--check')
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, 'Source file has no errors!\n')
+        self.assertFalse(os.path.exists(self.outPath))
+
+
+    def test_check_of_source_with_errors(self):
+        open(self.srcPath, 'w').write('main() {\n  print(b);\n  int = 5;\n}\n')
+        result = self.Translate('--check')
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(result.stdout.splitlines(), [
+            'Variable b is undefined in method main!Unexpected syntax token at line: 2 and position: 10',
+            'Unexpected syntax token at line: 3 and position: 10'])
+        self.assertFalse(os.path.exists(self.outPath))
+
+
+    def test_errors_keep_output_file(self):
+        open(self.outPath, 'w').write('old code')
+        open(self.srcPath, 'w').write('main() {\n  print(b);\n}\n')
+        result = self.Translate()
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(open(self.outPath).read(), 'old code')
+        self.assertEqual(sorted(os.listdir(self.workDir)), ['out.asm', 'src.txt'])
+
+
+    def test_code_to_stdout(self):
+        result = self.Translate()
+        self.assertEqual(result.returncode, 0)
+        result = self.Translate('-o', '-')
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, open(self.outPath).read())
+        self.assertEqual(result.stderr, '')
+
+
+    def test_no_token_cache_by_default(self):
+        tempDir = os.path.join(self.workDir, 'temp')
+        os.mkdir(tempDir)
+        env = dict(os.environ, TMPDIR=tempDir, TEMP=tempDir, TMP=tempDir)
+        result = self.Translate(env=env)
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertTrue(os.path.exists(self.outPath))
+        self.assertEqual(os.listdir(tempDir), [])
+
+
+    def test_cache_dir_enables_token_cache(self):
+        cacheDir = os.path.join(self.workDir, 'cache')
+        result = self.Translate('--cache-dir', cacheDir)
+        self.assertEqual(result.returncode, 0, result.stdout)
+        entries = os.listdir(cacheDir)
+        self.assertEqual(len(entries), 1)
+        self.assertTrue(entries[0].endswith(TokenCache.ENTRY_EXTENSION))
+        code = open(self.outPath).read()
+        # the second run reads tokens from cache
+        os.remove(self.outPath)
+        result = self.Translate('--cache-dir', cacheDir)
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertEqual(open(self.outPath).read(), code)
+        self.assertEqual(os.listdir(cacheDir), entries)
+
+
+if __name__ == '__main__':
+    unittest.main()